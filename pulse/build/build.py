@@ -5,19 +5,28 @@ import logging
 import pulse.stroke.stroke_dump as stroke
 
 from .build_compile import compile
+from .build_cache import BuildCache
 from ..core.core_dir import safe_open
 from typing import IO
 
 
 @click.command
 @click.argument("mode", default="__global__mode__")
-def build(mode: str) -> None:
+@click.option("--force", "-f", is_flag=True, help="Compile even if nothing has changed.")
+@click.option("--cache-stats", is_flag=True, help="Show the build cache statistics and exit.")
+def build(mode: str, force: bool, cache_stats: bool) -> None:
     """
     Build the project.
 
     Parameters:
         mode (str): Compiler profile to fire the building proccess with.
+        force (bool): Run the compiler even if the output is up to date.
+        cache_stats (bool): Show the build cache statistics instead of building.
     """
+    if cache_stats:
+        show_cache_stats()
+        return
+
     data: dict = {}
 
     if not os.path.exists(os.path.join(os.getcwd(), "pulse.toml")):
@@ -60,6 +69,7 @@ def build(mode: str) -> None:
             None if "modules" not in compiler_data else compiler_data["modules"],
             None if "legacy" not in compiler_data else compiler_data["legacy"],
             None if "requirements" not in data else requirements,
+            force,
         )
 
     else:
@@ -92,4 +102,20 @@ def build(mode: str) -> None:
             None if "modules" not in profile_data else profile_data["modules"],
             None if "legacy" not in profile_data else profile_data["legacy"],
             None if "requirements" not in data else requirements,
+            force,
+            mode,
         )
+
+
+def show_cache_stats() -> None:
+    """
+    Prints the build cache statistics.
+    """
+    stats: dict = BuildCache().stats()
+    lookups: int = stats["hits"] + stats["misses"]
+    rate: str = f"{stats['hits'] / lookups:.0%}" if lookups else "n/a"
+    click.echo(f"Entries: {stats['entries']}")
+    click.echo(f"Size: {stats['size'] / 1024 / 1024:.1f} MiB of {stats['limit'] / 1024 / 1024:.0f} MiB")
+    click.echo(f"Hits: {stats['hits']}")
+    click.echo(f"Misses: {stats['misses']}")
+    click.echo(f"Hit rate: {rate}")
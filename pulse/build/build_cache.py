@@ -0,0 +1,213 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+
+from pathlib import Path
+
+from pulse.core.core_dir import BUILD_CACHE_PATH
+from pulse.core.core_lock import cache_lock
+from pulse.user.user._user import User
+
+SIZE_ENV = "PULSE_BUILD_CACHE_SIZE"
+DEFAULT_SIZE = 512  # MiB
+STATS_FILE = "stats.json"
+CACHE_VERSION = 1
+
+
+def cache_size_limit() -> int:
+    """
+    Size limit of the build cache in bytes.
+
+    `PULSE_BUILD_CACHE_SIZE` takes precedence over `build_cache_size` in the
+    user configuration, both in MiB. 0 disables the cache.
+    """
+    size = os.environ.get(SIZE_ENV)
+    if size is None:
+        size = getattr(User(), "build_cache_size", None)
+
+    try:
+        return int(DEFAULT_SIZE if size is None else size) * 1024 * 1024
+    except ValueError:
+        logging.warning(f"Invalid build cache size {size}, using {DEFAULT_SIZE} MiB.")
+        return DEFAULT_SIZE * 1024 * 1024
+
+
+class BuildCache:
+    """
+    Compiled outputs shared by every project and checkout.
+
+    An entry is the .amx and the captured compiler output of a build, stored
+    under a digest of the build key, the profile and the content of every
+    file of the include graph, so the same sources compile once whatever
+    folder or branch they are built from. Restoring an entry marks it as
+    used; the least recently used entries are evicted once the cache grows
+    over its size limit.
+    """
+
+    def __init__(self, path: str | Path = BUILD_CACHE_PATH, limit: int | None = None):
+        self.path = Path(path)
+        self.limit = cache_size_limit() if limit is None else limit
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0
+
+    def key(self, build_key: str, profile: str | None, digests: dict[str, str]) -> str:
+        """
+        Digest of everything a build's output depends on.
+
+        Args:
+            build_key (str): Key of the compiler and options, see `build_key`.
+            profile (str): Compiler profile, None for the global one.
+            digests (dict[str, str]): File of the include graph mapped to its sha256.
+
+        Returns:
+            str: The digest.
+        """
+        data = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "build": build_key,
+                "profile": profile,
+                "files": digests,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def restore(self, digest: str, output: str) -> bytes | None:
+        """
+        Copy a cached output into place.
+
+        Args:
+            digest (str): Digest of the build, see `key`.
+            output (str): Path to restore the .amx to.
+
+        Returns:
+            bytes | None: The captured compiler output, None if the build isn't cached.
+        """
+        amx, log = self._entry(digest)
+        try:
+            with open(log, "rb") as f:
+                captured = f.read()
+            _copy(amx, output)
+            # the modification time of the .amx is the entry's last use
+            os.utime(amx)
+        except OSError:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        return captured
+
+    def store(self, digest: str, output: str, captured: bytes) -> None:
+        """
+        Add the output of a successful build and evict old entries.
+
+        Args:
+            digest (str): Digest of the build, see `key`.
+            output (str): Compiled .amx.
+            captured (bytes): Compiler output.
+        """
+        amx, log = self._entry(digest)
+        try:
+            amx.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=log.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(captured)
+            os.replace(tmp, log)
+            # the .amx goes last, an entry is complete once it exists
+            _copy(output, amx)
+        except OSError as e:
+            logging.warning(f"Failed to cache the build of {output}: {e}")
+            return
+
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the cache fits its limit.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with cache_lock(self.path / STATS_FILE):
+            entries = self._entries()
+            size = sum(entry_size for _, entry_size, _ in entries)
+            removed = 0
+            for amx, entry_size, _ in sorted(entries, key=lambda entry: entry[2]):
+                if size <= self.limit:
+                    break
+
+                for path in (amx, amx.with_suffix(".log")):
+                    path.unlink(missing_ok=True)
+                size -= entry_size
+                removed += 1
+
+        if removed:
+            logging.debug(f"Evicted {removed} builds from the build cache")
+        return removed
+
+    def stats(self) -> dict:
+        """Number of entries, their size, the size limit and the hit and miss counters."""
+        entries = self._entries()
+        counters = self._load_counters()
+        return {
+            "entries": len(entries),
+            "size": sum(entry_size for _, entry_size, _ in entries),
+            "limit": self.limit,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
+
+    def _entry(self, digest: str) -> tuple[Path, Path]:
+        folder = self.path / digest[:2]
+        return folder / f"{digest}.amx", folder / f"{digest}.log"
+
+    def _entries(self) -> list[tuple[Path, int, int]]:
+        """Every complete entry with its size and last use."""
+        entries = []
+        for amx in self.path.glob("??/*.amx"):
+            try:
+                st = amx.stat()
+                log_size = amx.with_suffix(".log").stat().st_size
+            except OSError:
+                continue
+            entries.append((amx, st.st_size + log_size, st.st_mtime_ns))
+
+        return entries
+
+    def _load_counters(self) -> dict:
+        try:
+            with open(self.path / STATS_FILE, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _count(self, counter: str) -> None:
+        try:
+            with cache_lock(self.path / STATS_FILE):
+                counters = self._load_counters()
+                counters[counter] = counters.get(counter, 0) + 1
+                fd, tmp = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(counters, f)
+                os.replace(tmp, self.path / STATS_FILE)
+        except OSError as e:
+            logging.debug(f"Failed to update the build cache statistics: {e}")
+
+
+def _copy(src: str | Path, dst: str | Path) -> None:
+    """Copy a file through a temporary sibling, so dst is never left half written."""
+    dst = Path(dst)
+    fd, tmp = tempfile.mkstemp(dir=dst.parent, prefix=f".{dst.name}.tmp-")
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        os.unlink(tmp)
+        raise
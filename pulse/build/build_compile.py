@@ -1,4 +1,5 @@
 import os
+import sys
 import platform
 import pulse.download.download as download
 import subprocess
@@ -8,7 +9,13 @@ import logging
 import pulse.stroke.stroke_dump as stroke
 
 
-from pulse.core.core_dir import COMPILER_PATH, REQUIREMENTS_PATH
+from pulse.core.core_dir import COMPILER_PATH, REQUIREMENTS_PATH, PROJECT_LOCK_FILE
+from pulse.package.lock._lock import PackageLock
+from pulse.package.meta._meta import MetadataStore
+from pulse.package.parse._parse import package_parse
+from pulse.toolchain.toolchain_store import is_installed, load_manifest
+from .build_state import BuildState, build_key, scan_includes, project_relative, relative_options
+from .build_cache import BuildCache
 
 
 def compile(
@@ -19,6 +26,8 @@ def compile(
     modules: list,
     legacy: list,
     requirements: dict,
+    force: bool = False,
+    profile: str | None = None,
 ) -> None:
     """
     Compiles given entry file to output.
@@ -31,6 +40,8 @@ def compile(
         modules (list): The list of modules to append to compiler include paths.
         legacy (list): The list of legacy libraries to append to compiler include paths.
         requirements (dict): The requirements.
+        force (bool): Run the compiler even if nothing has changed since the last build.
+        profile (str): Compiler profile, None for the global one.
 
     Returns:
         None
@@ -41,11 +52,6 @@ def compile(
         version,
         "pawncc.exe" if platform.system() == "Windows" else "pawncc",
     )
-    version_path_lib: str = os.path.join(
-        COMPILER_PATH,
-        version,
-        "pawnc.dll" if platform.system() == "Windows" else "libpawnc.so",
-    )
 
     if not os.path.exists(entry):
         logging.fatal(
@@ -55,8 +61,8 @@ def compile(
         return
 
     # check if version exists and if not, redownload it,
-    # but check if it's broken (e.g. not having one file, or both)
-    if not os.path.exists(version_path_exe) or not os.path.exists(version_path_lib):
+    # but check if it's broken (e.g. missing or truncated files)
+    if not is_installed("compiler", version):
         logging.warning("Your compiler is broken. Redownloading assets...")
         download.get_asset("compiler", version)
 
@@ -90,10 +96,18 @@ def compile(
 
     if os.path.exists(REQUIREMENTS_PATH) and (reqs := os.listdir(REQUIREMENTS_PATH)):
         logging.info("Requirements found, appending...")
+        locked: dict = locked_include_paths()
         for folder in reqs:
-            req_path: str = os.path.join(REQUIREMENTS_PATH, folder)
+            # relative, so neither the build keys nor the debug info depend on the checkout
+            req_path: str = os.path.join(os.path.relpath(REQUIREMENTS_PATH), folder)
 
-            if os.path.isdir(req_path):
+            if folder in locked:
+                include_path = locked[folder]
+                req_path = f"{req_path}/{include_path}" if include_path else req_path
+                options.append(f"-i{req_path}")
+                logging.debug(f"{req_path} has been appended.")
+
+            elif os.path.isdir(req_path):
                 files: list = os.listdir(req_path)
                 for file in files:
                     if file == ("pawn.json" or "pulse.toml"):
@@ -126,9 +140,123 @@ def compile(
         logging.debug("Creating the directory for output.")
         os.makedirs(directory, exist_ok=True)
 
+    # skip the compiler if the output was built from the very same inputs
+    state: BuildState = BuildState()
+    key: str = build_key(
+        project_relative(entry), version, compiler_fingerprint(version), relative_options(options)
+    )
+    if not force and state.up_to_date(output, key):
+        logging.info(f"{output} is up to date, nothing to compile.")
+        return
+
+    include_paths: list = [option[2:] for option in options if option.startswith("-i")]
+    # pawncc also searches its own include folder
+    include_paths += [
+        os.path.join(COMPILER_PATH, version, "include"),
+        os.path.join(COMPILER_PATH, version, "..", "include"),
+    ]
+    files, missing = scan_includes(entry, include_paths)
+    fingerprints: dict = state.fingerprints(files)
+
+    # the same sources may have been built in another checkout or on another branch
+    cache: BuildCache = BuildCache()
+    digest: str = cache.key(
+        key, profile, {project_relative(path): fp[2] for path, fp in fingerprints.items()}
+    )
+    if cache.enabled and not force and (captured := cache.restore(digest, output)) is not None:
+        logging.info(f"{output} has been restored from the build cache.")
+        sys.stdout.buffer.write(captured)
+        sys.stdout.flush()
+        state.record(output, key, fingerprints, missing)
+        state.save()
+        return
+
     logging.debug("Running the compiler...")
     pawncc: str = [version_path_exe] + options + [entry]
     env: dict = os.environ.copy()
     env["LD_LIBRARY_PATH"] = os.path.join(COMPILER_PATH, version)
 
-    subprocess.run(pawncc, env=env)
+    returncode, captured = run_compiler(pawncc, env)
+
+    if returncode == 0 and os.path.isfile(output):
+        state.record(output, key, fingerprints, missing)
+        if cache.enabled:
+            cache.store(digest, output, captured)
+    else:
+        state.discard(output)
+
+    state.save()
+
+
+def run_compiler(command: list, env: dict) -> tuple[int, bytes]:
+    """
+    Runs the compiler, printing its output as it comes and capturing it.
+
+    Parameters:
+        command (list): The compiler and its arguments.
+        env (dict): Environment of the compiler.
+
+    Returns:
+        tuple[int, bytes]: The exit code and everything the compiler printed.
+    """
+    captured: bytearray = bytearray()
+    with subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as process:
+        # read1 returns what is available instead of waiting for a full buffer
+        while chunk := process.stdout.read1(65536):
+            sys.stdout.buffer.write(chunk)
+            sys.stdout.flush()
+            captured += chunk
+
+    return process.returncode, bytes(captured)
+
+
+def compiler_fingerprint(version: str) -> dict:
+    """
+    Identifies the installed files of a compiler version.
+
+    Parameters:
+        version (str): Version of the compiler.
+
+    Returns:
+        dict: The checksums of its manifest, or the size and modification
+        time of every file if it has no manifest.
+    """
+    path: str = os.path.join(COMPILER_PATH, version)
+    manifest = load_manifest(path)
+    if manifest:
+        return {name: info["sha256"] for name, info in manifest["files"].items()}
+
+    fingerprint: dict = {}
+    for root, _, files in os.walk(path):
+        for file in files:
+            st = os.stat(os.path.join(root, file))
+            fingerprint[os.path.relpath(os.path.join(root, file), path)] = [st.st_size, st.st_mtime_ns]
+
+    return fingerprint
+
+
+def locked_include_paths() -> dict:
+    """
+    Looks up the include paths of locked requirements in the metadata cache.
+
+    Returns:
+        dict: Requirement folder mapped to its include_path (None for the folder itself).
+        Requirements which are not locked or cached are left to the folder scan.
+    """
+    if not os.path.isfile(PROJECT_LOCK_FILE):
+        return {}
+
+    metadata: MetadataStore = MetadataStore()
+    include_paths: dict = {}
+    for package, entry in PackageLock().packages.items():
+        parsed_package = package_parse(package)
+        if not parsed_package or not entry.get("commit"):
+            continue
+
+        author, repo, _, _ = parsed_package
+        data = metadata.get(author, repo, entry["commit"])
+        # only pawn.json has an include_path, same as the folder scan
+        if data and data["manifest"] == "pawn.json":
+            include_paths[repo] = data["include_path"]
+
+    return include_paths
@@ -0,0 +1,289 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import tempfile
+
+from pulse.core.core_dir import PROJECT_BUILD_STATE_FILE
+
+STATE_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+INCLUDE_PATTERN = re.compile(
+    rb'^[ \t]*#[ \t]*(?:try)?include[ \t]*(?:<([^>\r\n]+)>|"([^"\r\n]+)"|([^\s]+))',
+    re.MULTILINE,
+)
+# pawncc tries the name as written first, then with each extension appended
+INCLUDE_EXTENSIONS = ("", ".inc", ".p", ".pawn")
+
+
+class BuildState:
+    """
+    Inputs of the last successful build of every output.
+
+    An output is recorded with a key over the compiler, its version and the
+    full option list, every file of its include graph and every include
+    candidate which didn't exist. The build is up to date as long as the key
+    matches, no recorded file has changed and none of the missing candidates
+    has appeared. Files are compared by size and modification time first and
+    only hashed when those differ, so the check costs one stat per file.
+    """
+
+    def __init__(self, path: str = PROJECT_BUILD_STATE_FILE):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        self.changed = False
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring invalid build state {self.path}: {e}")
+            return
+
+        if data.get("version") == STATE_VERSION:
+            self.entries = data.get("outputs", {})
+
+    def up_to_date(self, output: str, key: str) -> bool:
+        """
+        Check if an output was built from exactly the current inputs.
+
+        Args:
+            output (str): Path of the compiled output.
+            key (str): Build key of the compiler and options, see `build_key`.
+
+        Returns:
+            bool: True if compiling again would produce the same output.
+        """
+        entry = self.entries.get(output)
+        if not entry or entry["key"] != key:
+            return False
+
+        if not self._unchanged(output, entry["output"]):
+            logging.debug(f"{output} has changed since it was built")
+            return False
+
+        for path, recorded in entry["files"].items():
+            if not self._unchanged(path, recorded):
+                logging.debug(f"{path} has changed since the last build")
+                return False
+
+        for path in entry["missing"]:
+            if os.path.exists(path):
+                logging.debug(f"{path} has appeared since the last build")
+                return False
+
+        return True
+
+    def fingerprints(self, files: set[str]) -> dict[str, list]:
+        """
+        Size, modification time and sha256 of files.
+
+        Files recorded for any output with the same size and modification
+        time aren't hashed again.
+
+        Args:
+            files (set[str]): Files to fingerprint, see `scan_includes`.
+
+        Returns:
+            dict[str, list]: File mapped to its fingerprint.
+        """
+        known = {}
+        for entry in self.entries.values():
+            known.update(entry["files"])
+
+        fingerprints = {}
+        for path in files:
+            # stat before hashing, so a concurrent change is seen as a change
+            st = os.stat(path)
+            recorded = known.get(path)
+            if recorded and recorded[0] == st.st_size and recorded[1] == st.st_mtime_ns:
+                fingerprints[path] = list(recorded)
+            else:
+                fingerprints[path] = [st.st_size, st.st_mtime_ns, _hash_file(path)]
+
+        return fingerprints
+
+    def record(self, output: str, key: str, fingerprints: dict[str, list], missing: set[str]) -> None:
+        """
+        Record the inputs of a successful build.
+
+        Args:
+            output (str): Path of the compiled output.
+            key (str): Build key of the compiler and options.
+            fingerprints (dict[str, list]): Files of the include graph, see `fingerprints`.
+            missing (set[str]): Include candidates which didn't exist.
+        """
+        self.entries[output] = {
+            "key": key,
+            "output": _fingerprint(output),
+            "files": fingerprints,
+            "missing": sorted(missing),
+        }
+        self.changed = True
+
+    def discard(self, output: str) -> None:
+        if self.entries.pop(output, None) is not None:
+            self.changed = True
+
+    def save(self) -> None:
+        if not self.changed:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"version": STATE_VERSION, "outputs": self.entries}, f, sort_keys=True)
+            os.replace(tmp, self.path)
+            self.changed = False
+        except OSError as e:
+            logging.warning(f"Failed to write build state {self.path}: {e}")
+
+    def _unchanged(self, path: str, recorded: list) -> bool:
+        size, mtime, digest = recorded
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+
+        if st.st_size != size:
+            return False
+
+        if st.st_mtime_ns == mtime:
+            return True
+
+        # touched but maybe not modified, e.g. by a checkout
+        if _hash_file(path) != digest:
+            return False
+
+        recorded[1] = st.st_mtime_ns
+        self.changed = True
+        return True
+
+
+def build_key(entry: str, version: str, compiler_files: dict, arguments: list[str]) -> str:
+    """
+    Hash what a build depends on besides its source files.
+
+    Args:
+        entry (str): Entry file.
+        version (str): Compiler version.
+        compiler_files (dict): Fingerprints of the compiler's files.
+        arguments (list[str]): Every option passed to the compiler.
+
+    Returns:
+        str: The key.
+    """
+    data = json.dumps(
+        {
+            "entry": entry,
+            "version": version,
+            "compiler": compiler_files,
+            "arguments": arguments,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def project_relative(path: str, root: str | None = None) -> str:
+    """
+    Makes a path inside the project relative to its root.
+
+    Keys built from relative paths are the same wherever the project is
+    checked out. Paths outside of the project are returned unchanged.
+
+    Args:
+        path (str): Path to make relative.
+        root (str): Project root, the working directory by default.
+
+    Returns:
+        str: The relative path, or the path itself.
+    """
+    root = os.path.abspath(root or os.getcwd())
+    absolute = os.path.abspath(path)
+    try:
+        if os.path.commonpath([absolute, root]) == root:
+            return os.path.relpath(absolute, root)
+    except ValueError:
+        # on another drive
+        pass
+
+    return path
+
+
+def relative_options(options: list[str], root: str | None = None) -> list[str]:
+    """Compiler options with the include and output paths made relative to the project root."""
+    return [
+        option[:2] + project_relative(option[2:], root)
+        if option[:2] in ("-i", "-o") and len(option) > 2
+        else option
+        for option in options
+    ]
+
+
+def scan_includes(entry: str, include_paths: list[str]) -> tuple[set[str], set[str]]:
+    """
+    Walks the include graph of a Pawn file.
+
+    Every `#include` and `#tryinclude` is resolved against the folder of the
+    including file (for quoted names) and the include folders, with every
+    extension the compiler tries. All existing candidates are followed, not
+    only the one the compiler picks, so a change to any file that could be
+    included is noticed.
+
+    Args:
+        entry (str): Entry file.
+        include_paths (list[str]): Include folders.
+
+    Returns:
+        tuple[set[str], set[str]]: Files of the graph, candidates which don't exist.
+    """
+    files, missing = set(), set()
+    queue = [os.path.normpath(entry)]
+
+    while queue:
+        path = queue.pop()
+        if path in files:
+            continue
+
+        files.add(path)
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+        except OSError:
+            continue
+
+        for match in INCLUDE_PATTERN.finditer(source):
+            angled, quoted, bare = match.groups()
+            name = (angled or quoted or bare).decode("latin-1").strip()
+            folders = ([os.path.dirname(path)] if quoted else []) + include_paths
+
+            for folder in folders:
+                for extension in INCLUDE_EXTENSIONS:
+                    candidate = os.path.normpath(os.path.join(folder, name + extension))
+                    if os.path.isfile(candidate):
+                        queue.append(candidate)
+                    else:
+                        missing.add(candidate)
+
+    return files, missing
+
+
+def _fingerprint(path: str) -> list:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns, _hash_file(path)]
+
+
+def _hash_file(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
@@ -0,0 +1,149 @@
+import os
+import shutil
+import logging
+import threading
+
+from zipfile import ZipFile
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 1024 * 1024
+MAX_WORKERS = min(16, os.cpu_count() or 1)
+# below this much data a thread pool costs more than it saves
+PARALLEL_THRESHOLD = 4 * 1024 * 1024
+
+
+def extract_zip(archive_path: str, target_folder: str, workers: int | None = None) -> list[str]:
+    """
+    Extracts a whole zip archive, decompressing its members in parallel.
+
+    Like `ZipFile.extractall`, member names are sanitized so nothing is
+    written outside of the target folder.
+
+    Args:
+        archive_path (str): Path of the .zip file.
+        target_folder (str): Folder to extract into.
+        workers (int): Number of threads, one per core by default.
+
+    Returns:
+        list[str]: The extracted files.
+    """
+    root = os.path.realpath(target_folder)
+    destinations = {}
+    with ZipFile(archive_path) as zf:
+        for info in zf.infolist():
+            parts = [
+                part
+                for part in info.filename.replace("\\", "/").split("/")
+                if part not in ("", ".", "..")
+            ]
+            if not parts or ":" in parts[0]:
+                continue
+
+            path = os.path.join(root, *parts)
+            if info.is_dir():
+                os.makedirs(path, exist_ok=True)
+            else:
+                destinations[info.filename] = [path]
+
+    extract_zip_members(archive_path, destinations, workers)
+    return [paths[0] for paths in destinations.values()]
+
+
+def extract_zip_members(
+    archive_path: str, destinations: dict[str, list[str]], workers: int | None = None
+) -> None:
+    """
+    Extracts members of a zip archive to the given files, in parallel.
+
+    Every member's deflate stream is independent, so members are spread over
+    a thread pool (zlib releases the GIL) and each thread reads through its
+    own handle of the archive. The largest members are started first. Small
+    archives are extracted on the calling thread, and so is everything when
+    it is a worker thread already, e.g. of the installer's plugin pool, so
+    pools aren't nested.
+
+    Args:
+        archive_path (str): Path of the .zip file.
+        destinations (dict): Member name mapped to the files it is written to.
+            It is decompressed once and copied to every file after the first.
+            A file several members map to gets the last of them, as if they
+            were extracted one after another in the mapping's order.
+        workers (int): Number of threads, one per core by default, or one on
+            a worker thread.
+    """
+    destinations = _resolve_collisions(destinations)
+    if not destinations:
+        return
+
+    for paths in destinations.values():
+        for path in paths:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with ZipFile(archive_path) as zf:
+        infos = {info.filename: info for info in zf.infolist()}
+
+    members = sorted(destinations, key=lambda name: infos[name].file_size, reverse=True)
+    total = sum(infos[name].file_size for name in members)
+    if workers is None and threading.current_thread() is not threading.main_thread():
+        workers = 1
+    workers = min(workers or MAX_WORKERS, len(members))
+
+    if workers <= 1 or total < PARALLEL_THRESHOLD:
+        with ZipFile(archive_path) as zf:
+            for name in members:
+                _extract_member(zf, name, destinations[name])
+        return
+
+    local = threading.local()
+    handles = []
+    handles_lock = threading.Lock()
+
+    def extract(name: str) -> None:
+        if not hasattr(local, "zf"):
+            local.zf = ZipFile(archive_path)
+            with handles_lock:
+                handles.append(local.zf)
+        _extract_member(local.zf, name, destinations[name])
+
+    logging.debug(f"Extracting {len(members)} members of {archive_path} on {workers} threads")
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() re-raises the first failure
+            list(executor.map(extract, members))
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def _resolve_collisions(destinations: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Give every file to the last member writing it, so no two threads write the same file."""
+    owners = {}
+    for name, paths in destinations.items():
+        for path in paths:
+            key = os.path.normcase(os.path.abspath(path))
+            if owners.get(key, name) != name:
+                logging.debug(f"{owners[key]} and {name} are both extracted to {path}, keeping {name}")
+            owners[key] = name
+
+    resolved = {}
+    for name, paths in destinations.items():
+        owned = []
+        for path in paths:
+            key = os.path.normcase(os.path.abspath(path))
+            if owners.get(key) == name:
+                # popped, so a path listed twice for one member is written once
+                del owners[key]
+                owned.append(path)
+
+        if owned:
+            resolved[name] = owned
+
+    return resolved
+
+
+def _extract_member(zf: ZipFile, name: str, paths: list[str]) -> None:
+    with zf.open(name) as source, open(paths[0], "wb") as destination:
+        shutil.copyfileobj(source, destination, CHUNK_SIZE)
+
+    for path in paths[1:]:
+        shutil.copyfile(paths[0], path)
@@ -25,11 +25,19 @@ RUNTIME_PATH = os.path.join(data_dir, "runtime")
 COMPILER_PATH = os.path.join(data_dir, "compiler")
 PACKAGE_PATH = os.path.join(data_dir, "package")
 PLUGINS_PATH = os.path.join(data_dir, "plugins")
+STORE_PATH = os.path.join(PACKAGE_PATH, ".store")
+CACHE_INDEX_FILE = os.path.join(PACKAGE_PATH, ".index.json")
+METADATA_FILE = os.path.join(data_dir, "metadata.db")
+HTTP_CACHE_PATH = os.path.join(data_dir, "http")
+DOWNLOAD_PATH = os.path.join(data_dir, "downloads")
+BUILD_CACHE_PATH = os.path.join(data_dir, "build")
 
 # CWD
 REQUIREMENTS_PATH = os.path.join(os.getcwd(), "requirements")
 PODS_PATH = os.path.join(os.getcwd(), ".pods")
 PROJECT_TOML_FILE = os.path.join(os.getcwd(), "pulse.toml")
+PROJECT_LOCK_FILE = os.path.join(os.getcwd(), "pulse.lock")
+PROJECT_BUILD_STATE_FILE = os.path.join(os.getcwd(), ".pulse-build.json")
 PROJECT_JSON_COMPAT_FILE = os.path.join(os.getcwd(), "pawn.json")
 
 @contextmanager
@@ -1,4 +1,5 @@
 import click
+import logging
 
 from pulse.init.init import init
 from pulse.pods.pods import pods
@@ -9,9 +10,13 @@ from pulse.package.package_pack import package
 from pulse.release.release import release
 from pulse.package.package_install import install
 from pulse.package.package_ensure import ensure
+from pulse.package.package_fetch import fetch
 from pulse.package.package_uninstall import uninstall
+from pulse.mirror.mirror import mirror
+from pulse.toolchain.toolchain import toolchain
 from pulse.user import user
 import pulse.core.core_constants as core_constants
+from pulse.git.git_client import GitHubClient
 
 def print_version(ctx, param, value):
     if not value or ctx.resilient_parsing:
@@ -33,6 +38,13 @@ def pulse() -> None:
     """
     ...
 
+
+@pulse.result_callback()
+def print_summary(*args, **kwargs) -> None:
+    """Prints the GitHub API accounting of the command, if it made any requests."""
+    if GitHubClient._instance and (summary := GitHubClient._instance.summary()):
+        logging.info(summary)
+
 pulse.add_command(init)
 pulse.add_command(pods)
 pulse.add_command(build)
@@ -42,5 +54,8 @@ pulse.add_command(package)
 pulse.add_command(release)
 pulse.add_command(install)
 pulse.add_command(ensure)
+pulse.add_command(fetch)
 pulse.add_command(uninstall)
-pulse.add_command(user)
\ No newline at end of file
+pulse.add_command(user)
+pulse.add_command(mirror)
+pulse.add_command(toolchain)
\ No newline at end of file
@@ -0,0 +1,116 @@
+import os
+import stat
+import shutil
+import logging
+import tempfile
+
+from pathlib import Path
+from contextlib import contextmanager
+
+from .core_dir import is_windows
+
+if is_windows:
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def cache_lock(path: str | Path):
+    """
+    Holds an exclusive advisory lock on a shared cache entry.
+
+    The lock file is a hidden sibling of the entry, so the entry itself can be
+    replaced while the lock is held. Other processes (and threads) asking for
+    the same entry block until it is released.
+
+    Args:
+        path (str | Path): Cache entry to lock. It doesn't need to exist.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = path.with_name(f".{path.name}.lock")
+
+    with open(lock_file, "a+b") as f:
+        if _try_lock(f):
+            logging.debug(f"Locked {path}")
+        else:
+            logging.info(f"Waiting for another Pulse process to finish with {path}...")
+            _lock(f)
+
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+def staging_dir(path: str | Path) -> Path:
+    """
+    Creates an empty temporary sibling of a cache entry to build it in.
+
+    Being on the same filesystem, it can be moved into place atomically with
+    `replace_directory` once it is complete.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}.tmp-"))
+
+
+def replace_directory(src: str | Path, dst: str | Path) -> None:
+    """
+    Moves a completed directory into place, replacing the previous one.
+
+    The previous directory is renamed away before the new one is renamed in,
+    so readers see either the old or the new content but never a mix of both.
+    """
+    dst = Path(dst)
+    old = None
+    if dst.exists():
+        old = Path(tempfile.mkdtemp(dir=dst.parent, prefix=f".{dst.name}.old-"))
+        os.rmdir(old)
+        os.rename(dst, old)
+
+    os.rename(src, dst)
+
+    if old:
+        shutil.rmtree(old, onerror=_handle_remove_error)
+
+
+def _try_lock(f) -> bool:
+    try:
+        if is_windows:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def _lock(f) -> None:
+    if not is_windows:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+
+    # LK_LOCK gives up after 10 attempts, keep waiting like flock does
+    while True:
+        try:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+def _unlock(f) -> None:
+    if is_windows:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _handle_remove_error(function, path, info):
+    os.chmod(path, stat.S_IWRITE)
+    os.unlink(path)
@@ -1,49 +1,185 @@
 import os
+import shutil
+import tarfile
+import logging
 import platform
 
+from pathlib import Path
+
 import click
+import requests
 
 import pulse.git.git_download as git_download
-from pulse.core.core_dir import COMPILER_PATH, RUNTIME_PATH
+from pulse.git.git_client import GitHubClient
+from pulse.git.git_mirror import toolchain_url
+from pulse.core.core_lock import cache_lock, staging_dir, replace_directory
+from pulse.toolchain.toolchain_store import (
+    MANIFEST_FILE,
+    TOOLCHAIN_PATHS,
+    toolchain_path,
+    is_installed,
+    load_manifest,
+    record_manifest,
+    verify,
+    deduplicate,
+)
 
 
 def get_asset(type: str, version: str) -> None:
     """
     Downloads particular asset specified by version and type.
 
+    Runtimes and compilers are shared by every project, so the version is
+    locked while it is downloaded into a temporary folder and moved into
+    place only once it is complete. A process that has waited for another
+    one to download the same version reuses it. A version whose manifest
+    shows damaged files only gets those files replaced.
+
     Args:
         type (str): The type of files to download.
         version (str):
     """
+    if type not in TOOLCHAIN_PATHS:
+        click.echo("Invalid type.")
+        return
+
+    target_folder = toolchain_path(type, version)
+    if load_manifest(target_folder) is not None:
+        repair_asset(type, version)
+        return
+
+    with cache_lock(target_folder):
+        if is_installed(type, version):
+            logging.info(f"The {type} {version} has been downloaded by another process.")
+            return
+
+        staging = staging_dir(target_folder)
+        try:
+            downloaded = _download_toolchain(type, version, staging)
+            if downloaded is None:
+                logging.error(f"Failed to download the {type} {version}.")
+                return
+
+            record_manifest(downloaded)
+            deduplicate(type, downloaded)
+            replace_directory(downloaded, target_folder)
+
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def repair_asset(type: str, version: str, damaged: list[str] | None = None) -> bool:
+    """
+    Replaces the damaged files of an installed runtime or compiler version.
+
+    The release is downloaded again, but only the files which are missing or
+    don't match the manifest are moved over. If the release no longer matches
+    the manifest, the whole version is replaced by it.
+
+    Args:
+        type (str): "runtime" or "compiler".
+        version (str): Installed version to repair.
+        damaged (list[str]): Damaged files, found by a full check if None.
+
+    Returns:
+        bool: True if the version is intact afterwards.
+    """
+    target_folder = toolchain_path(type, version)
+
+    with cache_lock(target_folder):
+        if damaged is None:
+            damaged = verify(target_folder)
+        manifest = load_manifest(target_folder)
+
+        if manifest is not None and not damaged:
+            return True
+
+        staging = staging_dir(target_folder)
+        try:
+            downloaded = _download_toolchain(type, version, staging)
+            if downloaded is None:
+                logging.error(f"Failed to download the {type} {version}.")
+                return False
+
+            fresh = record_manifest(downloaded)
+            if manifest is None or any(
+                fresh["files"].get(name) != manifest["files"][name] for name in damaged
+            ):
+                logging.warning(f"The {type} {version} release has changed, replacing it.")
+                deduplicate(type, downloaded)
+                replace_directory(downloaded, target_folder)
+                return True
+
+            for name in damaged:
+                target = target_folder / name
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(downloaded / name, target)
+
+            logging.info(f"Repaired {len(damaged)} files of the {type} {version}.")
+            return True
+
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def _download_toolchain(type: str, version: str, staging: Path) -> Path | None:
+    """Download a runtime or compiler into a staging folder, returning the folder it ended up in."""
+    if _download_from_mirror(type, version, staging):
+        return staging
+
     system = platform.system()
     if type == "runtime":
-        git_download.download_and_unzip_github_release(
-            "openmultiplayer",
-            "open.mp",
-            version,
-            (
-                "open.mp-win-x86.zip"
-                if system == "Windows"
-                else "open.mp-linux-x86.tar.gz"
-            ),
-            RUNTIME_PATH,
+        owner, repo = "openmultiplayer", "open.mp"
+        asset_name = (
+            "open.mp-win-x86.zip"
+            if system == "Windows"
+            else "open.mp-linux-x86.tar.gz"
         )
 
-        server_folder = os.path.join(RUNTIME_PATH, version)
-        os.rename(os.path.join(RUNTIME_PATH, "Server"), server_folder)
-
-    elif type == "compiler":
-        git_download.download_and_unzip_github_release(
-            "pulsepm",
-            "compiler",
-            version,
-            (
-                f"pawnc-win-{version}.zip"
-                if system == "Windows"
-                else f"pawnc-linux-{version}.tar.gz"
-            ),
-            os.path.join(COMPILER_PATH, version),
+    else:
+        owner, repo = "pulsepm", "compiler"
+        asset_name = (
+            f"pawnc-win-{version}.zip"
+            if system == "Windows"
+            else f"pawnc-linux-{version}.tar.gz"
         )
 
-    else:
-        click.echo("Invalid type.")
+    git_download.download_and_unzip_github_release(
+        owner, repo, version, asset_name, str(staging)
+    )
+
+    # the runtime archives have everything in a Server folder, it is renamed into place
+    downloaded = staging / "Server" if (staging / "Server").is_dir() else staging
+    if not is_installed(type, version, downloaded):
+        return None
+
+    return downloaded
+
+
+def _download_from_mirror(type: str, version: str, staging: Path) -> bool:
+    """Extract a runtime or compiler version served by the package mirror."""
+    url = toolchain_url(type, version)
+    if not url:
+        return False
+
+    try:
+        with GitHubClient().get(url, stream=True, download=True) as response:
+            if response.status_code != 200:
+                logging.debug(f"Mirror doesn't have the {type} {version}, falling back to GitHub")
+                return False
+
+            git_download.extract_tar_stream(response.raw, str(staging))
+
+    except (requests.exceptions.RequestException, OSError, tarfile.TarError) as e:
+        logging.debug(f"Mirror download of the {type} {version} failed, falling back to GitHub: {e}")
+        return False
+
+    # the mirror packs the manifest of its copy, it is recorded again here
+    (staging / MANIFEST_FILE).unlink(missing_ok=True)
+    if not is_installed(type, version, staging):
+        for entry in staging.iterdir():
+            shutil.rmtree(entry) if entry.is_dir() else entry.unlink()
+        return False
+
+    logging.info(f"Downloaded the {type} {version} from the package mirror")
+    return True
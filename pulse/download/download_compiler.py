@@ -2,9 +2,11 @@ import os
 import shutil
 
 import click
-import requests
 
 from pulse.core.core_dir import COMPILER_PATH, PODS_PATH
+from pulse.git.git_client import GitHubClient
+
+from pulse.toolchain.toolchain_store import is_installed
 
 from .download_asset import get_asset
 
@@ -25,7 +27,7 @@ def get_compiler(isolate: bool = True) -> str:
 
     compiler_choice = click.prompt("Enter your choice", type=click.IntRange(1, i))
     compiler_path = os.path.join(COMPILER_PATH, compilers_dict[compiler_choice])
-    if not os.path.exists(compiler_path):
+    if not is_installed("compiler", compilers_dict[compiler_choice]):
         click.echo("Compiler is not found in the cache, it will be downloaded.")
         click.echo(f"Downloading compiler ({compilers_dict[compiler_choice]})..")
         get_asset("compiler", compilers_dict[compiler_choice])
@@ -50,7 +52,7 @@ def get_github_compiler_releases() -> list:
         list: A list of compiler releases available in the GitHub repository.
     """
     try:
-        response = requests.get("https://api.github.com/repos/pulsepm/compiler/tags")
+        response = GitHubClient().get("https://api.github.com/repos/pulsepm/compiler/tags", cache=True)
 
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
@@ -2,8 +2,10 @@ import os
 import shutil
 
 import click
-import requests
 from pulse.core.core_dir import RUNTIME_PATH, PODS_PATH
+from pulse.git.git_client import GitHubClient
+
+from pulse.toolchain.toolchain_store import is_installed
 
 from .download_asset import get_asset
 
@@ -25,7 +27,7 @@ def get_runtime(isolate: bool = True) -> None:
     runtime_choice = click.prompt("Enter your choice", type=click.IntRange(1, i))
 
     runtime_path = os.path.join(RUNTIME_PATH, runtimes_dict[runtime_choice])
-    if not os.path.exists(runtime_path):
+    if not is_installed("runtime", runtimes_dict[runtime_choice]):
         click.echo("Runtime is not found in the cache, it will be downloaded.")
         click.echo(f"Downloading runtime ({runtimes_dict[runtime_choice]})..")
         get_asset("runtime", runtimes_dict[runtime_choice])
@@ -51,8 +53,9 @@ def get_github_runtime_releases() -> list:
     """
 
     try:
-        response = requests.get(
-            "https://api.github.com/repos/openmultiplayer/open.mp/tags"
+        response = GitHubClient().get(
+            "https://api.github.com/repos/openmultiplayer/open.mp/tags",
+            cache=True,
         )
 
     except Exception as e:
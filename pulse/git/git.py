@@ -2,14 +2,19 @@ from typing import Union, Literal
 import git
 import os
 import tomli
-from ..core.core_dir import safe_open
+from ..core.core_dir import safe_open, PACKAGE_PATH
+from ..core.core_lock import cache_lock
 from ..user import User
-from github import Github
+from .git_client import GitHubClient
+from .git_tags import latest_tag
+import base64
 import logging
 import requests
 from pathlib import Path
 
 usr = User()
+client = GitHubClient()
+API_URL = "https://api.github.com"
 
 def create_repository(username: str, repository_name: str, access_token: str) -> None:
     """
@@ -38,7 +43,7 @@ def create_repository(username: str, repository_name: str, access_token: str) ->
         headers = {"Authorization": f"token {access_token}"}
         data = {"name": repository_name, "auto_init": False, "private": False}
 
-        response = requests.post(create_repo_url, headers=headers, json=data)
+        response = client.post(create_repo_url, headers=headers, json=data)
 
         if response.status_code == 201:
             print(f"Repository '{repository_name}' created on GitHub successfully.")
@@ -64,10 +69,10 @@ def create_repository(username: str, repository_name: str, access_token: str) ->
 
 
 def valid_token(token: str) -> bool:
-    url = "https://api.github.com/user"
+    url = f"{API_URL}/user"
     headers = {"Authorization": f"token {token}"}
     
-    response = requests.get(url, headers=headers)
+    response = client.get(url, headers=headers, cache=True)
     
     if response.status_code == 200:
         return True
@@ -76,9 +81,9 @@ def valid_token(token: str) -> bool:
 
 
 def valid_username(username: str) -> bool:
-    url = f"https://api.github.com/users/{username}"
+    url = f"{API_URL}/users/{username}"
     
-    response = requests.get(url)
+    response = client.get(url, cache=True)
     
     if response.status_code == 200:
         return True
@@ -102,7 +107,7 @@ def get_github_repo(
         "Authorization": f"token {usr.git_token}"
     }
 
-    response = requests.get(url, headers=headers)
+    response = client.get(url, headers=headers, cache=True)
     if not response.ok:
         return response
 
@@ -111,11 +116,11 @@ def get_github_repo(
 
 def default_branch(package: list[str]) -> str | int:
     
-    url = f"https://api.github.com/repos/{package[0]}/{package[1]}"
+    url = f"{API_URL}/repos/{package[0]}/{package[1]}"
     headers = {
         "Authorization": f"token {usr.git_token}"
     }
-    response = requests.get(url, headers=headers)
+    response = client.get(url, headers=headers, cache=True)
     if not response.ok:
         print(response.json())
         return response.json()
@@ -126,6 +131,9 @@ def default_branch(package: list[str]) -> str | int:
 def get_latest_tag(author: str, repo: str, ref: str | None = None) -> str | None:
     """
     Get the latest tag for a specific branch or commit.
+
+    Tags are resolved with `git ls-remote` and a treeless tag mirror kept
+    next to the package cache, see `git_tags.latest_tag`.
     
     Args:
         author (str): Repository owner
@@ -133,43 +141,14 @@ def get_latest_tag(author: str, repo: str, ref: str | None = None) -> str | None
         ref (str, optional): Branch name or commit SHA. If None, gets latest tag from default branch
     
     Returns:
-        str | None: The tag name if found, None if no tags exist
+        str | None: The latest tag reachable from the ref if found, None if no tags exist
     """
-    g = Github(usr.git_token)
+    mirror_path = Path(PACKAGE_PATH) / author / repo / ".tags"
     try:
-        repository = g.get_repo(f"{author}/{repo}")
-        tags = list(repository.get_tags())
-        
-        if not tags:
-            return None
-            
-        if not ref:
-            # Just get the latest tag by date
-            sorted_tags = sorted(tags, key=lambda x: x.commit.commit.author.date, reverse=True)
-            return sorted_tags[0].name
-        
-        # Get the specific commit without fetching history
-        target_commit = repository.get_commit(ref)
-        target_sha = target_commit.sha
-        
-        # First try exact match
-        for tag in tags:
-            if tag.commit.sha == target_sha:
-                return tag.name
-        
-        # If no exact match, get the latest tag that's reachable from this commit
-        # Sort tags by date first to try newest ones first
-        sorted_tags = sorted(tags, key=lambda x: x.commit.commit.author.date, reverse=True)
-        for tag in sorted_tags:
-            try:
-                # Check if tag commit is an ancestor of target commit
-                comparison = repository.compare(tag.commit.sha, target_sha)
-                if comparison.ahead_by == 0:
-                    return tag.name
-            except:
-                continue
-                
-        return None
+        with cache_lock(mirror_path):
+            return latest_tag(
+                f"https://{usr.git_token}@github.com/{author}/{repo}.git", mirror_path, ref
+            )
         
     except Exception as e:
         logging.error(f"Error getting latest tag: {e}")
@@ -191,8 +170,8 @@ def get_release_assets(author: str, repo: str, tag: str) -> list | None:
 
     headers = {"Authorization": f"token {usr.git_token}"}
     
-    url = f"https://api.github.com/repos/{author}/{repo}/releases/tags/{tag}"
-    response = requests.get(url, headers=headers)
+    url = f"{API_URL}/repos/{author}/{repo}/releases/tags/{tag}"
+    response = client.get(url, headers=headers, cache=True)
     
     if not response.ok:
         return None
@@ -215,11 +194,18 @@ def download_file_from_github(repo_owner: str, repo_name: str, file_path: str, t
         bool: True if download successful, False otherwise
     """
     try:
-        g = Github(usr.git_token)
-        repo = g.get_repo(f"{repo_owner}/{repo_name}")
-        default_branch = repo.default_branch
-        
-        content = repo.get_contents(file_path, ref=default_branch)
+        branch = default_branch([repo_owner, repo_name])
+        if not isinstance(branch, str):
+            raise ValueError(f"Couldn't get the default branch of {repo_owner}/{repo_name}")
+
+        response = client.get(
+            f"{API_URL}/repos/{repo_owner}/{repo_name}/contents/{file_path}",
+            headers={"Authorization": f"token {usr.git_token}"},
+            params={"ref": branch},
+            cache=True,
+        )
+        response.raise_for_status()
+        content = response.json()
         if isinstance(content, list):
             logging.error(f"{file_path} is a directory, skipping")
             return False
@@ -228,7 +214,7 @@ def download_file_from_github(repo_owner: str, repo_name: str, file_path: str, t
         save_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(save_path, 'wb') as f:
-            f.write(content.decoded_content)
+            f.write(base64.b64decode(content["content"]))
             
         logging.info(f"Successfully downloaded {file_path} from default branch to {save_path}")
         return True
@@ -238,6 +224,41 @@ def download_file_from_github(repo_owner: str, repo_name: str, file_path: str, t
         return False
 
 
+def download_raw_file(repo_owner: str, repo_name: str, file_path: str, target_dir: str | Path, ref: str = "HEAD") -> bool:
+    """
+    Download a specific file through a plain fetch, without using the GitHub API.
+
+    Args:
+        repo_owner (str): Repository owner
+        repo_name (str): Repository name
+        file_path (str): Path to the file in the repository
+        target_dir (str|Path): Directory where to save the file
+        ref (str): Branch, tag or commit to download from. Defaults to the default branch.
+
+    Returns:
+        bool: True if download successful, False otherwise
+    """
+    url = f"https://raw.githubusercontent.com/{repo_owner}/{repo_name}/{ref}/{file_path}"
+    headers = {"Authorization": f"token {usr.git_token}"}
+
+    try:
+        response = client.get(url, headers=headers)
+    except requests.exceptions.RequestException as e:
+        logging.warning(f"Failed to download {file_path}: {e}")
+        return False
+
+    if not response.ok:
+        logging.warning(f"Failed to download {file_path}. Status code: {response.status_code}")
+        return False
+
+    save_path = Path(target_dir) / file_path
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(save_path, 'wb') as f:
+        f.write(response.content)
+
+    return True
+
+
 def check_files_github(repo_owner, repo_name, ref, files_to_check=['pulse.toml', 'pawn.json']):
     """
     Check for config files in repository.
@@ -253,9 +274,16 @@ def check_files_github(repo_owner, repo_name, ref, files_to_check=['pulse.toml',
         tuple: (dict of file existence, file that was found)
     """
 
-    g = Github(usr.git_token)  
-    repo = g.get_repo(f"{repo_owner}/{repo_name}")
-    default_branch = repo.default_branch
+    headers = {"Authorization": f"token {usr.git_token}"}
+    contents_url = f"{API_URL}/repos/{repo_owner}/{repo_name}/contents"
+    branch = default_branch([repo_owner, repo_name])
+
+    def has_file(file: str, ref: str) -> bool:
+        # missing files are negatively cached by the client
+        response = client.get(
+            f"{contents_url}/{file}", headers=headers, params={"ref": ref}, cache=True
+        )
+        return response.ok
     
     results = {file: False for file in files_to_check}
     found_file = None
@@ -264,27 +292,25 @@ def check_files_github(repo_owner, repo_name, ref, files_to_check=['pulse.toml',
     
     # First check files in specified ref
     for file in files_to_check:
-        try:
-            repo.get_contents(file, ref=ref)
+        if has_file(file, ref):
             results[file] = True
             found_file = file
             logging.info(f"Found {file}")
             return results, found_file
-        except Exception:
+        else:
             logging.warning(f"Missing {file}")
     
     # If no files found, try default branch
-    if ref != default_branch:
-        logging.info(f"No config files found in {ref}, trying default branch: {default_branch}")
+    if ref != branch:
+        logging.info(f"No config files found in {ref}, trying default branch: {branch}")
         for file in files_to_check:
-            try:
-                repo.get_contents(file, ref=default_branch)
+            if has_file(file, branch):
                 results[file] = True
                 found_file = file
                 logging.info(f"Found {file} in default branch")
                 return results, found_file
                 
-            except Exception:
+            else:
                 logging.warning(f"Missing {file} in default branch")
                 
     return results, found_file
\ No newline at end of file
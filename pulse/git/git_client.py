@@ -0,0 +1,281 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+import random
+import tempfile
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..core.core_dir import HTTP_CACHE_PATH
+
+POOL_SIZE = 32
+# 404s are remembered for this long before GitHub is asked again
+NEGATIVE_TTL = 15 * 60
+NEGATIVE_STATUSES = (404, 410)
+
+MAX_CONCURRENCY = 8
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+RETRY_STATUSES = (403, 429, 500, 502, 503, 504)
+
+
+class RequestScheduler:
+    """
+    Gate every request has to pass before it is sent.
+
+    At most `MAX_CONCURRENCY` requests are in flight, metadata requests are
+    let through before waiting downloads, and once GitHub reports the quota
+    as used up every request waits for its reset instead of failing.
+    """
+
+    def __init__(self, concurrency: int = MAX_CONCURRENCY):
+        self.concurrency = concurrency
+        self.active = 0
+        self.waiting_metadata = 0
+        self.paused_until = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, download: bool = False) -> None:
+        with self._condition:
+            if not download:
+                self.waiting_metadata += 1
+            try:
+                while self.active >= self.concurrency or (
+                    download and self.waiting_metadata
+                ):
+                    self._condition.wait()
+                self.active += 1
+            finally:
+                if not download:
+                    self.waiting_metadata -= 1
+
+        if (delay := self.paused_until - time.time()) > 0:
+            logging.warning(f"GitHub rate limit reached, waiting {delay:.0f}s for it to reset...")
+            time.sleep(delay)
+
+    def release(self) -> None:
+        with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+
+    def pause_until(self, timestamp: float) -> None:
+        with self._condition:
+            self.paused_until = max(self.paused_until, timestamp)
+
+
+class GitHubClient:
+    """
+    Pooled HTTP client every GitHub request goes through.
+
+    One keep-alive session is shared by all threads, so a run pays for a TLS
+    handshake per host instead of per request. Cacheable GETs are stored on
+    disk and revalidated with If-None-Match/If-Modified-Since (GitHub doesn't
+    count 304 responses against the rate limit), and missing resources are
+    remembered for `NEGATIVE_TTL` seconds without asking again.
+
+    Requests are scheduled by a `RequestScheduler` and retried with
+    exponential backoff and jitter when GitHub is rate limiting or failing.
+    The client counts what it did for the summary printed after a command.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._setup()
+        return cls._instance
+
+    def _setup(self, cache_path: str = HTTP_CACHE_PATH):
+        self.cache_path = cache_path
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {"User-Agent": "pulse", "Accept-Encoding": "gzip, deflate"}
+        )
+        self.scheduler = RequestScheduler()
+        self.stats = {"requests": 0, "not_modified": 0, "cached": 0, "retries": 0}
+        self.rate_remaining: int | None = None
+        self._stats_lock = threading.Lock()
+
+    def get(
+        self,
+        url: str,
+        headers: dict | None = None,
+        cache: bool = False,
+        download: bool = False,
+        **kwargs,
+    ) -> requests.Response:
+        """
+        Send a GET request.
+
+        Args:
+            url (str): URL to get.
+            headers (dict): Additional request headers.
+            cache (bool): Answer from the on-disk cache and revalidate it.
+            download (bool): Schedule it after waiting metadata requests.
+            **kwargs: Passed on to `requests.Session.get`.
+
+        Returns:
+            requests.Response: The response, rebuilt from the cache if it wasn't modified.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+        """
+        if not cache:
+            return self._send("GET", url, headers, download, **kwargs)
+
+        headers = dict(headers or {})
+        cache_file = self._cache_file(url, headers, kwargs.get("params"))
+        cached = self._read(cache_file)
+
+        if cached:
+            if cached["status"] in NEGATIVE_STATUSES:
+                if time.time() - cached["stored"] < NEGATIVE_TTL:
+                    logging.debug(f"Answered {url} from the negative cache")
+                    self._count("cached")
+                    return self._response(url, cached)
+            else:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = self._send("GET", url, headers, download, **kwargs)
+
+        if response.status_code == 304 and cached:
+            logging.debug(f"{url} has not been modified")
+            self._count("not_modified")
+            return self._response(url, cached)
+
+        if response.ok or response.status_code in NEGATIVE_STATUSES:
+            self._write(
+                cache_file,
+                {
+                    "status": response.status_code,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "content_type": response.headers.get("Content-Type"),
+                    "stored": time.time(),
+                    "body": base64.b64encode(response.content).decode(),
+                },
+            )
+
+        return response
+
+    def post(self, url: str, headers: dict | None = None, **kwargs) -> requests.Response:
+        return self._send("POST", url, headers, False, **kwargs)
+
+    def summary(self) -> str | None:
+        """One line of API accounting for this run, None if nothing was requested."""
+        stats = self.stats
+        if not stats["requests"] and not stats["cached"]:
+            return None
+
+        line = (
+            f"GitHub: {stats['requests']} requests, {stats['not_modified']} not modified (304), "
+            f"{stats['cached']} answered from cache, {stats['retries']} retried"
+        )
+        if self.rate_remaining is not None:
+            line += f", {self.rate_remaining} calls of quota left"
+        return line
+
+    def _send(
+        self, method: str, url: str, headers: dict | None, download: bool, **kwargs
+    ) -> requests.Response:
+        """Send a request through the scheduler, retrying rate limits and server errors."""
+        for attempt in range(MAX_RETRIES + 1):
+            self.scheduler.acquire(download)
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            finally:
+                self.scheduler.release()
+
+            self._count("requests")
+            delay = self._retry_delay(response, attempt)
+            if delay is None or attempt == MAX_RETRIES:
+                return response
+
+            logging.warning(
+                f"{url} returned {response.status_code}, retrying in {delay:.1f}s..."
+            )
+            self._count("retries")
+            response.close()
+            time.sleep(delay)
+
+        return response
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float | None:
+        """Seconds to wait before retrying a response, None if it shouldn't be retried."""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            self.rate_remaining = int(remaining)
+
+        if response.status_code not in RETRY_STATUSES:
+            return None
+
+        if retry_after := response.headers.get("Retry-After"):
+            if retry_after.isdigit():
+                return float(retry_after)
+
+        if remaining == "0":
+            reset = float(response.headers.get("X-RateLimit-Reset", time.time()))
+            # every other request has to wait for the reset too
+            self.scheduler.pause_until(reset + 1)
+            return max(reset + 1 - time.time(), 0.0)
+
+        if response.status_code == 403:
+            # forbidden for another reason than rate limiting
+            return None
+
+        backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt)
+        return random.uniform(0, backoff)
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _cache_file(self, url: str, headers: dict, params: dict | None = None) -> str:
+        # the query string is part of the resource, e.g. ?ref= of the contents API
+        url = requests.Request("GET", url, params=params).prepare().url
+        # responses depend on who is asking, e.g. for private repositories
+        key = f"{url}\n{headers.get('Authorization', '')}\n{headers.get('Accept', '')}"
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.cache_path, digest[:2], f"{digest[2:]}.json")
+
+    def _read(self, cache_file: str) -> dict | None:
+        try:
+            with open(cache_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, cache_file: str, data: dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_file), prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, cache_file)
+        except OSError as e:
+            logging.debug(f"Failed to cache response: {e}")
+
+    def _response(self, url: str, cached: dict) -> requests.Response:
+        response = requests.Response()
+        response.url = url
+        response.status_code = cached["status"]
+        response._content = base64.b64decode(cached["body"])
+        response.encoding = "utf-8"
+        if cached.get("content_type"):
+            response.headers["Content-Type"] = cached["content_type"]
+        if cached.get("etag"):
+            response.headers["ETag"] = cached["etag"]
+        return response
@@ -1,32 +1,194 @@
 import os
+import re
+import shutil
+import hashlib
 import tarfile
-from zipfile import ZipFile
+from pathlib import Path
 import requests
-from github import Github
+import urllib3
 import logging
-from ..core.core_dir import safe_open
+from ..core.core_dir import safe_open, DOWNLOAD_PATH
+from ..core.core_lock import cache_lock, staging_dir, replace_directory
+from ..core.core_archive import extract_zip
 from ..user import User
+from .git_client import GitHubClient
+from .git_mirror import release_asset_url
 import tomli
 
+client = GitHubClient()
+
+CHUNK_SIZE = 1024 * 1024
+# attempts to resume a download whose connection dropped
+DOWNLOAD_ATTEMPTS = 5
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-\d+/(\d+|\*)$")
+
+
+def download_file(
+    url: str,
+    path: str,
+    headers: dict | None = None,
+    size: int | None = None,
+    digest: str | None = None,
+) -> bool:
+    """
+    Streams a file to disk in chunks, resuming it if the connection drops.
+
+    The data is written to a `.part` file in the download folder, named after
+    the URL, so a download interrupted in this or an earlier run continues
+    with a Range request where it stopped. The file is moved to its path only
+    once its length and checksum have been checked.
+
+    Parameters:
+        url (str): URL to download.
+        path (str): Where the completed file is put.
+        headers (dict): Additional request headers.
+        size (int): Expected size in bytes, the Content-Length is checked otherwise.
+        digest (str): Expected checksum as "sha256:<hex>", like GitHub reports for release assets.
+
+    Returns:
+        bool: True if the file was downloaded and verified, False otherwise
+    """
+    part = Path(DOWNLOAD_PATH) / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.part"
+
+    with cache_lock(part):
+        resumed = part.exists()
+        ok = _fetch_verified(url, part, headers, size, digest)
+        if not ok and resumed and not part.exists():
+            # the file may have changed since the part was downloaded
+            logging.info(f"Downloading {url} again from the start")
+            ok = _fetch_verified(url, part, headers, size, digest)
+
+        if not ok:
+            return False
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        shutil.move(part, path)
+
+    return True
+
+
+def _fetch_verified(
+    url: str, part: Path, headers: dict | None, size: int | None, digest: str | None
+) -> bool:
+    """Complete a `.part` file and check it, it is removed if the check fails."""
+    for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+        try:
+            ok, total = _download_part(url, part, headers)
+            break
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            logging.warning(f"Download of {url} was interrupted ({e}), resuming ({attempt}/{DOWNLOAD_ATTEMPTS})...")
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to download {url}: {e}")
+            return False
+    else:
+        logging.error(f"Failed to download {url} after {DOWNLOAD_ATTEMPTS} attempts")
+        return False
+
+    if not ok:
+        return False
+
+    expected = size if size is not None else total
+    actual = part.stat().st_size
+    if expected is not None and actual != expected:
+        logging.error(f"Download of {url} is incomplete: {actual} of {expected} bytes")
+        part.unlink()
+        return False
+
+    if digest and not _digest_matches(part, digest):
+        logging.error(f"Checksum of {url} doesn't match {digest}")
+        part.unlink()
+        return False
+
+    return True
+
+
+def _download_part(url: str, part: Path, headers: dict | None) -> tuple[bool, int | None]:
+    """
+    Download the rest of a `.part` file.
+
+    Returns:
+        tuple[bool, int | None]: Whether the server sent the file and its full
+        size, if the server told it.
+    """
+    offset = part.stat().st_size if part.exists() else 0
+    # ranges are over the stored bytes, so the body must not be re-encoded
+    request_headers = {**(headers or {}), "Accept-Encoding": "identity"}
+    if offset:
+        request_headers["Range"] = f"bytes={offset}-"
+
+    with client.get(
+        url, headers=request_headers, stream=True, allow_redirects=True, download=True
+    ) as response:
+        if response.status_code == 416:
+            # the part file is complete already, or no longer matches the file
+            logging.debug(f"Server refused to resume {url}, starting over")
+            part.unlink()
+            return _download_part(url, part, headers)
+
+        if response.status_code == 206 and (
+            match := CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        ) and int(match.group(1)) == offset:
+            mode = "ab"
+            total = int(match.group(2)) if match.group(2) != "*" else None
+            logging.info(f"Resuming download of {url} at {offset} bytes")
+        elif response.status_code == 200:
+            mode = "wb"
+            length = response.headers.get("Content-Length")
+            total = int(length) if length and length.isdigit() else None
+        else:
+            logging.error(f"Failed to download {url}. Status code: {response.status_code}")
+            return False, None
+
+        part.parent.mkdir(parents=True, exist_ok=True)
+        with open(part, mode) as f:
+            for chunk in response.iter_content(CHUNK_SIZE):
+                f.write(chunk)
+
+    return True, total
+
+
+def _digest_matches(path: Path, digest: str) -> bool:
+    algorithm, _, expected = digest.partition(":")
+    if algorithm not in hashlib.algorithms_available:
+        logging.debug(f"Can't check a {algorithm} digest, skipping")
+        return True
+
+    hasher = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            hasher.update(chunk)
+
+    return hasher.hexdigest() == expected.lower()
+
 
 def download_and_unzip_github_release(
-    owner: str, repo: str, tag: str, asset_name: str, target_folder: str, remove_asset: bool = True
+    owner: str,
+    repo: str,
+    tag: str,
+    asset_name: str,
+    target_folder: str,
+    remove_asset: bool = True,
 ) -> None:
     """
     Downloads and unzips a specific release asset from a GitHub repository.
 
+    A .tar.gz asset is extracted from the response while it downloads, without
+    writing the archive to disk. If the stream fails or doesn't match the
+    checksum of the asset, it is downloaded to a file and extracted from there.
+
     Parameters:
         owner (str): The owner (username or organization) of the GitHub repository.
         repo (str): The name of the GitHub repository.
         tag (str): The tag (version) of the release from which the asset will be downloaded.
         asset_name (str): The name of the asset to download.
         target_folder (str): The local path where the asset will be extracted.
+        remove_asset (bool): Whether to remove the downloaded asset after extraction.
 
     Returns:
         None
     """
     api_url = f"https://api.github.com/repos/{owner}/{repo}/releases/tags/{tag}"
-    response = requests.get(api_url)
+    response = client.get(api_url, cache=True)
 
     if response.status_code != 200:
         print(
@@ -36,36 +198,39 @@ def download_and_unzip_github_release(
 
     release_info = response.json()
 
-    asset_url = None
-    for asset in release_info.get("assets", []):
-        if asset["name"] == asset_name:
-            asset_url = asset["browser_download_url"]
+    asset = None
+    for a in release_info.get("assets", []):
+        if a["name"] == asset_name:
+            asset = a
             break
 
-    if asset_url is None:
+    if asset is None:
         print(f"Asset '{asset_name}' not found in the release.")
         return
 
-    try:
-        response = requests.get(asset_url, allow_redirects=True)
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to connect to the server: {e}")
+    if str(asset_name).endswith(".tar.gz") and stream_tar_asset(
+        asset["browser_download_url"],
+        target_folder,
+        size=asset.get("size"),
+        digest=asset.get("digest"),
+    ):
+        print(f"Asset downloaded and extracted to: {target_folder}")
         return
 
-    if response.status_code == 200:
+    asset_path = os.path.join(target_folder, asset_name)
+    if download_file(
+        asset["browser_download_url"],
+        asset_path,
+        size=asset.get("size"),
+        digest=asset.get("digest"),
+    ):
         print("Asset download successful")
-        os.makedirs(target_folder, exist_ok=True)
-        asset_path = os.path.join(target_folder, asset_name)
-
-        with open(asset_path, "wb") as asset_file:
-            asset_file.write(response.content)
 
         if str(asset_name).endswith(".zip"):
-            with ZipFile(asset_path, "r") as zip_ref:
-                zip_ref.extractall(target_folder)
+            extract_zip(asset_path, target_folder)
         elif str(asset_name).endswith(".tar.gz"):
-            with tarfile.open(asset_path, "r:gz") as tar_ref:
-                tar_ref.extractall(target_folder)
+            with open(asset_path, "rb") as f:
+                extract_tar_stream(f, target_folder)
         elif str(asset_name).endswith(".dll") or str(asset_name).endswith(".so"):
             print(f"Moving {asset_path} to {target_folder}")
         else:
@@ -78,7 +243,97 @@ def download_and_unzip_github_release(
         print(f"Asset downloaded and extracted to: {target_folder}")
 
     else:
-        print(f"Failed to download the asset. HTTP Status Code: {response.status_code}")
+        print(f"Failed to download the asset '{asset_name}'.")
+
+
+def stream_tar_asset(
+    url: str,
+    target_folder: str,
+    strip_components: int = 0,
+    size: int | None = None,
+    digest: str | None = None,
+) -> bool:
+    """
+    Extracts a .tar.gz download while it arrives.
+
+    Decompression and extraction run on the response stream, so the archive
+    is never written to disk. The stream is hashed as it is read and checked
+    against the expected size and checksum once it has ended. Until then the
+    files are kept in a temporary sibling of the target folder, which is
+    removed if anything fails.
+
+    Parameters:
+        url (str): URL of the archive.
+        target_folder (str): The local path where the archive will be extracted.
+        strip_components (int): Number of leading path components to strip.
+        size (int): Expected size of the archive in bytes.
+        digest (str): Expected checksum as "sha256:<hex>".
+
+    Returns:
+        bool: True if the archive was extracted and verified, False otherwise
+    """
+    algorithm = digest.partition(":")[0] if digest else "sha256"
+    if algorithm not in hashlib.algorithms_available:
+        algorithm, digest = "sha256", None
+
+    staging = staging_dir(target_folder)
+    try:
+        with client.get(
+            url,
+            headers={"Accept-Encoding": "identity"},
+            stream=True,
+            allow_redirects=True,
+            download=True,
+        ) as response:
+            if response.status_code != 200:
+                logging.error(f"Failed to download {url}. Status code: {response.status_code}")
+                return False
+
+            reader = _HashingReader(response.raw, algorithm)
+            extract_tar_stream(reader, str(staging), strip_components=strip_components)
+            # the hash covers the end-of-archive padding as well
+            while reader.read(CHUNK_SIZE):
+                pass
+
+        if size is not None and reader.length != size:
+            logging.warning(f"Download of {url} is incomplete: {reader.length} of {size} bytes")
+            return False
+
+        if digest and reader.hexdigest() != digest.partition(":")[2].lower():
+            logging.warning(f"Checksum of {url} doesn't match {digest}")
+            return False
+
+        if os.path.isdir(target_folder) and os.listdir(target_folder):
+            shutil.copytree(staging, target_folder, symlinks=True, dirs_exist_ok=True)
+        else:
+            replace_directory(staging, target_folder)
+
+    except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError, tarfile.TarError, EOFError, OSError) as e:
+        logging.warning(f"Streaming extraction of {url} failed: {e}")
+        return False
+
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return True
+
+
+class _HashingReader:
+    """Read-only stream wrapper which hashes and counts what is read through it."""
+
+    def __init__(self, raw, algorithm: str = "sha256"):
+        self.raw = raw
+        self.length = 0
+        self._hasher = hashlib.new(algorithm)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self._hasher.update(data)
+        self.length += len(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
 
 
 def download_github_release(
@@ -97,21 +352,24 @@ def download_github_release(
     Returns:
         str | None: Path to the downloaded asset if successful, None if failed
     """
+    if asset_path := download_mirror_asset(owner, repo, tag, asset_name, target_folder):
+        return asset_path
+
     try:
         usr = User()
 
-        g = Github(usr.git_token)
-        repository = g.get_repo(f"{owner}/{repo}")
-        
-        try:
-            release = repository.get_release(tag)
-        except Exception:
+        response = client.get(
+            f"https://api.github.com/repos/{owner}/{repo}/releases/tags/{tag}",
+            headers={"Authorization": f"token {usr.git_token}"},
+            cache=True,
+        )
+        if not response.ok:
             logging.error(f"Failed to get release information for tag: {tag}")
             return None
 
         asset = None
-        for a in release.get_assets():
-            if a.name == asset_name:
+        for a in response.json().get("assets", []):
+            if a["name"] == asset_name:
                 asset = a
                 break
 
@@ -119,38 +377,210 @@ def download_github_release(
             logging.error(f"Asset '{asset_name}' not found in the release")
             return None
 
-        try:
-            os.makedirs(target_folder, exist_ok=True)
-            asset_path = os.path.join(target_folder, asset_name)
-            
-            headers = {
-                "Accept": "application/octet-stream",
-                "Authorization": f"token {usr.git_token}"
-            }
-            
-            response = requests.get(
-                asset.browser_download_url,
-                headers=headers,
-                allow_redirects=True
-            )
-            
-            if response.status_code == 200:
-                with open(asset_path, 'wb') as f:
-                    f.write(response.content)
-                logging.info("Asset download successful")
-                return asset_path
-            else:
-                logging.error(f"Failed to download asset. Status code: {response.status_code}")
-                return None
-            
-        except Exception as e:
-            logging.error(f"Failed to download asset: {e}")
+        asset_path = os.path.join(target_folder, asset_name)
+        headers = {
+            "Accept": "application/octet-stream",
+            "Authorization": f"token {usr.git_token}"
+        }
+
+        if not download_file(
+            asset["browser_download_url"],
+            asset_path,
+            headers=headers,
+            size=asset.get("size"),
+            digest=asset.get("digest"),
+        ):
             return None
 
+        logging.info("Asset download successful")
+        return asset_path
+
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         return None
 
+def download_release_asset(
+    owner: str, repo: str, tag: str, asset_name: str, target_folder: str
+) -> str | None:
+    """
+    Downloads a release asset whose tag and name are already known.
+
+    Unlike `download_github_release` this is a plain fetch of the release
+    download URL and doesn't use the GitHub API.
+
+    Parameters:
+        owner (str): The owner (username or organization) of the GitHub repository.
+        repo (str): The name of the GitHub repository.
+        tag (str): The tag (version) of the release.
+        asset_name (str): The name of the asset to download.
+        target_folder (str): The local path where the asset will be saved.
+
+    Returns:
+        str | None: Path to the downloaded asset if successful, None if failed
+    """
+    if asset_path := download_mirror_asset(owner, repo, tag, asset_name, target_folder):
+        return asset_path
+
+    usr = User()
+    url = f"https://github.com/{owner}/{repo}/releases/download/{tag}/{asset_name}"
+    headers = {
+        "Accept": "application/octet-stream",
+        "Authorization": f"token {usr.git_token}"
+    }
+
+    asset_path = os.path.join(target_folder, asset_name)
+    if not download_file(url, asset_path, headers=headers):
+        return None
+
+    logging.info("Asset download successful")
+    return asset_path
+
+def download_mirror_asset(
+    owner: str, repo: str, tag: str, asset_name: str, target_folder: str
+) -> str | None:
+    """
+    Downloads a release asset from the package mirror, if one is configured.
+
+    Parameters:
+        owner (str): The owner (username or organization) of the GitHub repository.
+        repo (str): The name of the GitHub repository.
+        tag (str): The tag (version) of the release.
+        asset_name (str): The name of the asset to download.
+        target_folder (str): The local path where the asset will be saved.
+
+    Returns:
+        str | None: Path to the downloaded asset, None if there is no mirror or it doesn't have the asset
+    """
+    url = release_asset_url(owner, repo, tag, asset_name)
+    if not url:
+        return None
+
+    asset_path = os.path.join(target_folder, asset_name)
+    try:
+        if not download_file(url, asset_path):
+            logging.debug(f"Mirror doesn't have {asset_name}, falling back to GitHub")
+            return None
+
+    except OSError as e:
+        logging.debug(f"Mirror download of {asset_name} failed, falling back to GitHub: {e}")
+        return None
+
+    logging.info(f"Downloaded {asset_name} from the package mirror")
+    return asset_path
+
+def download_archive(owner: str, repo: str, ref: str, target_folder: str) -> str | None:
+    """
+    Streams the source tarball of a ref straight into a folder.
+
+    The archive is extracted while it downloads, without a temporary file,
+    and its top-level folder is stripped.
+
+    Parameters:
+        owner (str): The owner (username or organization) of the GitHub repository.
+        repo (str): The name of the GitHub repository.
+        ref (str): Branch, tag or commit to download.
+        target_folder (str): The local path where the archive will be extracted.
+
+    Returns:
+        str | None: SHA of the commit the archive was made from, None if failed
+    """
+    usr = User()
+    url = f"https://codeload.github.com/{owner}/{repo}/tar.gz/{ref}"
+    headers = {"Authorization": f"token {usr.git_token}"}
+
+    try:
+        with client.get(url, headers=headers, stream=True, download=True) as response:
+            if response.status_code != 200:
+                logging.error(f"Failed to download archive of {owner}/{repo}@{ref}. Status code: {response.status_code}")
+                return None
+
+            pax_headers = extract_tar_stream(response.raw, target_folder, strip_components=1)
+
+    except (requests.exceptions.RequestException, tarfile.TarError, OSError) as e:
+        logging.error(f"Failed to download archive of {owner}/{repo}@{ref}: {e}")
+        return None
+
+    # git archive stores the commit id in the global pax header
+    return pax_headers.get("comment")
+
+
+def extract_tar_stream(fileobj, target_folder: str, strip_components: int = 0) -> dict:
+    """
+    Extracts a gzipped tar archive from a non-seekable stream in one pass.
+
+    Folders, regular files and links are extracted. Nothing is written
+    outside of the target folder and links pointing out of it are skipped.
+
+    Parameters:
+        fileobj: Readable binary stream of the .tar.gz data.
+        target_folder (str): The local path where the archive will be extracted.
+        strip_components (int): Number of leading path components to strip.
+
+    Returns:
+        dict: Global pax headers of the archive.
+    """
+    root = os.path.realpath(target_folder)
+    os.makedirs(root, exist_ok=True)
+
+    def inside(path: str) -> bool:
+        return path.startswith(root + os.sep)
+
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            parts = member.name.split("/")[strip_components:]
+            if not parts or not any(parts):
+                continue
+
+            target = os.path.realpath(os.path.join(root, *parts))
+            if not inside(target):
+                logging.warning(f"Skipping archive member outside of the target folder: {member.name}")
+                continue
+
+            if member.isdir():
+                os.makedirs(target, exist_ok=True)
+            elif member.isfile():
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with tar.extractfile(member) as source, open(target, "wb") as destination:
+                    shutil.copyfileobj(source, destination)
+                os.chmod(target, 0o755 if member.mode & 0o111 else 0o644)
+            elif member.issym() or member.islnk():
+                _extract_tar_link(member, root, parts, strip_components, inside)
+            else:
+                logging.debug(f"Skipping special archive member {member.name}")
+
+        return tar.pax_headers
+
+def _extract_tar_link(member, root: str, parts: list[str], strip_components: int, inside) -> None:
+    """Recreates a symbolic or hard link member if it and what it points to are inside the root."""
+    # the link itself isn't followed, only the folder it is in
+    folder = os.path.realpath(os.path.join(root, *parts[:-1]))
+    link = os.path.join(folder, parts[-1])
+
+    if member.issym():
+        source = os.path.realpath(os.path.join(folder, member.linkname))
+    else:
+        source = os.path.realpath(os.path.join(root, *member.linkname.split("/")[strip_components:]))
+
+    if not inside(link) or not (source == root or inside(source)):
+        logging.warning(f"Skipping link pointing outside of the target folder: {member.name} -> {member.linkname}")
+        return
+
+    try:
+        os.makedirs(folder, exist_ok=True)
+        if os.path.lexists(link):
+            os.unlink(link)
+
+        if member.issym():
+            os.symlink(member.linkname, link)
+        else:
+            try:
+                os.link(source, link)
+            except OSError:
+                shutil.copy2(source, link)
+
+    except OSError as e:
+        logging.warning(f"Failed to create link {member.name} -> {member.linkname}: {e}")
+
 def extract_asset(asset_path: str, target_folder: str, remove_asset: bool = True) -> bool:
     """
     Extracts a downloaded asset to the target folder.
@@ -167,8 +597,7 @@ def extract_asset(asset_path: str, target_folder: str, remove_asset: bool = True
 
     try:
         if asset_name.endswith(".zip"):
-            with ZipFile(asset_path, "r") as zip_ref:
-                zip_ref.extractall(target_folder)
+            extract_zip(asset_path, target_folder)
         elif asset_name.endswith(".tar.gz"):
             with tarfile.open(asset_path, "r:gz") as tar_ref:
                 tar_ref.extractall(target_folder)
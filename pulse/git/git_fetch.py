@@ -0,0 +1,187 @@
+import shutil
+import logging
+
+from pathlib import Path
+from git import Repo, GitCommandError
+
+from ..core.core_lock import staging_dir
+
+
+def clone_package(
+    url: str,
+    mirror_path: Path,
+    save_path: Path,
+    separator: str,
+    version: str,
+    full: bool = False,
+) -> Repo:
+    """
+    Checks out a package version as a worktree of the repository's bare mirror.
+
+    The mirror holds one object database per repository. Only the requested
+    ref is fetched into it, with depth 1 and without blobs unless a full
+    clone is requested, and the worktree checkout then downloads just the
+    blobs the mirror doesn't have yet. The worktree is checked out next to
+    the save path and only moved there once it is complete.
+
+    Args:
+        url (str): Remote URL of the repository.
+        mirror_path (Path): Directory of the bare mirror.
+        save_path (Path): Directory to check the version out to.
+        separator (str): Package separator the version was given with.
+        version (str): Branch, tag or commit to check out.
+        full (bool): Fetch the whole history like a plain `git clone`.
+
+    Returns:
+        Repo: The worktree of the checked out version.
+
+    Raises:
+        GitCommandError: If fetching or checking out fails.
+    """
+    mirror = open_mirror(mirror_path, url)
+    commit = fetch_ref(mirror, separator, version, full)
+
+    # worktrees whose directory was removed would block adding the path again
+    mirror.git.worktree("prune")
+    staging = staging_dir(save_path).absolute()
+    try:
+        mirror.git.worktree("add", "--detach", str(staging), commit)
+        if save_path.exists():
+            shutil.rmtree(save_path)
+            # the removed version is still registered as a worktree
+            mirror.git.worktree("prune")
+        mirror.git.worktree("move", str(staging), str(save_path.absolute()))
+    except GitCommandError:
+        shutil.rmtree(staging, ignore_errors=True)
+        mirror.git.worktree("prune")
+        raise
+
+    return Repo(str(save_path))
+
+
+def open_mirror(mirror_path: Path, url: str) -> Repo:
+    """
+    Opens the bare mirror of a repository, creating it if needed.
+
+    Args:
+        mirror_path (Path): Directory of the bare mirror.
+        url (str): Remote URL of the repository.
+
+    Returns:
+        Repo: The bare mirror.
+    """
+    if mirror_path.is_dir():
+        mirror = Repo(str(mirror_path))
+        if mirror.remotes.origin.url != url:
+            mirror.remotes.origin.set_url(url)
+        return mirror
+
+    mirror_path.parent.mkdir(parents=True, exist_ok=True)
+    mirror = Repo.init(str(mirror_path), bare=True)
+    mirror.create_remote("origin", url)
+    logging.debug(f"Created mirror at {mirror_path}")
+    return mirror
+
+
+def fetch_ref(mirror: Repo, separator: str, version: str, full: bool = False) -> str:
+    """
+    Fetches a branch, tag or commit into the mirror.
+
+    Args:
+        mirror (Repo): The bare mirror.
+        separator (str): Package separator the version was given with.
+        version (str): Branch, tag or commit. The remote's default branch if empty.
+        full (bool): Fetch the whole history and every blob.
+
+    Returns:
+        str: SHA of the fetched commit.
+    """
+    options = _fetch_options(mirror, full)
+
+    if not version:
+        mirror.git.fetch("origin", "+HEAD:refs/remotes/origin/HEAD", no_tags=True, **options)
+        return mirror.git.rev_parse("refs/remotes/origin/HEAD^{commit}")
+
+    if separator == "#":
+        if not has_commit(mirror, version):
+            fetch_commit(mirror, "origin", version, full)
+        return mirror.git.rev_parse(f"{version}^{{commit}}")
+
+    # '@' refers to a branch and ':' to a tag, but either is accepted like `git clone --branch` does
+    kinds = ("tags", "heads") if separator == ":" else ("heads", "tags")
+    error = None
+    for kind in kinds:
+        ref = f"refs/{kind}/{version}"
+        try:
+            # caches cloned before mirrors existed have the branch checked out
+            mirror.git.fetch(
+                "origin", f"+{ref}:{ref}", no_tags=True, update_head_ok=True, **options
+            )
+            return mirror.git.rev_parse(f"{ref}^{{commit}}")
+        except GitCommandError as e:
+            error = e
+
+    raise error
+
+
+def fetch_commit(git_repo: Repo, remote: str, commit: str, full: bool = False) -> None:
+    """
+    Fetches a single commit into a repository.
+
+    Falls back to a blobless fetch of every branch when the server refuses
+    fetching by SHA, so only commits and trees are transferred.
+
+    Args:
+        git_repo (Repo): Repository to fetch into.
+        remote (str): Name of the remote.
+        commit (str): Full SHA of the commit.
+        full (bool): Fetch the whole history and every blob.
+    """
+    try:
+        git_repo.git.fetch(remote, commit, **_fetch_options(git_repo, full))
+    except GitCommandError as e:
+        logging.debug(f"Fetching {commit} directly failed, falling back to a partial fetch: {e}")
+        git_repo.git.fetch(
+            remote,
+            f"+refs/heads/*:refs/remotes/{remote}/*",
+            filter="blob:none",
+            unshallow=_is_shallow(git_repo),
+        )
+
+
+def has_commit(git_repo: Repo, commit: str) -> bool:
+    try:
+        git_repo.git.cat_file("-e", f"{commit}^{{commit}}")
+        return True
+    except GitCommandError:
+        return False
+
+
+def has_complete_commit(git_repo: Repo, commit: str) -> bool:
+    """
+    Check if a commit can be checked out without any network access.
+
+    A commit of a blobless mirror may lack the blobs of its tree, which git
+    would fetch lazily on checkout. Missing objects are listed without being
+    fetched.
+    """
+    if not has_commit(git_repo, commit):
+        return False
+
+    try:
+        objects = git_repo.git.rev_list("--objects", "--no-walk", "--missing=print", commit)
+    except GitCommandError:
+        return False
+
+    return not any(line.startswith("?") for line in objects.splitlines())
+
+
+def _fetch_options(git_repo: Repo, full: bool) -> dict:
+    if full:
+        return {"unshallow": _is_shallow(git_repo)}
+
+    return {"depth": 1, "filter": "blob:none"}
+
+
+def _is_shallow(git_repo: Repo) -> bool:
+    return (Path(git_repo.common_dir) / "shallow").exists()
@@ -0,0 +1,126 @@
+import json
+import logging
+
+import requests
+
+from ..user import User
+from .git_client import GitHubClient
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+MANIFEST_FILES = ("pulse.toml", "pawn.json")
+# repositories per query, well below GitHub's node limits
+BATCH_SIZE = 30
+
+REPOSITORY_FIELDS = """
+    defaultBranchRef {{ name }}
+    ref: object(expression: {ref}) {{ ...commitOid }}
+{manifests}
+"""
+
+MANIFEST_FIELD = "    {alias}: object(expression: {expression}) {{ ... on Blob {{ text }} }}"
+
+FRAGMENTS = """
+fragment commitOid on GitObject {
+    oid
+    ... on Tag { target { oid } }
+}
+"""
+
+
+def query_packages(packages: list[tuple[str, str, str | None]]) -> dict[tuple, dict | None]:
+    """
+    Fetches the metadata needed to install many packages in batched GraphQL queries.
+
+    For every (author, repo, ref) this resolves the default branch, the commit
+    the ref points to and which manifest the package has, looking at the ref
+    first and the default branch second like `check_files_github` does.
+
+    Args:
+        packages (list[tuple]): (author, repo, ref) of every package. A ref of
+            None stands for the default branch.
+
+    Returns:
+        dict: (author, repo, ref) mapped to a dict with `default_branch`,
+        `commit`, `manifest`, `text` (the manifest's content) and `on_ref`
+        (whether the manifest was found at the ref), or to None if the
+        repository or ref doesn't exist. Packages whose query failed are left out.
+    """
+    results = {}
+    for start in range(0, len(packages), BATCH_SIZE):
+        batch = packages[start : start + BATCH_SIZE]
+        data = _run_query(_build_query(batch))
+        if data is None:
+            continue
+
+        for index, package in enumerate(batch):
+            results[package] = _parse_repository(data.get(f"p{index}"))
+
+    return results
+
+
+def _build_query(batch: list[tuple[str, str, str | None]]) -> str:
+    repositories = []
+    for index, (author, repo, ref) in enumerate(batch):
+        ref = ref or "HEAD"
+        manifests = [
+            MANIFEST_FIELD.format(
+                alias=f"{prefix}{position}", expression=json.dumps(f"{base}:{file}")
+            )
+            for prefix, base in (("atRef", ref), ("atDefault", "HEAD"))
+            for position, file in enumerate(MANIFEST_FILES)
+        ]
+        fields = REPOSITORY_FIELDS.format(
+            ref=json.dumps(ref), manifests="\n".join(manifests)
+        )
+        repositories.append(
+            f"  p{index}: repository(owner: {json.dumps(author)}, name: {json.dumps(repo)}) {{{fields}  }}"
+        )
+
+    return "query {\n" + "\n".join(repositories) + "\n}\n" + FRAGMENTS
+
+
+def _run_query(query: str) -> dict | None:
+    usr = User()
+    try:
+        response = GitHubClient().post(
+            GRAPHQL_URL,
+            headers={"Authorization": f"bearer {usr.git_token}"},
+            json={"query": query},
+        )
+    except requests.exceptions.RequestException as e:
+        logging.warning(f"GraphQL metadata query failed: {e}")
+        return None
+
+    if not response.ok:
+        logging.warning(f"GraphQL metadata query failed. Status code: {response.status_code}")
+        return None
+
+    body = response.json()
+    # missing repositories are reported as errors next to partial data
+    for error in body.get("errors", []):
+        logging.debug(f"GraphQL: {error.get('message')}")
+
+    return body.get("data") or None
+
+
+def _parse_repository(repository: dict | None) -> dict | None:
+    if not repository or not repository.get("ref"):
+        return None
+
+    ref = repository["ref"]
+    metadata = {
+        "default_branch": (repository.get("defaultBranchRef") or {}).get("name"),
+        "commit": (ref.get("target") or {}).get("oid") or ref.get("oid"),
+        "manifest": None,
+        "text": None,
+        "on_ref": False,
+    }
+
+    for prefix in ("atRef", "atDefault"):
+        for position, file in enumerate(MANIFEST_FILES):
+            blob = repository.get(f"{prefix}{position}")
+            if blob and blob.get("text") is not None:
+                metadata.update(manifest=file, text=blob["text"], on_ref=prefix == "atRef")
+                return metadata
+
+    return metadata
@@ -0,0 +1,37 @@
+import os
+
+from ..user import User
+
+MIRROR_ENV = "PULSE_MIRROR"
+
+
+def mirror_url() -> str | None:
+    """
+    Base URL of the package mirror, if one is configured.
+
+    `PULSE_MIRROR` takes precedence over `mirror` in the user configuration.
+    A mirror is served by `pulse mirror serve`.
+    """
+    url = os.environ.get(MIRROR_ENV) or getattr(User(), "mirror", None)
+    return url.rstrip("/") if url else None
+
+
+def git_urls(author: str, repo: str, github_url: str) -> list[str]:
+    """Remotes to fetch a repository from, in order: the package mirror, then GitHub."""
+    mirror = mirror_url()
+    if not mirror:
+        return [github_url]
+
+    return [f"{mirror}/git/{author}/{repo}.git", github_url]
+
+
+def release_asset_url(owner: str, repo: str, tag: str, asset_name: str) -> str | None:
+    """URL of a release asset on the package mirror, None without a mirror."""
+    mirror = mirror_url()
+    return f"{mirror}/releases/{owner}/{repo}/{tag}/{asset_name}" if mirror else None
+
+
+def toolchain_url(type: str, version: str) -> str | None:
+    """URL of a runtime or compiler version packed as .tar.gz on the package mirror."""
+    mirror = mirror_url()
+    return f"{mirror}/{type}/{version}.tar.gz" if mirror else None
@@ -1,8 +1,10 @@
 from git import Repo
-from github import Github
-from github.Repository import Repository
 import os
 import logging
+from .git_client import GitHubClient
+
+client = GitHubClient()
+API_URL = "https://api.github.com"
 
 
 def publish_release(
@@ -27,23 +29,48 @@ def publish_release(
     logging.info(f"Pushed tag {tag_name} to remote!")
 
     logging.debug("Creating a release...")
-    g = Github(github_token)
-    github_repo: Repository = g.get_repo(repo_name)
-
-    release = github_repo.create_git_release(
-        tag=tag_name,
-        name=release_name,
-        message=release_message,
-        generate_release_notes=True,
-        prerelease=pre,
+    headers = {
+        "Authorization": f"token {github_token}",
+        "Accept": "application/vnd.github+json",
+    }
+    response = client.post(
+        f"{API_URL}/repos/{repo_name}/releases",
+        headers=headers,
+        json={
+            "tag_name": tag_name,
+            "name": release_name,
+            "body": release_message,
+            "generate_release_notes": True,
+            "prerelease": pre,
+        },
     )
+    if response.status_code != 201:
+        raise RuntimeError(
+            f"Failed to create release {release_name}. Status code: {response.status_code}, Message: {response.text}"
+        )
     logging.info(f"Created release {release_name} on GitHub!")
 
+    # "https://uploads.github.com/repos/owner/repo/releases/1/assets{?name,label}"
+    upload_url = response.json()["upload_url"].split("{")[0]
+
     logging.info("Uploading files to release...")
     for r_file in file_path:
-        with open(r_file, "rb"):
-            release.upload_asset(path=r_file, label=os.path.basename(r_file))
-            logging.info(f"Uploaded {r_file} to release {release_name}")
+        with open(r_file, "rb") as f:
+            # read whole, so a retried upload sends the file again
+            data = f.read()
+
+        name = os.path.basename(r_file)
+        response = client.post(
+            upload_url,
+            headers={**headers, "Content-Type": "application/octet-stream"},
+            params={"name": name, "label": name},
+            data=data,
+        )
+        if response.status_code != 201:
+            raise RuntimeError(
+                f"Failed to upload {r_file}. Status code: {response.status_code}, Message: {response.text}"
+            )
+        logging.info(f"Uploaded {r_file} to release {release_name}")
+
 
-    
     os.remove(os.path.join(os.getcwd(), "package.rel"))
\ No newline at end of file
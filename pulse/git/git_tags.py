@@ -0,0 +1,146 @@
+import re
+import json
+import logging
+
+from pathlib import Path
+from git import Repo, GitCommandError
+
+from .git_fetch import open_mirror, has_commit
+
+TAG_INDEX_FILE = "pulse-tags.json"
+SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+ABBREVIATED_SHA_PATTERN = re.compile(r"^[0-9a-f]{4,39}$")
+
+
+def latest_tag(url: str, mirror_path: Path, ref: str | None = None) -> str | None:
+    """
+    Finds the latest tag of a repository, or the latest one reachable from a ref.
+
+    Tags are listed with a single `git ls-remote`. Only tags which are new or
+    have moved since the last call are fetched, into a treeless mirror
+    (commits only), so dates and ancestry are answered by local git. The
+    tag of every ref asked for is remembered until the tags change.
+
+    Args:
+        url (str): Remote URL of the repository.
+        mirror_path (Path): Directory of the treeless tag mirror.
+        ref (str): Branch or commit. The newest tag of the repository if None.
+
+    Returns:
+        str | None: The tag name, None if there is no such tag.
+
+    Raises:
+        GitCommandError: If the remote can't be reached.
+    """
+    mirror = open_mirror(mirror_path, url)
+    tags, heads = _ls_remote(mirror)
+    index = _load_index(mirror)
+
+    if index["tags"] != tags:
+        _sync_tags(mirror, index["tags"], tags)
+        index = {"tags": tags, "reachable": {}}
+        _save_index(mirror, index)
+
+    if not tags:
+        return None
+
+    if not ref:
+        return (
+            # the last sort key is the primary one, versions break ties of equal dates
+            mirror.git.for_each_ref(
+                "--sort=-version:refname",
+                "--sort=-creatordate",
+                "--count=1",
+                "--format=%(refname:strip=2)",
+                "refs/tags",
+            )
+            or None
+        )
+
+    sha = heads.get(ref) or ref
+    if ABBREVIATED_SHA_PATTERN.match(sha) and not (sha := _expand_sha(mirror, sha)):
+        logging.error(f"Unknown branch or commit: {ref}")
+        return None
+
+    if sha in index["reachable"]:
+        return index["reachable"][sha]
+
+    if not has_commit(mirror, sha):
+        if not SHA_PATTERN.match(sha):
+            logging.error(f"Unknown branch or commit: {ref}")
+            return None
+
+        mirror.git.fetch("origin", sha, filter="tree:0", no_tags=True)
+
+    try:
+        tag = mirror.git.describe("--tags", "--abbrev=0", sha)
+    except GitCommandError:
+        tag = None
+
+    index["reachable"][sha] = tag
+    _save_index(mirror, index)
+    return tag
+
+
+def _expand_sha(mirror: Repo, sha: str) -> str | None:
+    """
+    Full SHA of an abbreviated commit.
+
+    Commits can only be fetched by their full SHA, so if the mirror doesn't
+    know the commit yet, the commits of every branch are fetched (treeless)
+    and it is looked up again.
+    """
+    for fetched in (False, True):
+        try:
+            return mirror.git.rev_parse("--verify", "--quiet", f"{sha}^{{commit}}")
+        except GitCommandError:
+            if fetched:
+                return None
+
+        mirror.git.fetch(
+            "origin", "+refs/heads/*:refs/remotes/origin/*", filter="tree:0", no_tags=True
+        )
+
+
+def _ls_remote(mirror: Repo) -> tuple[dict[str, str], dict[str, str]]:
+    """List the tags (peeled to their commits) and branches of the remote in one call."""
+    tags, heads = {}, {}
+    for line in mirror.git.ls_remote("--tags", "--heads", "origin").splitlines():
+        sha, ref = line.split("\t")
+        if ref.startswith("refs/heads/"):
+            heads[ref[len("refs/heads/"):]] = sha
+        elif ref.endswith("^{}"):
+            tags[ref[len("refs/tags/"):-3]] = sha
+        else:
+            tags.setdefault(ref[len("refs/tags/"):], sha)
+
+    return tags, heads
+
+
+def _sync_tags(mirror: Repo, known: dict[str, str], tags: dict[str, str]) -> None:
+    """Fetch new and moved tags, drop deleted ones."""
+    changed = [tag for tag, sha in tags.items() if known.get(tag) != sha]
+    if changed:
+        logging.debug(f"Fetching {len(changed)} tags")
+        mirror.git.fetch(
+            "origin",
+            *[f"+refs/tags/{tag}:refs/tags/{tag}" for tag in changed],
+            filter="tree:0",
+            no_tags=True,
+        )
+
+    for tag in set(known) - set(tags):
+        mirror.git.update_ref("-d", f"refs/tags/{tag}")
+
+
+def _load_index(mirror: Repo) -> dict:
+    try:
+        with open(Path(mirror.git_dir) / TAG_INDEX_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"tags": {}, "reachable": {}}
+
+
+def _save_index(mirror: Repo, index: dict) -> None:
+    with open(Path(mirror.git_dir) / TAG_INDEX_FILE, "w") as f:
+        json.dump(index, f)
@@ -0,0 +1,16 @@
+import click
+
+from .mirror_server import serve as serve_caches
+
+
+@click.group
+def mirror():
+    '''Shares the local caches with other machines.'''
+
+
+@mirror.command
+@click.option("--host", "-h", required=False, default="0.0.0.0", show_default=True, help="Address to listen on.")
+@click.option("--port", "-p", required=False, default=8080, show_default=True, type=int, help="Port to listen on.")
+def serve(host, port):
+    '''Serves cached packages, plugin releases, runtimes and compilers as a package mirror.'''
+    serve_caches(host, port)
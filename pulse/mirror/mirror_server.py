@@ -0,0 +1,156 @@
+import os
+import re
+import shutil
+import tarfile
+import logging
+import subprocess
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pulse.core.core_dir import PACKAGE_PATH, PLUGINS_PATH, RUNTIME_PATH, COMPILER_PATH
+
+NAME = r"[A-Za-z0-9_][A-Za-z0-9._-]*"
+GIT_ROUTE = re.compile(rf"^/git/({NAME})/({NAME})\.git(/.*)$")
+RELEASE_ROUTE = re.compile(rf"^/releases/{NAME}/({NAME})/({NAME})/({NAME})$")
+TOOLCHAIN_ROUTE = re.compile(rf"^/(runtime|compiler)/({NAME})\.tar\.gz$")
+
+TOOLCHAIN_PATHS = {"runtime": RUNTIME_PATH, "compiler": COMPILER_PATH}
+# lets clients fetch single commits and partial clones from the mirrors
+GIT_CONFIG = (
+    "-c",
+    "uploadpack.allowFilter=true",
+    "-c",
+    "uploadpack.allowAnySHA1InWant=true",
+)
+
+
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    """
+    Serves the local caches in the layout `pulse.git.git_mirror` expects.
+
+    - /git/<author>/<repo>.git: the package mirror, through `git http-backend`
+    - /releases/<owner>/<repo>/<tag>/<asset>: a downloaded plugin release asset
+    - /runtime/<version>.tar.gz, /compiler/<version>.tar.gz: a cached toolchain, packed on the fly
+    """
+
+    server_version = "pulse-mirror"
+
+    def do_GET(self):
+        self._route()
+
+    def do_POST(self):
+        self._route()
+
+    def _route(self):
+        path, _, query = self.path.partition("?")
+
+        if match := GIT_ROUTE.match(path):
+            author, repo, rest = match.groups()
+            return self._git(f"/{author}/{repo}/.mirror{rest}", query)
+
+        if self.command != "GET":
+            return self.send_error(405)
+
+        if match := RELEASE_ROUTE.match(path):
+            repo, tag, asset = match.groups()
+            return self._file(os.path.join(PLUGINS_PATH, repo, tag, asset))
+
+        if match := TOOLCHAIN_ROUTE.match(path):
+            type, version = match.groups()
+            return self._toolchain(os.path.join(TOOLCHAIN_PATHS[type], version))
+
+        self.send_error(404)
+
+    def _git(self, path_info: str, query: str) -> None:
+        env = {
+            **os.environ,
+            "GIT_PROJECT_ROOT": PACKAGE_PATH,
+            "GIT_HTTP_EXPORT_ALL": "1",
+            "PATH_INFO": path_info,
+            "QUERY_STRING": query,
+            "REQUEST_METHOD": self.command,
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "HTTP_CONTENT_ENCODING": self.headers.get("Content-Encoding", ""),
+            "GIT_PROTOCOL": self.headers.get("Git-Protocol", ""),
+            "REMOTE_ADDR": self.client_address[0],
+        }
+
+        process = subprocess.Popen(
+            ["git", *GIT_CONFIG, "http-backend"],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        process.stdin.write(self._read_body())
+        process.stdin.close()
+
+        status, headers = 200, []
+        while line := process.stdout.readline().rstrip(b"\r\n"):
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "status":
+                status = int(value.split()[0])
+            else:
+                headers.append((name, value.strip()))
+
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        shutil.copyfileobj(process.stdout, self.wfile)
+        process.wait()
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = b""
+            while size := int(self.rfile.readline().split(b";")[0], 16):
+                body += self.rfile.read(size)
+                self.rfile.readline()
+            self.rfile.readline()
+            return body
+
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _file(self, path: str) -> None:
+        if not os.path.isfile(path):
+            return self.send_error(404)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.end_headers()
+        with open(path, "rb") as f:
+            shutil.copyfileobj(f, self.wfile)
+
+    def _toolchain(self, path: str) -> None:
+        if not os.path.isdir(path):
+            return self.send_error(404)
+
+        # the size isn't known up front, the end of the body is the closed connection
+        self.send_response(200)
+        self.send_header("Content-Type", "application/gzip")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        with tarfile.open(fileobj=self.wfile, mode="w|gz") as tar:
+            for entry in sorted(os.listdir(path)):
+                tar.add(os.path.join(path, entry), arcname=entry)
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} - {format % args}")
+
+
+def serve(host: str, port: int) -> None:
+    """
+    Serves the local caches to other machines until interrupted.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on.
+    """
+    httpd = ThreadingHTTPServer((host, port), MirrorRequestHandler)
+    logging.info(f"Serving the Pulse caches on http://{host}:{port}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Mirror has been stopped.")
+    finally:
+        httpd.server_close()
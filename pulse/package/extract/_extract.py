@@ -0,0 +1,132 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import platform
+import tempfile
+
+from pathlib import Path
+
+from ..package_handle import handle_extraction_zip, handle_extraction_tar
+from ..store._store import PackageStore
+
+MEMO_FILE = ".extracted.json"
+MEMO_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+
+class ExtractionCache:
+    """
+    Memo of what extracting a plugin archive produced.
+
+    Every plugin release folder keeps a memo which maps (archive sha256,
+    resource spec hash, platform) to the store tree of the files the
+    extraction produced, relative to the requirements folder. An archive is
+    extracted once; every later install links those files out of the store.
+
+    The sha256 of an archive is remembered with its size and modification
+    time, so an unchanged archive isn't read again either.
+    """
+
+    def __init__(self, store: PackageStore, requirements_path: str | Path):
+        self.store = store
+        self.requirements_path = Path(requirements_path)
+
+    def extract(self, asset_path: Path, resource: dict, repo: str) -> list[Path]:
+        """
+        Put the files of a plugin archive into the project requirements.
+
+        Args:
+            asset_path (Path): Downloaded .zip or .tar.gz release asset.
+            resource (dict): Plugin resource of the package for this platform.
+            repo (str): Repository name, the resources are put in a folder named after it.
+
+        Returns:
+            list[Path]: The files placed in the requirements.
+        """
+        memo = self._load(asset_path.parent)
+        key = ":".join(
+            (
+                self._archive_digest(memo, asset_path),
+                self._spec_hash(resource, repo),
+                platform.system().lower(),
+            )
+        )
+
+        tree = memo["extractions"].get(key)
+        if tree and self.store.has_blobs(tree):
+            logging.debug(f"Linking the extracted files of {asset_path.name} from the store")
+        else:
+            tree = self._extract_to_store(asset_path, resource, repo)
+            memo["extractions"][key] = tree
+
+        self._save(asset_path.parent, memo)
+        return self.store.link_tree(tree, self.requirements_path)
+
+    def _extract_to_store(self, asset_path: Path, resource: dict, repo: str) -> str:
+        """Extract an archive into a scratch folder laid out like the requirements and ingest it."""
+        staging = Path(tempfile.mkdtemp(dir=asset_path.parent, prefix=".extract-"))
+        try:
+            handle = (
+                handle_extraction_zip
+                if asset_path.name.endswith(".zip")
+                else handle_extraction_tar
+            )
+            handle(
+                asset_path,
+                resource.get("includes", []),
+                ("", repo, ""),
+                resource.get("files", []),
+                resource.get("plugins", []),
+                cwd_path=str(staging / "plugins"),
+                resources_path=str(staging / ".resources"),
+            )
+            return self.store.ingest(staging)
+
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _archive_digest(self, memo: dict, asset_path: Path) -> str:
+        st = asset_path.stat()
+        known = memo["archives"].get(asset_path.name)
+        if known and known["size"] == st.st_size and known["mtime"] == st.st_mtime_ns:
+            return known["sha256"]
+
+        sha = hashlib.sha256()
+        with open(asset_path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                sha.update(chunk)
+
+        digest = sha.hexdigest()
+        memo["archives"][asset_path.name] = {
+            "size": st.st_size,
+            "mtime": st.st_mtime_ns,
+            "sha256": digest,
+        }
+        return digest
+
+    def _spec_hash(self, resource: dict, repo: str) -> str:
+        spec = json.dumps({"repo": repo, "resource": resource}, sort_keys=True)
+        return hashlib.sha256(spec.encode()).hexdigest()
+
+    def _load(self, release_path: Path) -> dict:
+        try:
+            with open(release_path / MEMO_FILE, "r") as f:
+                memo = json.load(f)
+        except (OSError, ValueError):
+            memo = {}
+
+        if memo.get("version") != MEMO_VERSION:
+            memo = {"version": MEMO_VERSION, "archives": {}, "extractions": {}}
+
+        return memo
+
+    def _save(self, release_path: Path, memo: dict) -> None:
+        try:
+            fd, tmp = tempfile.mkstemp(dir=release_path, prefix=".tmp-")
+            with os.fdopen(fd, "w") as f:
+                json.dump(memo, f, sort_keys=True)
+            os.replace(tmp, release_path / MEMO_FILE)
+        except OSError as e:
+            logging.debug(f"Failed to write the extraction memo of {release_path}: {e}")
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+
+from pathlib import Path
+
+from ...core.core_dir import CACHE_INDEX_FILE
+from ...core.core_lock import cache_lock
+
+INDEX_VERSION = 1
+
+
+class CacheIndex:
+    """
+    On-disk index of complete cache entries.
+
+    Every cached package version (keyed by its path relative to the package
+    cache) maps to the commit it is checked out at, the store tree of its
+    content and the time it was completed. A cache hit is then answered by a
+    lookup here instead of opening the git repository of the entry.
+
+    Several processes may share the cache, so only the entries changed by
+    this process are merged into the index on disk when it is saved.
+    """
+
+    def __init__(self, path: str | Path = CACHE_INDEX_FILE):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        self.changes: dict[str, dict | None] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        self.entries = self._read()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring invalid cache index {self.path}: {e}")
+            return {}
+
+        if data.get("version") != INDEX_VERSION:
+            logging.warning(f"Ignoring cache index {self.path} of unknown version")
+            return {}
+
+        return data.get("entries", {})
+
+    def get(self, key: str) -> dict | None:
+        return self.entries.get(key)
+
+    def record(self, key: str, commit: str, stamp: float | None = None) -> dict:
+        """
+        Mark a cache entry as complete at the given commit.
+
+        Any previously recorded tree is dropped, as the content may have changed.
+
+        Args:
+            key (str): Cache entry, relative to the package cache.
+            commit (str): Commit the entry is at.
+            stamp (float): Completion time, now by default.
+
+        Returns:
+            dict: The new entry.
+        """
+        entry = {"commit": commit, "stamp": stamp if stamp is not None else time.time()}
+        with self._lock:
+            self.entries[key] = entry
+            self.changes[key] = entry
+
+        return entry
+
+    def update(self, key: str, **fields) -> None:
+        with self._lock:
+            if key in self.entries:
+                self.entries[key].update(fields)
+                self.changes[key] = self.entries[key]
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            if self.entries.pop(key, None) is not None:
+                self.changes[key] = None
+
+    def save(self) -> None:
+        """Merge the changed entries into the index on disk and write it atomically."""
+        with self._lock:
+            changes, self.changes = self.changes, {}
+
+        if not changes:
+            return
+
+        try:
+            with cache_lock(self.path):
+                entries = self._read()
+                for key, entry in changes.items():
+                    if entry is None:
+                        entries.pop(key, None)
+                    else:
+                        entries[key] = entry
+
+                data = json.dumps(
+                    {"version": INDEX_VERSION, "entries": entries},
+                    sort_keys=True,
+                    separators=(",", ":"),
+                )
+
+                fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+                with os.fdopen(fd, "w") as f:
+                    f.write(data)
+                os.replace(tmp, self.path)
+
+        except OSError as e:
+            logging.error(f"Failed to write cache index {self.path}: {e}")
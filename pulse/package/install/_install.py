@@ -7,16 +7,36 @@ import shutil
 import stat
 import platform
 import re
+import time
 
 from pathlib import Path
-from typing import Callable
-from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from contextlib import nullcontext
+from concurrent.futures import Executor, ThreadPoolExecutor
 from git import Repo, GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 
-from ..package_handle import handle_extraction_zip, handle_extraction_tar
 from ..parse._parse import package_parse
+from ..store._store import PackageStore, ARCHIVE_FILE
+from ..lock._lock import PackageLock
+from ..index._index import CacheIndex
+from ..meta._meta import MetadataStore
+from ..extract._extract import ExtractionCache
+from ..resolve._resolve import DependencyResolver, DependencyNode
 from ...user import User
-from ...git.git_download import download_github_release
+from ...core.core_lock import cache_lock, staging_dir, replace_directory
+from ...git.git_download import (
+    download_archive,
+    download_github_release,
+    download_release_asset,
+)
+from ...git.git_fetch import (
+    clone_package,
+    fetch_ref,
+    has_complete_commit,
+    open_mirror,
+)
+from ...git.git_mirror import git_urls
+from ...git.git_graphql import query_packages
 from ...core.core_dir import (
     safe_open,
     PROJECT_TOML_FILE,
@@ -31,23 +51,49 @@ from ...git.git import (
     get_release_assets,
     check_files_github,
     download_file_from_github,
+    download_raw_file,
 )
 
+MANIFEST_FILES = ("pulse.toml", "pawn.json")
+
 
 class PackageInstaller:
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        full_clone: bool = False,
+        update: bool = False,
+        verify: bool = False,
+        offline: bool = False,
+    ):
         self.installed_deps = {}
-        self.installed_plugins = []
-        self.plugins_to_install = {}
+        self.max_workers = max_workers
+        self.full_clone = full_clone
+        self.update = update
+        self.verify = verify
+        self.offline = offline
+        self.missing: list[str] = []
+        self.cache_entries: dict[str, Path] = {}
+        self.remote_metadata: dict[str, dict | None] = {}
+        self.options = {}
+        self.fetch_mode = "git"
         self.package_path = Path(PACKAGE_PATH)
         self.requirements_path = Path(REQUIREMENTS_PATH)
         self.plugins_path = Path(PLUGINS_PATH)
+        self.store = PackageStore()
+        self.lock = PackageLock()
+        self.index = CacheIndex()
+        self.metadata = MetadataStore()
+        self.extraction = ExtractionCache(self.store, self.requirements_path)
 
     def install_all_packages(self):
         """Install all packages listed in project configuration."""
         with safe_open(PROJECT_TOML_FILE, "rb") as t:
             config = tomli.load(t)
+        self._load_options(config)
         self._install_deps(config["requirements"]["live"])
+        if not self.missing:
+            self.lock.save(prune=True)
 
     def install_package(self, package: str) -> bool:
         """Install a single package and its dependencies."""
@@ -67,15 +113,83 @@ class PackageInstaller:
         ):
             return False
 
-        if self._install_single_package(package):
+        self._load_options(config)
+        if package in self._install_deps([package]):
             self._append_dependency(package)
-
-            deps = self._gather_dependencies(package)
-            self._install_deps(deps)
+            self.lock.save()
             return True
 
         return False
 
+    def fetch_all_packages(
+        self, platforms: list[str] | None = None, executor: Executor | None = None
+    ) -> bool:
+        """
+        Fill the caches with every package and plugin release the project needs.
+
+        Nothing is written to the project: packages aren't materialized into
+        the requirements, plugins aren't extracted and pulse.lock isn't saved.
+        Locked commits and releases are fetched if there is a lock.
+
+        Args:
+            platforms (list[str]): Platforms to download plugin releases for, every
+                platform a plugin has a resource for if None.
+            executor (Executor): Worker pool to schedule the downloads on, shared
+                with other downloads of the caller. A pool of `max_workers`
+                is started if None.
+
+        Returns:
+            bool: True if everything has been fetched.
+        """
+        with safe_open(PROJECT_TOML_FILE, "rb") as t:
+            config = tomli.load(t)
+        self._load_options(config)
+
+        with (
+            nullcontext(executor)
+            if executor is not None
+            else ThreadPoolExecutor(max_workers=self.max_workers)
+        ) as executor:
+            resolver = DependencyResolver(
+                self._resolve_package, executor, prefetch=self._prefetch_metadata
+            )
+            try:
+                nodes = resolver.resolve(config.get("requirements", {}).get("live", []))
+            finally:
+                self.index.save()
+                self.metadata.save()
+
+            plugins = [
+                (node.package, resource)
+                for node in nodes
+                if node.resolved
+                for resource in self._plugin_resources(node.package)
+                if platforms is None or resource["platform"] in platforms
+            ]
+            results = list(executor.map(lambda plugin: self._fetch_plugin(*plugin), plugins))
+
+        failed_plugins = [
+            f"{package} ({resource['platform']} release)"
+            for (package, resource), result in zip(plugins, results)
+            if result is None
+        ]
+        failed = [
+            node.package for node in resolver.nodes.values() if not node.resolved
+        ] + failed_plugins
+        if failed:
+            logging.error("Failed to fetch:\n  " + "\n  ".join(failed))
+
+        logging.info(
+            f"Fetched {len(nodes)} packages and {len(plugins) - len(failed_plugins)} plugin releases"
+        )
+        return not failed
+
+    def _load_options(self, config: dict) -> None:
+        """Read the project-wide and per-requirement install options."""
+        requirements = config.get("requirements", {})
+        self.options = requirements.get("options", {})
+        self.fetch_mode = requirements.get("fetch", "git")
+
     def _check_repository(self, path: Path) -> Repo | None:
         """Verify if repository exists and is valid."""
         try:
@@ -98,68 +212,235 @@ class PackageInstaller:
             logging.error(f"Unexpected error checking repository: {e}")
             return None
 
-    def _install_single_package(self, package: str) -> bool:
-        """Install a single package without dependencies."""
+    def _fetch_package(self, package: str) -> Path | None:
+        """
+        Make sure a package is present in the cache, without touching the project.
+
+        The cache is shared by every project, so the repository is locked while
+        its mirror and worktrees are being changed. Another process installing
+        the same repository is waited for, and its result is reused.
+        """
         parsed_package = package_parse(package)
         if not parsed_package:
             logging.error(f"Invalid package format: {package}")
-            return False
+            return None
 
-        author, repo, separator, version = parsed_package
+        author, repo, _, _ = parsed_package
+        with cache_lock(self.package_path / author / repo):
+            return self._fetch_cache_entry(package, parsed_package)
 
-        if repo in self.installed_deps:
-            logging.warning(
-                f"Package {author}/{repo} already installed as {self.installed_deps[repo]['author']}/{repo}"
-            )
-            return False
+    def _fetch_cache_entry(self, package: str, parsed_package: tuple) -> Path | None:
+        author, repo, separator, version = parsed_package
+        save_path = self._cache_path(author, repo, version)
+        locked = self.lock.get(package)
 
-        save_path = (
-            self.package_path / author / repo / (version if version else "default")
-        )
+        if self.offline:
+            return self._fetch_offline(package, save_path, locked)
 
         if self._package_cached(save_path):
-            logging.info(f"{package} has been cached already. Moving it to project...")
+            logging.info(f"{package} has been cached already.")
             try:
-                dst = self.requirements_path / repo
+                refresh = separator in (None, "@") and self._refresh_due(author, repo, save_path)
+                # an expired ttl refreshes unlocked branches, only --update moves off the lock
+                if locked and not (refresh and self.update):
+                    if not self._checkout_locked_commit(author, repo, save_path, locked["commit"]):
+                        return None
+
+                elif refresh and not self._update_repo_state(
+                    author, repo, save_path, separator, version
+                ):
+                    return None
 
-                # Handle .git directory
+                self._lock_package(package, save_path)
+                return save_path
 
-                git_dir = dst / ".git"
-                if git_dir.exists():
-                    shutil.rmtree(git_dir, onerror=self._handle_copy_error)
+            except Exception as e:
+                logging.error(f"Failed to use cached package: {e}")
+                return None
 
-                shutil.copytree(save_path, dst, dirs_exist_ok=True)
+        archive = self._fetch_mode(author, repo) == "archive"
 
-                self.installed_deps[repo] = {
-                    "author": author,
-                    "version": version if version else "default",
-                }
+        if locked:
+            if archive:
+                cached = self._download_archive_package(
+                    author, repo, locked["commit"], save_path
+                )
+            else:
+                cached = self._clone_locked_repository(package, locked, save_path)
+            return save_path if cached else None
+
+        if archive:
+            cached = self._download_archive_package(author, repo, version, save_path)
+        elif package in self.remote_metadata:
+            cached = self._clone_prefetched_repository(
+                package, self.remote_metadata[package], save_path
+            )
+        else:
+            cached = self._clone_fresh_repository(
+                author, repo, separator, version, save_path
+            )
 
-                logging.info(f"Successfully moved cached package {package}")
-                return True
+        if cached:
+            self._lock_package(package, save_path)
+            return save_path
+
+        return None
+
+    def _fetch_offline(self, package: str, save_path: Path, locked: dict | None) -> Path | None:
+        """Find a package in the cache without any network access."""
+        author, repo, _, version = package_parse(package)
+
+        if not version and not self._package_cached(save_path):
+            # the newest cached version stands in for an unpinned requirement
+            save_path = self._newest_cached_version(author, repo) or save_path
+
+        if not self._package_cached(save_path):
+            mirror_path = self._mirror_path(author, repo)
+            if not (
+                locked
+                and mirror_path.is_dir()
+                and has_complete_commit(Repo(str(mirror_path)), locked["commit"])
+                and self._clone_locked_repository(package, locked, save_path)
+            ):
+                self.missing.append(f"{package}: not cached")
+                return None
 
-            except Exception as e:
-                logging.error(f"Failed to copy cached package: {e}")
-                return False
+        entry = self.index.get(self._index_key(save_path))
+        if locked and entry["commit"] != locked["commit"]:
+            if self._archive_commit(save_path) or not has_complete_commit(
+                Repo(str(save_path)), locked["commit"]
+            ):
+                self.missing.append(f"{package}: locked commit {locked['commit']} not cached")
+                return None
+
+            if not self._checkout_locked_commit(author, repo, save_path, locked["commit"]):
+                return None
+
+        self._lock_package(package, save_path)
+        return save_path
+
+    def _prefetch_metadata(self, packages: list[str]) -> None:
+        """Look up every package of a dependency level that needs a fresh clone in one batch."""
+        if self.offline:
+            return
+
+        wanted = {}
+        for package in packages:
+            parsed_package = package_parse(package)
+            if not parsed_package or self.lock.get(package):
+                continue
+
+            author, repo, _, version = parsed_package
+            save_path = self._cache_path(author, repo, version)
+            if self._fetch_mode(author, repo) != "git" or (
+                save_path.is_dir() and self.index.get(self._index_key(save_path))
+            ):
+                continue
+
+            wanted[(author, repo, version)] = package
+
+        if not wanted:
+            return
+
+        logging.debug(f"Querying metadata of {len(wanted)} packages")
+        for key, metadata in query_packages(list(wanted)).items():
+            self.remote_metadata[wanted[key]] = metadata
 
-        return self._clone_fresh_repository(author, repo, separator, version, save_path)
+    def _newest_cached_version(self, author: str, repo: str) -> Path | None:
+        """The most recently completed cache entry of a repository."""
+        repo_path = self.package_path / author / repo
+        if not repo_path.is_dir():
+            return None
+
+        versions = [
+            (entry["stamp"], path)
+            for path in repo_path.iterdir()
+            if not path.name.startswith(".")
+            and path.is_dir()
+            and (entry := self.index.get(self._index_key(path)))
+        ]
+        return max(versions)[1] if versions else None
+
+    def _resolve_package(self, package: str) -> tuple[list, dict | None] | None:
+        """Fetch a package and read its dependencies. Runs on the resolver's workers."""
+        save_path = self._fetch_package(package)
+        if not save_path:
+            return None
+
+        self.cache_entries[package] = save_path
+        return self._gather_dependencies(package, save_path)
+
+    def _install_node(self, node: DependencyNode) -> bool:
+        """Move a resolved package from the cache into the project."""
+        save_path = self.cache_entries[node.package]
+        try:
+            self._materialize_package(save_path, node.repo)
+        except Exception as e:
+            logging.error(f"Failed to move cached package {node.package}: {e}")
+            return False
+
+        self.installed_deps[node.repo] = {
+            "author": node.author,
+            "version": node.version if node.version else "default",
+        }
+
+        logging.info(f"Successfully moved package {node.package} to project")
+        return True
+
+    def _cache_path(self, author: str, repo: str, version: str | None) -> Path:
+        return self.package_path / author / repo / (version if version else "default")
+
+    def _index_key(self, save_path: Path) -> str:
+        return save_path.relative_to(self.package_path).as_posix()
+
+    def _mirror_path(self, author: str, repo: str) -> Path:
+        """Bare mirror every cached version of a repository is a worktree of."""
+        return self.package_path / author / repo / ".mirror"
+
+    def _materialize_package(self, save_path: Path, repo: str) -> None:
+        """Link a cached package into the project requirements through the store."""
+        key = self._index_key(save_path)
+        tree = (self.index.get(key) or {}).get("tree")
+        if not self.store.has_tree(tree):
+            # another process may be checking the entry out
+            with cache_lock(save_path.parent):
+                tree = self.store.tree_of(save_path)
+            self.index.update(key, tree=tree)
+
+        self.store.materialize(tree, self.requirements_path / repo)
 
     def _handle_copy_error(self, function: Callable, path, info):
         os.chmod(path, stat.S_IWRITE)
         os.unlink(path)
 
+    def _fetch_mode(self, author: str, repo: str) -> str:
+        """How a package is fetched: "git" clones it, "archive" downloads its tarball."""
+        return self.options.get(f"{author}/{repo}", {}).get("fetch", self.fetch_mode)
+
     def _package_cached(self, path: Path) -> bool:
-        """Check if package exists in cache and is valid."""
+        """
+        Check if package exists in cache and is valid.
+
+        Entries completed by a previous install are answered from the cache
+        index, the git repository is only checked for unknown entries or
+        with `--verify`.
+        """
         try:
             if not path.is_dir():
                 return False
 
-            repo = self._check_repository(path)
-            if repo is None:
-                return False
+            if not self.verify and self.index.get(self._index_key(path)):
+                return True
+
+            if (commit := self._archive_commit(path)) is None:
+                repo = self._check_repository(path)
+                if repo is None:
+                    self.index.discard(self._index_key(path))
+                    return False
+
+                commit = repo.head.commit.hexsha
 
-            # Additional checks could be added here
-            # For example, verify required files exis
+            self._complete_entry(path, commit)
             return True
 
         except Exception as e:
@@ -185,32 +466,14 @@ class PackageInstaller:
                 )
                 return False
 
-            repo_url = f"https://{{{usr.git_token}}}@github.com/{author}/{repo}.git"
-
-            if separator == "#":
-                git_repo = Repo.clone_from(repo_url, str(save_path), single_branch=True)
-                git_repo.head.reset(commit=version, index=True, working_tree=True)
-            elif separator == ":":
-                git_repo = Repo.clone_from(repo_url, str(save_path))
-                git_repo.git.checkout(version)
-            else:
-                git_repo = Repo.clone_from(
-                    repo_url, str(save_path), single_branch=True, branch=version
-                )
+            git_repo = self._clone(author, repo, save_path, separator, version)
 
             if found_file:
                 download_file_from_github(author, repo, found_file, save_path)
 
-            shutil.copytree(
-                save_path, self.requirements_path / repo, dirs_exist_ok=True
-            )
-
-            self.installed_deps[repo] = {
-                "author": author,
-                "version": version if version else "default",
-            }
+            self._complete_entry(save_path, git_repo.head.commit.hexsha)
 
-            logging.info(f"Installed {author}/{repo}{separator}{version}")
+            logging.info(f"Cached {author}/{repo}{separator}{version}")
             return True
 
         except GitCommandError as e:
@@ -225,62 +488,354 @@ class PackageInstaller:
                 shutil.rmtree(str(save_path), onerror=self._handle_copy_error)
             return False
 
-    def _update_repo_state(self, repo: Repo, version: str, force: bool) -> bool:
-        """Update repository to specified version."""
+    def _clone_prefetched_repository(
+        self, package: str, metadata: dict | None, save_path: Path
+    ) -> bool:
+        """Clone a package whose ref and manifest are known from the batched metadata query."""
+        author, repo, _, version = package_parse(package)
+        if metadata is None:
+            logging.error(f"Repository {author}/{repo} or its ref {version} doesn't exist")
+            return False
+
+        if not metadata["manifest"]:
+            logging.error(
+                f"Repository {author}/{repo} does not contain required configuration files (pawn.json or pulse.toml)"
+            )
+            return False
+
         try:
-            if force:
-                repo.remote().pull()
+            git_repo = self._clone(author, repo, save_path, "#", metadata["commit"])
 
-            if version:
-                if "#" in version:
-                    repo.head.reset(commit=version, index=True, working_tree=True)
-                else:
-                    repo.git.checkout(version)
-            else:
-                repo.remote().pull()
+            # a manifest only found on the default branch is used for older refs too
+            if not metadata["on_ref"]:
+                with open(save_path / metadata["manifest"], "w") as mf:
+                    mf.write(metadata["text"])
+
+            self._complete_entry(save_path, git_repo.head.commit.hexsha)
+            logging.info(f"Cached {author}/{repo}#{metadata['commit']}")
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to clone {package}: {e}")
+            if save_path.exists():
+                shutil.rmtree(str(save_path), onerror=self._handle_copy_error)
+            return False
+
+    def _download_archive_package(
+        self, author: str, repo: str, ref: str | None, save_path: Path
+    ) -> bool:
+        """Download a package as a GitHub tarball instead of cloning it."""
+        staging = staging_dir(save_path)
+        try:
+            commit = download_archive(author, repo, ref if ref else "HEAD", str(staging))
+            if not commit:
+                shutil.rmtree(staging, onerror=self._handle_copy_error)
+                return False
+
+            if not any((staging / file).is_file() for file in MANIFEST_FILES) and not any(
+                download_raw_file(author, repo, file, staging) for file in MANIFEST_FILES
+            ):
+                logging.error(
+                    f"Repository {author}/{repo} does not contain required configuration files (pawn.json or pulse.toml)"
+                )
+                shutil.rmtree(staging, onerror=self._handle_copy_error)
+                return False
+
+            with open(staging / ARCHIVE_FILE, "w") as af:
+                json.dump({"commit": commit, "ref": ref}, af)
+
+            replace_directory(staging, save_path)
+            self._complete_entry(save_path, commit)
+
+            logging.info(f"Cached {author}/{repo}#{commit} from its archive")
+            return True
+
+        except Exception as e:
+            logging.error(f"Unexpected error during archive download: {e}")
+            if staging.exists():
+                shutil.rmtree(staging, onerror=self._handle_copy_error)
+            return False
+
+    def _archive_commit(self, save_path: Path) -> str | None:
+        """Commit a cached archive was downloaded at, None for git checkouts."""
+        archive_file = save_path / ARCHIVE_FILE
+        if not archive_file.is_file():
+            return None
+
+        with open(archive_file) as af:
+            return json.load(af)["commit"]
+
+    def _clone_locked_repository(self, package: str, locked: dict, save_path: Path) -> bool:
+        """Clone a locked package straight at its pinned commit, skipping any API lookups."""
+        author, repo, _, _ = package_parse(package)
+        try:
+            self._clone(author, repo, save_path, "#", locked["commit"])
+
+            manifest = locked.get("manifest")
+            if manifest and not self.offline and not (save_path / manifest).is_file():
+                download_raw_file(author, repo, manifest, save_path)
+
+            self._complete_entry(save_path, locked["commit"])
+            self.lock.record(package)
+
+            logging.info(f"Cached {author}/{repo}#{locked['commit']} from pulse.lock")
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to install locked package {package}: {e}")
+            if save_path.exists():
+                shutil.rmtree(str(save_path), onerror=self._handle_copy_error)
+            return False
+
+    def _checkout_locked_commit(
+        self, author: str, repo: str, save_path: Path, commit: str
+    ) -> bool:
+        """Move a cached package to the commit pinned in pulse.lock."""
+        entry = self.index.get(self._index_key(save_path))
+        if entry["commit"] == commit:
+            return True
+
+        if self._archive_commit(save_path):
+            return self._download_archive_package(author, repo, commit, save_path)
+
+        try:
+            self._checkout(author, repo, save_path, commit)
+            self._complete_entry(save_path, commit)
+            return True
+
+        except Exception as e:
+            logging.error(f"Failed to check out locked commit {commit} of {author}/{repo}: {e}")
+            return False
+
+    def _checkout(self, author: str, repo: str, save_path: Path, commit: str) -> None:
+        """
+        Move a cached git package to another commit.
+
+        The commit is checked out into a staging worktree which then replaces
+        the entry, so other processes never read a half checked out tree.
+        Manifests downloaded next to the checkout are carried over.
+        """
+        git_repo = Repo(str(save_path))
+        downloaded = {
+            file: (save_path / file).read_bytes()
+            for file in MANIFEST_FILES
+            if (save_path / file).is_file() and not git_repo.git.ls_files(file)
+        }
+
+        self._clone(author, repo, save_path, "#", commit)
+        for file, content in downloaded.items():
+            if not (save_path / file).exists():
+                (save_path / file).write_bytes(content)
+
+        self.store.forget(save_path)
+
+    def _lock_package(self, package: str, save_path: Path) -> None:
+        """Record the resolved commit and manifest of a cached package."""
+        manifest = next(
+            (file for file in MANIFEST_FILES if (save_path / file).is_file()), None
+        )
+        entry = self.index.get(self._index_key(save_path))
+        self.lock.record(package, commit=entry["commit"], manifest=manifest)
+
+    def _complete_entry(self, save_path: Path, commit: str) -> None:
+        """Record a cache entry in the cache index once it is complete."""
+        self.index.record(self._index_key(save_path), commit)
+
+    def _clone(
+        self, author: str, repo: str, save_path: Path, separator: str, version: str
+    ) -> Repo:
+        """Check a package version out of its mirror, fetching from the package mirror or GitHub."""
+        return self._from_remotes(
+            author,
+            repo,
+            lambda url: clone_package(
+                url,
+                self._mirror_path(author, repo),
+                save_path,
+                separator,
+                version,
+                full=self.full_clone,
+            ),
+        )
+
+    def _from_remotes(self, author: str, repo: str, action: Callable[[str], Any]) -> Any:
+        """Run a git action against the configured package mirror first and GitHub second."""
+        error = None
+        for url in git_urls(author, repo, self._repo_url(author, repo)):
+            try:
+                return action(url)
+            except GitCommandError as e:
+                logging.debug(f"Fetching {author}/{repo} failed, trying the next remote: {e}")
+                error = e
+
+        raise error
+
+    def _repo_url(self, author: str, repo: str) -> str:
+        usr = User()
+        return f"https://{{{usr.git_token}}}@github.com/{author}/{repo}.git"
+
+    def _refresh_due(self, author: str, repo: str, save_path: Path) -> bool:
+        """Check if a cached branch should be fetched again (`--update` or an expired ttl)."""
+        if self.update:
+            return True
+
+        ttl = self.options.get(f"{author}/{repo}", {}).get("ttl")
+        if ttl is None:
+            return False
+
+        entry = self.index.get(self._index_key(save_path))
+        return time.time() - entry["stamp"] >= ttl
+
+    def _update_repo_state(
+        self, author: str, repo: str, save_path: Path, separator: str, version: str
+    ) -> bool:
+        """Fetch a cached branch and move its checkout to the new tip."""
+        if self._archive_commit(save_path):
+            # The tip isn't known without downloading, archives are replaced as a whole
+            return self._download_archive_package(author, repo, version, save_path)
+
+        try:
+            git_repo = Repo(str(save_path))
+            commit = self._from_remotes(
+                author,
+                repo,
+                lambda url: fetch_ref(
+                    open_mirror(self._mirror_path(author, repo), url),
+                    separator,
+                    version,
+                    self.full_clone,
+                ),
+            )
 
+            if git_repo.head.commit.hexsha != commit:
+                self._checkout(author, repo, save_path, commit)
+                logging.info(f"Updated {save_path} to {commit}")
+
+            self._complete_entry(save_path, commit)
             return True
 
         except Exception as e:
             logging.error(f"Error updating repository state: {e}")
             return False
 
+    def _cached_plugin_dir(self, package: str, resource: dict) -> Path | None:
+        """Plugin release directory to use offline: the locked tag or else the newest download."""
+        _, repo, sep, ver = package_parse(package)
+        locked = (self.lock.get(package) or {}).get("plugin")
+        if locked:
+            ver = locked["tag"]
+
+        if locked or sep == ":":
+            plugin_dir = self.plugins_path / repo / ver
+            return plugin_dir if self._plugin_assets(plugin_dir, resource) else None
+
+        repo_path = self.plugins_path / repo
+        if not repo_path.is_dir():
+            return None
+
+        downloads = [
+            (path.stat().st_mtime, path)
+            for path in repo_path.iterdir()
+            if path.is_dir() and self._plugin_assets(path, resource)
+        ]
+        return max(downloads)[1] if downloads else None
+
+    def _plugin_assets(self, plugin_dir: Path, resource: dict) -> list[str]:
+        """Downloaded release assets of a plugin which belong to the given resource."""
+        if not plugin_dir.is_dir():
+            return []
+
+        return sorted(
+            file
+            for file in os.listdir(plugin_dir)
+            if not file.startswith(".") and re.match(resource["name"], file)
+        )
+
     def _install_single_plugin(self, prs):
         package, resource = prs
+        fetched = self._fetch_plugin(package, resource)
+        if not fetched:
+            return False
+
+        _, repo, _, _ = package_parse(package)
+        plugin_dir, assets = fetched
+        for file in assets:
+            self._extract_plugin_asset(plugin_dir / file, resource, repo)
+
+        self.lock.record(package, plugin={"tag": plugin_dir.name, "assets": assets})
+        return True
+
+    def _fetch_plugin(self, package: str, resource: dict) -> tuple[Path, list[str]] | None:
+        """
+        Download the release assets of a plugin resource into the plugin cache.
+
+        Releases are shared between projects and platforms: a release directory
+        holds the assets of every platform that has been fetched, and only
+        those matching the resource are downloaded or used.
+
+        Returns:
+            tuple | None: (release directory, names of the matching assets), None if failed.
+        """
         author, repo, sep, ver = package_parse(package)
-        if sep != ":":
+        locked = (self.lock.get(package) or {}).get("plugin")
+        if self.offline:
+            ver = self._cached_plugin_dir(package, resource).name
+        elif locked:
+            ver = locked["tag"]
+        elif sep != ":":
             ver = get_latest_tag(author, repo, ver)
             if not ver:
                 logging.error(f"Couldn't find latest tag for {author}/{repo}")
-                return False
+                return None
 
             logging.info(f"Latest tag for {author}/{repo}: {ver}")
 
         plugin_dir = self.plugins_path / repo / ver
+        # a lock written on another platform names that platform's assets
+        locked_assets = [
+            asset for asset in (locked or {}).get("assets", []) if re.match(resource["name"], asset)
+        ]
+
+        # plugin releases are shared between projects, download each one once
+        with cache_lock(plugin_dir):
+            if assets := self._plugin_assets(plugin_dir, resource):
+                logging.warning(f"Plugin {repo} already installed")
+                return plugin_dir, assets
+
+            staging = staging_dir(plugin_dir)
+            try:
+                if not self._download_plugin_assets(
+                    author, repo, ver, resource, locked_assets, staging
+                ):
+                    return None
 
-        if plugin_dir.exists() and (files := os.listdir(plugin_dir)):
-            logging.warning(f"Plugin {repo} already installed")
-            for file in files:
-                if resource.get("archive", False):
-                    if file.endswith(".zip"):
-                        handle_extraction_zip(
-                            plugin_dir / file,
-                            resource.get("includes", []),
-                            ("", repo, ""),
-                            resource.get("files", []),
-                            resource.get("plugins", []),
-                        )
-                    elif file.endswith(".tar.gz"):
-                        handle_extraction_tar(
-                            plugin_dir / file,
-                            resource.get("includes", []),
-                            ("", repo, ""),
-                            resource.get("files", []),
-                            resource.get("plugins", []),
-                        )
+                if plugin_dir.exists():
+                    for file in staging.iterdir():
+                        os.replace(file, plugin_dir / file.name)
                 else:
-                    shutil.copy2(plugin_dir / file, self.requirements_path / "plugins")
-            return True
+                    replace_directory(staging, plugin_dir)
+
+            finally:
+                if staging.exists():
+                    shutil.rmtree(staging, onerror=self._handle_copy_error)
+
+            return plugin_dir, self._plugin_assets(plugin_dir, resource)
+
+    def _download_plugin_assets(
+        self,
+        author: str,
+        repo: str,
+        ver: str,
+        resource: dict,
+        locked_assets: list[str],
+        target: Path,
+    ) -> bool:
+        """Download the release assets of a plugin, the locked ones or the one matching the resource."""
+        if locked_assets:
+            return all(
+                download_release_asset(author, repo, ver, asset_name, target)
+                for asset_name in locked_assets
+            )
 
         release_assets = get_release_assets(author, repo, ver)
         if not release_assets:
@@ -297,123 +852,148 @@ class PackageInstaller:
                 matching_asset = asset
                 break
 
-        if matching_asset:
-            ap = download_github_release(
-                author,
-                repo,
-                ver,
-                matching_asset["name"],
-                self.plugins_path / repo / ver,
-            )
-
-            if ap:
-                if resource.get("archive", False):
-                    if ap.endswith(".zip"):
-                        handle_extraction_zip(
-                            ap,
-                            resource.get("includes", []),
-                            ("", repo, ""),  # TODO: change to repo name
-                            resource.get("files", []),
-                            resource.get("plugins", []),
-                        )
-                    elif ap.endswith(".tar.gz"):
-                        handle_extraction_tar(
-                            ap,
-                            resource.get("includes", []),
-                            ("", repo, ""),
-                            resource.get("files", []),
-                            resource.get("plugins", []),
-                        )
-                else:
-                    shutil.copy2(ap, self.requirements_path / "plugins")
-        else:
+        if not matching_asset:
             logging.error(
                 f"No asset matching pattern '{asset_name_pattern}' found in release {ver}"
             )
+            return False
 
-    def _install_deps(self, deps):
-        """Install multiple dependencies concurrently."""
-
-        def install_dependency(dep):
-            return self._install_single_package(dep)
-
-        def process_dependency(dep):
-            return self._gather_dependencies(dep)
-
-        def install_plugin(prs):
-            return self._install_single_plugin(prs)
+        return bool(
+            download_github_release(author, repo, ver, matching_asset["name"], target)
+        )
 
-        with ThreadPoolExecutor() as executor:
-            executor.map(install_dependency, deps)
+    def _extract_plugin_asset(self, asset_path: Path, resource: dict, repo: str) -> None:
+        """Extract a downloaded plugin asset into the project requirements."""
+        if resource.get("archive", False):
+            if asset_path.name.endswith((".zip", ".tar.gz")):
+                self.extraction.extract(asset_path, resource, repo)
+        else:
+            shutil.copy2(asset_path, self.requirements_path / "plugins")
 
-        with ThreadPoolExecutor() as executor:
-            results = executor.map(process_dependency, deps)
+    def _install_deps(self, deps: list[str]) -> set[str]:
+        """
+        Resolve the whole dependency graph, then install it in topological order.
 
-        for deps_list in results:
-            if deps_list:
-                self._install_deps(deps_list)
+        Returns:
+            set[str]: Requirements which have been installed into the project.
+        """
+        installed = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            resolver = DependencyResolver(
+                self._resolve_package, executor, prefetch=self._prefetch_metadata
+            )
+            try:
+                nodes = resolver.resolve(deps)
+
+                if self.offline:
+                    self.missing.extend(
+                        f"{node.package}: plugin release not downloaded"
+                        for node in nodes
+                        if node.plugin and not self._cached_plugin_dir(node.package, node.plugin)
+                    )
+
+                if self.missing:
+                    logging.error(
+                        "Offline install failed, the cache is missing:\n  "
+                        + "\n  ".join(self.missing)
+                    )
+                    return installed
+
+                for node in nodes:
+                    if self._install_node(node):
+                        installed.add(node.package)
+
+            finally:
+                # what has been cached is kept, even if the install stops here
+                self.index.save()
+                self.metadata.save()
+
+            plugins = [
+                (node.package, node.plugin)
+                for node in nodes
+                if node.plugin and node.package in installed
+            ]
+            plugin_results = list(executor.map(self._install_single_plugin, plugins))
+
+        for (package, _), result in zip(plugins, plugin_results):
+            if result is False:
+                logging.error(f"Failed to install plugin for package: {package}")
+            elif result is True:
+                logging.info(f"Successfully installed plugin for package: {package}")
+
+        return installed
+
+    def _plugin_resources(self, package: str) -> list[dict]:
+        """Plugin resources of a resolved package for every platform."""
+        author, repo, _, _ = package_parse(package)
+        entry = self.index.get(self._index_key(self.cache_entries[package]))
+        metadata = self.metadata.get(author, repo, entry["commit"]) if entry else None
+        return [
+            resource
+            for resource in (metadata or {}).get("resources") or []
+            if "name" in resource and "platform" in resource
+        ]
+
+    def _gather_dependencies(self, package: str, cached_path: Path) -> tuple[list, dict | None]:
+        """
+        Read the dependencies and plugin resource of a cached package.
 
-        if self.plugins_to_install:
-            with ThreadPoolExecutor() as executor:
-                plugin_results = list(
-                    executor.map(install_plugin, self.plugins_to_install.items())
-                )
+        The manifest of every commit is parsed once and kept in the metadata
+        store, so a warm cache is resolved without reading any files.
 
-                for package, result in zip(
-                    self.plugins_to_install.keys(), plugin_results
-                ):
-                    if result is False:
-                        logging.error(
-                            f"Failed to install plugin for package: {package}"
-                        )
-                    elif result is True:
-                        logging.info(
-                            f"Successfully installed plugin for package: {package}"
-                        )
-
-                # Clear the plugins queue after installation
-                self.plugins_to_install = {}
-
-    def _gather_dependencies(self, package):
+        Returns:
+            tuple: (list of dependencies, plugin resource for this platform or None)
+        """
         parsed_package = package_parse(package)
         if not parsed_package:
             logging.error(f"Invalid package format: {package}")
-            return False
+            return [], None
 
-        author, repo, _, ver = parsed_package
-        cached_path = os.path.join(
-            PACKAGE_PATH, author, repo, ver if ver else "default"
-        )
+        author, repo, _, _ = parsed_package
+        commit = self.index.get(self._index_key(cached_path))["commit"]
 
-        with safe_open(os.path.join(cached_path, "pulse.toml"), "rb") as t:
+        metadata = self.metadata.get(author, repo, commit)
+        if metadata is None:
+            metadata = self.metadata.put(
+                author, repo, commit, **self._read_manifest(cached_path)
+            )
+
+        reqs = metadata["dependencies"]
+        plugin = None
+        if metadata["resources"]:
+            plugin = self._is_plugin(metadata["resources"]) or None
+
+        self.lock.record(package, dependencies=reqs)
+        return reqs, plugin
+
+    def _read_manifest(self, cached_path: Path) -> dict:
+        """Parse the pulse.toml or pawn.json of a cached package."""
+        metadata = {
+            "manifest": None,
+            "dependencies": [],
+            "resources": None,
+            "include_path": None,
+        }
+
+        if (cached_path / "pulse.toml").is_file():
+            with safe_open(cached_path / "pulse.toml", "rb") as t:
+                if t:
+                    l = tomli.load(t)
+                    metadata["manifest"] = "pulse.toml"
+                    metadata["dependencies"] = l.get("requirements", {}).get("live", [])
+
+                    # NO plugins in pulse.toml
+            return metadata
+
+        with safe_open(cached_path / "pawn.json", "r") as t:
             if t:
-                l = tomli.load(t)
-                try:
-                    reqs = l["requirements"]["live"]
-                except KeyError:
-                    reqs = []
+                l = json.load(t)
+                metadata["manifest"] = "pawn.json"
+                metadata["dependencies"] = l.get("dependencies", [])
+                metadata["resources"] = l.get("resources")
+                metadata["include_path"] = l.get("include_path")
 
-                # NO plugins in pulse.toml
-            else:
-                with safe_open(os.path.join(cached_path, "pawn.json"), "r") as t:
-                    if t:
-                        l = json.load(t)
-                        try:
-                            reqs = l["dependencies"]
-                        except KeyError:
-                            reqs = []
-
-                        try:
-                            r = l["resources"]
-                            if ret := self._is_plugin(r):
-                                self.plugins_to_install[package] = ret
-
-                        except KeyError:
-                            pass
-                    else:
-                        reqs = []
-
-        return reqs
+        return metadata
 
     def _append_dependency(self, package):
         """Appends the dependency to the project config file."""
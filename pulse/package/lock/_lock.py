@@ -0,0 +1,96 @@
+import os
+import tomli
+import tomli_w
+import logging
+import threading
+
+from ...core.core_dir import PROJECT_LOCK_FILE, safe_open
+
+LOCK_VERSION = 1
+LOCK_HEADER = b"# This file was generated by Pulse, don't modify it by hand. It pins every resolved requirement.\n\n"
+
+
+class PackageLock:
+    """
+    Reader and writer of `pulse.lock`.
+
+    Every requirement string (direct or transitive) maps to the commit it was
+    resolved to, the manifest it was found with, its dependencies and plugin
+    release assets, so a locked ensure doesn't need to ask GitHub again.
+    """
+
+    def __init__(self, path: str = PROJECT_LOCK_FILE):
+        self.path = path
+        self.packages: dict[str, dict] = {}
+        self.touched: set[str] = set()
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.isfile(self.path):
+            return
+
+        with safe_open(self.path, "rb") as lf:
+            if not lf:
+                return
+
+            try:
+                data = tomli.load(lf)
+            except tomli.TOMLDecodeError as e:
+                logging.warning(f"Ignoring invalid lockfile {self.path}: {e}")
+                return
+
+        if data.get("version") != LOCK_VERSION:
+            logging.warning(f"Ignoring lockfile {self.path} of unknown version")
+            return
+
+        self.packages = data.get("packages", {})
+
+    def get(self, package: str) -> dict | None:
+        entry = self.packages.get(package)
+        return entry if entry and entry.get("commit") else None
+
+    def record(self, package: str, **fields) -> None:
+        """Merge resolved fields into the entry of a requirement."""
+        with self._lock:
+            self.packages.setdefault(package, {}).update(
+                {key: value for key, value in fields.items() if value is not None}
+            )
+            self.touched.add(package)
+
+    def discard(self, package: str) -> None:
+        with self._lock:
+            self.packages.pop(package, None)
+            self.touched.discard(package)
+
+    def save(self, prune: bool = False) -> None:
+        """
+        Write the lockfile.
+
+        Args:
+            prune (bool): Drop requirements which weren't resolved in this run.
+        """
+        with self._lock:
+            if prune:
+                self.packages = {
+                    package: entry
+                    for package, entry in self.packages.items()
+                    if package in self.touched
+                }
+
+            packages = {
+                package: entry
+                for package, entry in sorted(self.packages.items())
+                if entry.get("commit")
+            }
+
+            data = {
+                "version": LOCK_VERSION,
+                "packages": packages,
+            }
+
+        with safe_open(self.path, "wb") as lf:
+            if lf:
+                lf.write(LOCK_HEADER)
+                tomli_w.dump(data, lf)
+                logging.debug(f"Lockfile has been written to {self.path}")
@@ -0,0 +1,131 @@
+import json
+import logging
+import sqlite3
+import threading
+
+from pathlib import Path
+from contextlib import closing
+
+from ...core.core_dir import METADATA_FILE
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    author TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    manifest TEXT,
+    dependencies TEXT NOT NULL,
+    resources TEXT,
+    include_path TEXT,
+    PRIMARY KEY (author, repo, sha)
+)
+"""
+
+
+class MetadataStore:
+    """
+    Persistent cache of parsed package manifests.
+
+    A commit of a package never changes, so its manifest is parsed once and
+    stored by (author, repo, sha) in SQLite. The whole table is read in one
+    query when the store is opened, and new rows are written in a single
+    transaction by `save`.
+    """
+
+    def __init__(self, path: str | Path = METADATA_FILE):
+        self.path = Path(path)
+        self.rows: dict[tuple, dict] = {}
+        self.pending: list[tuple] = []
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        if not self.path.is_file():
+            return
+
+        try:
+            with closing(self._connect()) as db:
+                rows = db.execute(
+                    "SELECT author, repo, sha, manifest, dependencies, resources, include_path FROM packages"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Ignoring unreadable metadata cache {self.path}: {e}")
+            return
+
+        for author, repo, sha, manifest, dependencies, resources, include_path in rows:
+            self.rows[(author, repo, sha)] = {
+                "manifest": manifest,
+                "dependencies": json.loads(dependencies),
+                "resources": json.loads(resources) if resources else None,
+                "include_path": include_path,
+            }
+
+    def get(self, author: str, repo: str, sha: str) -> dict | None:
+        """
+        Get the parsed manifest of a package commit.
+
+        Returns:
+            dict | None: manifest, dependencies, resources and include_path,
+            or None if the commit hasn't been parsed yet.
+        """
+        return self.rows.get((author.lower(), repo.lower(), sha))
+
+    def put(
+        self,
+        author: str,
+        repo: str,
+        sha: str,
+        manifest: str | None,
+        dependencies: list,
+        resources: list | None = None,
+        include_path: str | None = None,
+    ) -> dict:
+        """Remember the parsed manifest of a package commit until the next `save`."""
+        key = (author.lower(), repo.lower(), sha)
+        row = {
+            "manifest": manifest,
+            "dependencies": dependencies,
+            "resources": resources,
+            "include_path": include_path,
+        }
+
+        with self._lock:
+            if key not in self.rows:
+                self.pending.append(
+                    key
+                    + (
+                        manifest,
+                        json.dumps(dependencies),
+                        json.dumps(resources) if resources is not None else None,
+                        include_path,
+                    )
+                )
+            self.rows[key] = row
+
+        return row
+
+    def save(self) -> None:
+        with self._lock:
+            pending, self.pending = self.pending, []
+
+        if not pending:
+            return
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as db, db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO packages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    pending,
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Failed to write metadata cache {self.path}: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path)
+        if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            db.execute("DROP TABLE IF EXISTS packages")
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        db.execute(SCHEMA)
+        return db
@@ -2,7 +2,11 @@ from .install._install import PackageInstaller
 import click
 
 @click.command
-def ensure():
+@click.option("--full-clone", is_flag=True, required=False, default=False, help="Clones the whole history of packages instead of a shallow copy.")
+@click.option("--update", "-u", is_flag=True, required=False, default=False, help="Fetches branch requirements and moves them to their latest commit.")
+@click.option("--verify", is_flag=True, required=False, default=False, help="Checks the git repository of every cached package instead of trusting the cache index.")
+@click.option("--offline", is_flag=True, required=False, default=False, envvar="PULSE_OFFLINE", help="Installs only from the local cache, without any network access.")
+def ensure(full_clone, update, verify, offline):
     '''Ensures all packages are present.'''
-    pckge = PackageInstaller()
+    pckge = PackageInstaller(full_clone=full_clone, update=update, verify=verify, offline=offline)
     pckge.install_all_packages()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import os
+import click
+import tomli
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .install._install import PackageInstaller
+from ..core.core_dir import safe_open, PROJECT_TOML_FILE
+from ..download.download_asset import get_asset
+from ..toolchain.toolchain_store import is_installed
+
+PLATFORMS = ("linux", "windows")
+
+
+@click.command
+@click.option("--full-clone", is_flag=True, required=False, default=False, help="Clones the whole history of packages instead of a shallow copy.")
+@click.option("--update", "-u", is_flag=True, required=False, default=False, help="Fetches branch requirements and moves them to their latest commit.")
+@click.option("--platform", "-p", "platforms", multiple=True, type=click.Choice(PLATFORMS), help="Downloads plugin releases only for these platforms. Every platform by default.")
+@click.option("--jobs", "-j", required=False, default=None, type=int, help="Number of parallel downloads.")
+def fetch(full_clone, update, platforms, jobs):
+    '''Downloads everything the project needs into the caches without installing it.'''
+    if not os.path.isfile(PROJECT_TOML_FILE):
+        logging.fatal("Invalid project: No pulse.toml found")
+        return
+
+    with safe_open(PROJECT_TOML_FILE, "rb") as t:
+        config = tomli.load(t)
+
+    toolchains = _toolchain_versions(config)
+    pckgf = PackageInstaller(max_workers=jobs, full_clone=full_clone, update=update)
+
+    # runtimes and compilers download next to the package resolution, on the
+    # same pool so there are never more than --jobs downloads at once
+    with ThreadPoolExecutor(max_workers=pckgf.max_workers) as executor:
+        downloads = [
+            executor.submit(get_asset, type, version)
+            for type, version in toolchains
+            if not is_installed(type, version)
+        ]
+        fetched = pckgf.fetch_all_packages(list(platforms) or None, executor)
+        for download in downloads:
+            download.result()
+
+    missing = [
+        f"{type} {version}"
+        for type, version in toolchains
+        if not is_installed(type, version)
+    ]
+    if missing:
+        logging.error("Failed to fetch:\n  " + "\n  ".join(missing))
+
+    if fetched and not missing:
+        logging.info("Everything the project needs is cached.")
+
+
+def _toolchain_versions(config: dict) -> list[tuple[str, str]]:
+    """Runtime and compiler versions of the project, across every compiler profile."""
+    compiler = config.get("compiler", {})
+    versions = [("compiler", compiler["version"])] if "version" in compiler else []
+    versions += [
+        ("compiler", profile["version"])
+        for profile in compiler.get("profiles", {}).values()
+        if "version" in profile
+    ]
+
+    if "version" in config.get("runtime", {}):
+        versions.append(("runtime", config["runtime"]["version"]))
+
+    return list(dict.fromkeys(versions))
@@ -1,47 +1,122 @@
 import os
-from .unpack.unpack import extract_member
-from zipfile import ZipFile
+import re
+import shutil
+import logging
+import posixpath
 import tarfile
+from zipfile import ZipFile
 from pulse.core.core_dir import REQUIREMENTS_PATH
-import re
+from pulse.core.core_archive import extract_zip_members
+from .unpack.unpack import write_member
+
+
+class ExtractionPlan:
+    """
+    Decides where the members of a plugin archive go.
+
+    The `includes`, `files` and plugin patterns of a resource are compiled
+    once, and every member is classified by a single call to `targets`, so
+    an archive is planned in one pass over its member list.
+    """
 
-def handle_extraction_zip(archive_path, includes, resource, files, required_plugin, cwd_path=os.path.join(REQUIREMENTS_PATH, "plugins")):
+    def __init__(self, includes, resource, files, required_plugin, cwd_path, resources_path):
+        self.include = re.compile(includes[0]) if includes else None
+        self.files = [(re.compile(key), os.path.dirname(item)) for key, item in (files or {}).items()]
+        self.plugin = re.compile(required_plugin[0]) if required_plugin else None
+        self.res_path = os.path.join(resources_path, resource[1])
+        self.cwd_path = cwd_path
+
+    def targets(self, name: str) -> list[str]:
+        """Folders a member has to be extracted to, empty if it isn't needed."""
+        if self.include and name.endswith(".inc") and self.include.match(name):
+            return [self.res_path]
+
+        targets = [os.path.join(self.res_path, folder) for pattern, folder in self.files if pattern.match(name)]
+        if self.plugin and self.plugin.match(name):
+            targets.append(self.cwd_path)
+
+        # a member matching several patterns may land in the same folder more than once
+        return list(dict.fromkeys(os.path.normpath(target) for target in targets))
+
+
+def handle_extraction_zip(archive_path, includes, resource, files, required_plugin, cwd_path=os.path.join(REQUIREMENTS_PATH, "plugins"), resources_path=os.path.join(REQUIREMENTS_PATH, ".resources")):
+    plan = ExtractionPlan(includes, resource, files, required_plugin, cwd_path, resources_path)
     with ZipFile(archive_path) as zf:
-        for archive_file in zf.namelist():
-            if includes and archive_file.endswith(".inc"):
-                if re.match(includes[0], archive_file):
-                    res_path = os.path.join(REQUIREMENTS_PATH, ".resources", resource[1])
-                    os.makedirs(res_path, exist_ok=True)
-                    extract_member(zf, archive_file, res_path)
-                    continue
-
-            if files:
-                for key, item in files.items():
-                    if re.match(key, archive_file):
-                        res_path = os.path.join(REQUIREMENTS_PATH, ".resources", resource[1])
-                        os.makedirs(res_path, exist_ok=True)
-                        extract_member(zf, archive_file, os.path.join(res_path, os.path.dirname(item)))
-
-            if re.match(required_plugin[0], archive_file):
-                extract_member(zf, archive_file, cwd_path)
-
-def handle_extraction_tar(archive_path, includes, resource, files, required_plugin, cwd_path=os.path.join(REQUIREMENTS_PATH, "plugins")):
+        destinations = {
+            info.filename: [os.path.join(target, os.path.basename(info.filename)) for target in targets]
+            for info in zf.infolist()
+            if not info.is_dir() and (targets := plan.targets(info.filename))
+        }
+
+    # members are decompressed in parallel, each once whatever the number of targets
+    extract_zip_members(archive_path, destinations)
+
+def handle_extraction_tar(archive_path, includes, resource, files, required_plugin, cwd_path=os.path.join(REQUIREMENTS_PATH, "plugins"), resources_path=os.path.join(REQUIREMENTS_PATH, ".resources")):
+    plan = ExtractionPlan(includes, resource, files, required_plugin, cwd_path, resources_path)
+    links = {}
+    # stream mode: members are planned and extracted as the archive is decompressed
+    with tarfile.open(archive_path, "r|gz") as tf:
+        for member in tf:
+            if not (targets := plan.targets(member.name)):
+                continue
+
+            if member.issym() or member.islnk():
+                links[member.name] = targets
+            elif member.isfile():
+                with tf.extractfile(member) as source:
+                    _extract(source, member.name, targets, 0o755 if member.mode & 0o111 else 0o644)
+
+    if links:
+        _extract_links(archive_path, links)
+
+def _extract_links(archive_path, links):
+    """
+    Write symbolic and hard link members as copies of the files they point to.
+
+    The package store keeps regular files only. Link targets may come later in
+    the archive or not be extracted at all, so they are read in a second,
+    random access pass.
+    """
     with tarfile.open(archive_path, "r:gz") as tf:
-        for archive_file in tf.getnames():
-            if includes and archive_file.endswith(".inc"):
-                res_path = os.path.join(REQUIREMENTS_PATH, ".resources", resource[1])
-                os.makedirs(res_path, exist_ok=True)
-                extract_member(tf, archive_file, res_path)
+        for name, targets in links.items():
+            try:
+                target = _link_target(tf, tf.getmember(name))
+                source = tf.extractfile(target)
+            except (KeyError, tarfile.TarError):
+                source = None
+
+            if source is None:
+                logging.warning(f"Skipping {name} of {os.path.basename(archive_path)}, it links to a missing file.")
                 continue
 
-            if files:
-                
-                for key, item in files.items():
-                    if re.match(key, archive_file):
-                        res_path = os.path.join(REQUIREMENTS_PATH, ".resources", resource[1])
-                        os.makedirs(res_path, exist_ok=True)
-                        extract_member(tf, archive_file, os.path.join(res_path, os.path.dirname(item)))
-                    
-
-            if re.match(required_plugin[0], archive_file):
-                extract_member(tf, archive_file, cwd_path)
+            with source:
+                _extract(source, name, targets, 0o755 if target.mode & 0o111 else 0o644)
+
+def _link_target(tf, member):
+    """Follow a link member to the regular file it ends at."""
+    seen = set()
+    while member.issym() or member.islnk():
+        if member.name in seen:
+            raise KeyError(member.name)
+        seen.add(member.name)
+
+        if member.islnk():
+            name = member.linkname
+        else:
+            # symbolic links are relative to the folder of the link
+            name = posixpath.normpath(posixpath.join(posixpath.dirname(member.name), member.linkname))
+        member = tf.getmember(name)
+
+    return member
+
+def _extract(source, name, targets, mode=None):
+    """Write a member to its first target and copy it to the others."""
+    destination = write_member(source, name, targets[0])
+    copies = [destination]
+    for target in targets[1:]:
+        os.makedirs(target, exist_ok=True)
+        copies.append(shutil.copyfile(destination, os.path.join(target, os.path.basename(destination))))
+
+    if mode is not None:
+        for copy in copies:
+            os.chmod(copy, mode)
@@ -17,9 +17,12 @@ from .install._install import PackageInstaller
 @click.command
 @click.argument("package", required=False, type=str)
 @click.option("--all", "-a", is_flag=True, required=False, default=False, help="Ensures all packages are present.")
-def install(package, all):
+@click.option("--full-clone", is_flag=True, required=False, default=False, help="Clones the whole history of packages instead of a shallow copy.")
+@click.option("--verify", is_flag=True, required=False, default=False, help="Checks the git repository of every cached package instead of trusting the cache index.")
+@click.option("--offline", is_flag=True, required=False, default=False, envvar="PULSE_OFFLINE", help="Installs only from the local cache, without any network access.")
+def install(package, all, full_clone, verify, offline):
     '''Performs installation of a package.'''
-    pckgi = PackageInstaller()
+    pckgi = PackageInstaller(full_clone=full_clone, verify=verify, offline=offline)
     if not all:
         pckgi.install_package(package)
     else:
@@ -0,0 +1,147 @@
+import logging
+
+from concurrent.futures import Executor
+from typing import Callable
+
+from ..parse._parse import package_parse
+
+
+class DependencyNode:
+    """A requirement in the dependency graph, deduplicated by (author, repo, ref)."""
+
+    def __init__(self, package: str, parsed: tuple):
+        self.package = package
+        self.author, self.repo, self.separator, self.version = parsed
+        self.dependencies: list["DependencyNode"] = []
+        self.plugin: dict | None = None
+        self.resolved = False
+
+    @property
+    def key(self) -> tuple:
+        return (
+            self.author.lower(),
+            self.repo.lower(),
+            self.separator or "",
+            self.version or "",
+        )
+
+
+class DependencyResolver:
+    """
+    Level-synchronous resolver of the dependency graph.
+
+    The graph is built breadth-first. Every frontier is resolved on one
+    bounded executor and merged back in requirement order, so the resulting
+    graph doesn't depend on how the worker threads interleave.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[str], tuple[list, dict | None] | None],
+        executor: Executor,
+        prefetch: Callable[[list[str]], None] | None = None,
+    ):
+        """
+        Args:
+            resolve (Callable): Fetches a package into the cache and returns its
+                dependencies and plugin resource, or None if it failed.
+            executor (Executor): Worker pool every frontier is scheduled on.
+            prefetch (Callable): Called with every frontier before it is resolved,
+                to batch remote lookups for the whole level.
+        """
+        self.resolve_package = resolve
+        self.executor = executor
+        self.prefetch = prefetch
+        self.roots: list[DependencyNode] = []
+        self.nodes: dict[tuple, DependencyNode] = {}
+        self.repos: dict[str, DependencyNode] = {}
+
+    def resolve(self, packages: list[str]) -> list[DependencyNode]:
+        """
+        Resolve the dependency graph of the given requirements.
+
+        Args:
+            packages (list[str]): Root requirements.
+
+        Returns:
+            list[DependencyNode]: Resolved packages, dependencies first.
+        """
+        frontier = self._add(packages, self.roots)
+        level = 0
+
+        while frontier:
+            logging.debug(
+                f"Resolving dependency level {level} ({len(frontier)} packages)"
+            )
+            if self.prefetch:
+                self.prefetch([node.package for node in frontier])
+
+            results = list(
+                self.executor.map(
+                    self.resolve_package, [node.package for node in frontier]
+                )
+            )
+
+            next_frontier = []
+            for node, result in zip(frontier, results):
+                if result is None:
+                    logging.error(f"Failed to resolve {node.package}")
+                    continue
+
+                node.resolved = True
+                dependencies, node.plugin = result
+                next_frontier.extend(self._add(dependencies, node.dependencies))
+
+            frontier = next_frontier
+            level += 1
+
+        return self._topological_order()
+
+    def _add(self, packages: list[str], edges: list[DependencyNode]) -> list[DependencyNode]:
+        """Link requirements into the graph and return the ones seen for the first time."""
+        new_nodes = []
+        for package in packages:
+            parsed_package = package_parse(package)
+            if not parsed_package:
+                logging.error(f"Invalid package format: {package}")
+                continue
+
+            node = DependencyNode(package, parsed_package)
+            if existing := self.nodes.get(node.key):
+                edges.append(existing)
+                continue
+
+            # requirements/<repo> can only hold one of them, the first one wins
+            if claimed := self.repos.get(node.repo.lower()):
+                logging.warning(
+                    f"Package {package} conflicts with {claimed.package}. Skipping..."
+                )
+                edges.append(claimed)
+                continue
+
+            self.nodes[node.key] = node
+            self.repos[node.repo.lower()] = node
+            edges.append(node)
+            new_nodes.append(node)
+
+        return new_nodes
+
+    def _topological_order(self) -> list[DependencyNode]:
+        order = []
+        visited = set()
+
+        def visit(node: DependencyNode) -> None:
+            if node.key in visited:
+                return
+
+            visited.add(node.key)
+            for dependency in node.dependencies:
+                visit(dependency)
+
+            if node.resolved:
+                order.append(node)
+
+        for root in self.roots:
+            visit(root)
+
+        return order
@@ -0,0 +1,276 @@
+import os
+import json
+import errno
+import shutil
+import stat
+import hashlib
+import logging
+import platform
+import tempfile
+
+from pathlib import Path
+
+from ...core.core_dir import STORE_PATH
+
+TREE_FILE = ".pulse-tree"
+ARCHIVE_FILE = ".pulse-archive"
+IGNORED_NAMES = {".git", TREE_FILE, ARCHIVE_FILE}
+CHUNK_SIZE = 1024 * 1024
+
+# ioctl request number of FICLONE (linux/fs.h), used for reflinks on btrfs/xfs
+FICLONE = 0x40049409
+
+
+class PackageStore:
+    """
+    Content-addressed blob store for cached packages.
+
+    Every file of a cached package is stored once under ``objects/`` keyed by
+    its sha256, and every package version is described by a tree manifest
+    under ``trees/``. Projects are then materialized from the blobs with
+    reflinks or hardlinks, so building ``requirements/`` only costs metadata.
+    """
+
+    def __init__(self, path: str | Path = STORE_PATH):
+        self.path = Path(path)
+        self.objects_path = self.path / "objects"
+        self.trees_path = self.path / "trees"
+        self._reflink = platform.system() == "Linux"
+        self._hardlink = True
+
+    def tree_of(self, entry: Path) -> str:
+        """
+        Get the tree digest of a cache entry, ingesting it if needed.
+
+        Args:
+            entry (Path): Cache directory of the package version.
+
+        Returns:
+            str: Digest of the tree manifest describing the entry.
+        """
+        tree_file = entry / TREE_FILE
+        if tree_file.is_file():
+            tree = tree_file.read_text().strip()
+            if self.has_tree(tree):
+                return tree
+
+        tree = self.ingest(entry)
+        tree_file.write_text(tree)
+        return tree
+
+    def forget(self, entry: Path) -> None:
+        """Drop the recorded tree of a cache entry whose content has changed."""
+        (entry / TREE_FILE).unlink(missing_ok=True)
+
+    def has_tree(self, tree: str) -> bool:
+        return bool(tree) and self._tree_path(tree).is_file()
+
+    def ingest(self, src: Path) -> str:
+        """
+        Store every file of a directory and record its tree manifest.
+
+        Args:
+            src (Path): Directory to ingest. `.git` is skipped.
+
+        Returns:
+            str: Digest of the tree manifest.
+        """
+        manifest = {}
+        for root, dirs, files in os.walk(src):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_NAMES)
+            for file in sorted(files):
+                if file in IGNORED_NAMES:
+                    continue
+
+                path = Path(root) / file
+                if path.is_symlink() or not path.is_file():
+                    continue
+
+                executable = bool(path.stat().st_mode & stat.S_IXUSR)
+                manifest[path.relative_to(src).as_posix()] = [
+                    self._store_blob(path, executable),
+                    executable,
+                ]
+
+        data = json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode()
+        tree = hashlib.sha256(data).hexdigest()
+        tree_path = self._tree_path(tree)
+        if not tree_path.is_file():
+            self._write_atomic(tree_path, data)
+
+        logging.debug(f"Ingested {src} into store as tree {tree}")
+        return tree
+
+    def materialize(self, tree: str, dst: Path) -> None:
+        """
+        Build a directory from a tree manifest.
+
+        Any previous content of the destination is replaced.
+
+        Args:
+            tree (str): Digest of the tree manifest.
+            dst (Path): Directory to build.
+        """
+        with open(self._tree_path(tree), "rb") as t:
+            manifest = json.load(t)
+
+        if dst.exists():
+            self.remove_tree(dst)
+
+        for name, (digest, executable) in manifest.items():
+            target = dst / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._link(self._blob_path(digest, executable), target)
+
+    def link_tree(self, tree: str, dst: Path) -> list[Path]:
+        """
+        Link the files of a tree manifest into a directory shared with other content.
+
+        Unlike `materialize` the destination is kept, only the files of the tree
+        are replaced. Files which are links to the right blob already are left alone.
+
+        Args:
+            tree (str): Digest of the tree manifest.
+            dst (Path): Directory to link into.
+
+        Returns:
+            list[Path]: The linked files.
+        """
+        with open(self._tree_path(tree), "rb") as t:
+            manifest = json.load(t)
+
+        linked = []
+        for name, (digest, executable) in manifest.items():
+            blob = self._blob_path(digest, executable)
+            target = dst / name
+            linked.append(target)
+            if target.exists():
+                if os.path.samefile(blob, target):
+                    continue
+                self.unlink(target)
+
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._link(blob, target)
+
+        return linked
+
+    def remove_tree(self, path: Path) -> None:
+        """Remove a directory whose files may be links of store blobs."""
+        shutil.rmtree(path, onerror=self._handle_remove_error)
+
+    def unlink(self, path: Path) -> None:
+        """
+        Remove a file which may be a hardlink of a store blob.
+
+        The mode belongs to the file, not to the link, so changing it through
+        any link changes the blob for every project. It is only touched when
+        the file can't be removed as it is, as Windows refuses to remove
+        read-only files, and the blob is made read-only again right after.
+        """
+        try:
+            os.unlink(path)
+            return
+        except PermissionError:
+            if os.stat(path).st_mode & stat.S_IWRITE:
+                raise
+
+        blob = self._blob_of(Path(path))
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+        if blob is not None:
+            os.chmod(blob, 0o555 if blob.suffix == ".x" else 0o444)
+
+    def has_blobs(self, tree: str) -> bool:
+        """Check if a tree manifest and every blob it names are in the store."""
+        if not self.has_tree(tree):
+            return False
+
+        with open(self._tree_path(tree), "rb") as t:
+            manifest = json.load(t)
+
+        return all(
+            self._blob_path(digest, executable).is_file()
+            for digest, executable in manifest.values()
+        )
+
+    def _store_blob(self, path: Path, executable: bool) -> str:
+        digest = _hash_file(path)
+        blob = self._blob_path(digest, executable)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=blob.parent, prefix=".tmp-")
+            os.close(fd)
+            shutil.copyfile(path, tmp)
+            # Blobs are shared by every hardlink, keep them read-only
+            os.chmod(tmp, 0o555 if executable else 0o444)
+            os.replace(tmp, blob)
+
+        return digest
+
+    def _link(self, blob: Path, target: Path) -> None:
+        """Link a blob into place: reflink, then hardlink, then copy."""
+        if self._reflink:
+            try:
+                self._clone_file(blob, target)
+                return
+            except OSError:
+                self._reflink = False
+                target.unlink(missing_ok=True)
+
+        if self._hardlink:
+            try:
+                os.link(blob, target)
+                return
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    logging.debug(f"Hardlinks are unavailable for the store: {e}")
+                self._hardlink = False
+
+        shutil.copy2(blob, target)
+        os.chmod(target, stat.S_IMODE(os.stat(blob).st_mode) | stat.S_IWUSR)
+
+    def _clone_file(self, blob: Path, target: Path) -> None:
+        import fcntl
+
+        with open(blob, "rb") as src, open(target, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+        os.chmod(target, stat.S_IMODE(os.stat(blob).st_mode) | stat.S_IWUSR)
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _blob_of(self, path: Path) -> Path | None:
+        """The blob a file is a link of, None if it isn't one."""
+        digest = _hash_file(path)
+        for executable in (False, True):
+            blob = self._blob_path(digest, executable)
+            if blob.is_file() and os.path.samefile(blob, path):
+                return blob
+
+        return None
+
+    def _handle_remove_error(self, function, path, info):
+        if function not in (os.unlink, os.remove):
+            raise info[1]
+
+        self.unlink(Path(path))
+
+    def _blob_path(self, digest: str, executable: bool) -> Path:
+        return self.objects_path / digest[:2] / (digest[2:] + (".x" if executable else ""))
+
+    def _tree_path(self, tree: str) -> Path:
+        return self.trees_path / tree[:2] / f"{tree[2:]}.json"
+
+
+def _hash_file(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            sha.update(chunk)
+
+    return sha.hexdigest()
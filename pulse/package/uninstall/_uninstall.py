@@ -8,11 +8,14 @@ import stat
 from pathlib import Path
 
 from ..parse._parse import package_parse
+from ..lock._lock import PackageLock
+from ..store._store import PackageStore
 from ...core.core_dir import (
     PACKAGE_PATH,
     REQUIREMENTS_PATH,
     PLUGINS_PATH,
     PROJECT_TOML_FILE,
+    PROJECT_LOCK_FILE,
     safe_open,
 )
 
@@ -22,6 +25,8 @@ class PackageUninstaller:
         self.package_path = Path(PACKAGE_PATH)
         self.requirements_path = Path(REQUIREMENTS_PATH)
         self.plugins_path = Path(PLUGINS_PATH)
+        # requirements are linked from the store, their files may be read-only blob links
+        self.store = PackageStore()
 
     def delete(self, package, deep=False):
         parsed_package = package_parse(package)
@@ -32,20 +37,23 @@ class PackageUninstaller:
         if self._remove_dependency(package):
             author, repo, separator, version = parsed_package
 
+            if os.path.isfile(PROJECT_LOCK_FILE):
+                lock = PackageLock()
+                lock.discard(package)
+                lock.save()
+
             # Remove just from requirements if not --deep
             # /project/requirements/repo
             # /project/requirements/.resources/repo if present
             try:
-                shutil.rmtree(
-                    (self.requirements_path / repo), onerror=self._handle_copy_error
-                )
+                self.store.remove_tree(self.requirements_path / repo)
             except FileNotFoundError:
                 logging.warning(
                     f"Package {author}/{repo}{separator}{version if version else 'default'} has been deleted already locally."
                 )
 
             try:
-                shutil.rmtree((self.requirements_path / ".resources" / repo))
+                self.store.remove_tree(self.requirements_path / ".resources" / repo)
             except FileNotFoundError:
                 pass
 
@@ -67,6 +75,13 @@ class PackageUninstaller:
                         f"Package {author}/{repo}{separator}{version if version else 'default'} hasn't been present in cache."
                     )
 
+                # Versions are worktrees of one mirror, drop it (and the tag mirror) with the last of them
+                repo_cache = self.package_path / author / repo
+                if repo_cache.is_dir() and not [
+                    entry for entry in os.listdir(repo_cache) if not entry.startswith(".")
+                ]:
+                    shutil.rmtree(repo_cache, onerror=self._handle_copy_error)
+
                 try:
                     shutil.rmtree((self.plugins_path / repo / version))
                 except FileNotFoundError:
@@ -1,16 +1,23 @@
 import os
+import shutil
 import tarfile
 from zipfile import ZipFile
 
-def __extract_zip_member(zip_file, member_name, extract_path):
+def write_member(source_file, member_name, extract_path):
+    """Stream an opened archive member into a folder under its base name, returns the written file."""
     extract_path = extract_path.rstrip("\\")
     base_name = os.path.basename(member_name)
-    
+
     destination = os.path.join(extract_path, base_name)
     os.makedirs(os.path.dirname(destination), exist_ok=True)
+    with open(destination, 'wb') as dest_file:
+        shutil.copyfileobj(source_file, dest_file, 1024 * 1024)
+
+    return destination
+
+def __extract_zip_member(zip_file, member_name, extract_path):
     with zip_file.open(member_name) as source_file:
-        with open(destination, 'wb') as dest_file:
-            dest_file.write(source_file.read())
+        write_member(source_file, member_name, extract_path)
 
 def __extract_tar_member(tar_file, member_name, extract_path):
     extract_path = extract_path.rstrip("\\")
@@ -1,6 +1,7 @@
 import os
 import platform
 import shutil
+import stat
 
 import click
 import tomli
@@ -10,6 +11,7 @@ import logging
 import pulse.stroke.stroke as stroke
 import pulse.download.download as download
 from ..core.core_dir import RUNTIME_PATH, PODS_PATH, REQUIREMENTS_PATH
+from ..toolchain.toolchain_store import is_installed
 
 from .run_server import server
 from .run_convert import config_convert
@@ -90,7 +92,7 @@ def run(ensure: bool) -> None:
     logging.debug("OS determinated. Checking for runtime...")
 
     # if pods, just run the server from
-    if not os.path.exists(file_name) and not pods:
+    if not pods and not is_installed("runtime", data["runtime"]["version"]):
         # read the toml
         logging.warning(
             "There's no downloaded runtimes. Downloading the specified one..."
@@ -108,7 +110,13 @@ def run(ensure: bool) -> None:
             if os.path.isfile(full_file):
                 os.makedirs(runtime_plugins, exist_ok=True)
 
-                shutil.copy(full_file, runtime_plugins)
+                # plugins linked from the package store are read-only, replace the old copy
+                runtime_file = os.path.join(runtime_plugins, file)
+                if os.path.exists(runtime_file):
+                    os.chmod(runtime_file, stat.S_IWRITE | stat.S_IREAD)
+                    os.remove(runtime_file)
+
+                shutil.copyfile(full_file, runtime_file)
                 # add them to pulse.toml
                 plugins.append(file)
                 logging.debug(f"Appendend file: {file}")
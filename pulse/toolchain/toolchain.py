@@ -0,0 +1,61 @@
+import logging
+
+import click
+
+from pulse.download.download_asset import repair_asset
+from .toolchain_store import TOOLCHAIN_PATHS, toolchain_path, verify as verify_files
+
+
+@click.group
+def toolchain():
+    '''Manages the downloaded runtimes and compilers.'''
+
+
+@toolchain.command
+@click.argument("type", required=False, type=click.Choice(list(TOOLCHAIN_PATHS)))
+@click.argument("version", required=False)
+@click.option("--repair", "-r", is_flag=True, default=False, help="Download the damaged files again.")
+def verify(type, version, repair):
+    '''Checks the downloaded runtimes and compilers against their manifests.'''
+    types = [type] if type else list(TOOLCHAIN_PATHS)
+    intact = True
+
+    for current in types:
+        root = toolchain_path(current, "")
+        versions = (
+            [version]
+            if version
+            else sorted(
+                entry.name
+                for entry in root.iterdir()
+                if entry.is_dir() and not entry.name.startswith(".")
+            )
+            if root.is_dir()
+            else []
+        )
+
+        for ver in versions:
+            if not toolchain_path(current, ver).is_dir():
+                logging.error(f"The {current} {ver} is not downloaded.")
+                intact = False
+                continue
+
+            damaged = verify_files(toolchain_path(current, ver))
+            if damaged == []:
+                logging.info(f"The {current} {ver} is intact.")
+                continue
+
+            if damaged is None:
+                logging.warning(f"The {current} {ver} has no manifest and can't be verified.")
+            else:
+                logging.warning(f"The {current} {ver} has {len(damaged)} damaged files:")
+                for name in damaged:
+                    logging.warning(f"  {name}")
+
+            if repair and repair_asset(current, ver, damaged):
+                continue
+
+            intact = False
+
+    if not intact and not repair:
+        logging.info("Run with --repair to download the damaged files again.")
@@ -0,0 +1,231 @@
+import os
+import json
+import stat
+import hashlib
+import logging
+import platform
+import tempfile
+
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.core_dir import RUNTIME_PATH, COMPILER_PATH
+
+MANIFEST_FILE = ".pulse-manifest.json"
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+TOOLCHAIN_PATHS = {"runtime": RUNTIME_PATH, "compiler": COMPILER_PATH}
+# rewritten by `pulse run`, so neither verified nor shared between versions
+MUTABLE_PATHS = ("config.json", "gamemodes/", "filterscripts/", "plugins/", "scriptfiles/")
+
+
+def toolchain_path(type: str, version: str) -> Path:
+    return Path(TOOLCHAIN_PATHS[type]) / version
+
+
+def executables(type: str) -> list[str]:
+    """Files a runtime or compiler can't work without."""
+    windows = platform.system() == "Windows"
+    if type == "runtime":
+        return ["omp-server.exe" if windows else "omp-server"]
+
+    return [
+        "pawncc.exe" if windows else "pawncc",
+        "pawnc.dll" if windows else "libpawnc.so",
+    ]
+
+
+def is_installed(type: str, version: str, path: str | Path | None = None) -> bool:
+    """
+    Cheap check whether a runtime or compiler version is installed and intact.
+
+    With a manifest every recorded file has to exist with its recorded size,
+    which catches missing and truncated files without hashing anything.
+    Versions installed before manifests were recorded only need their
+    executables.
+
+    Args:
+        type (str): "runtime" or "compiler".
+        version (str): Version to check.
+        path (str | Path): Folder of the version, the toolchain store's by default.
+
+    Returns:
+        bool: True if it can be used as is.
+    """
+    path = Path(path) if path else toolchain_path(type, version)
+    manifest = load_manifest(path)
+    if manifest is None:
+        return all((path / file).is_file() for file in executables(type))
+
+    for name, entry in manifest["files"].items():
+        try:
+            if (path / name).stat().st_size != entry["size"]:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def load_manifest(path: str | Path) -> dict | None:
+    try:
+        with open(Path(path) / MANIFEST_FILE, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+
+    return manifest
+
+
+def record_manifest(path: str | Path) -> dict:
+    """
+    Hashes every file of a runtime or compiler folder and records them.
+
+    Args:
+        path (str | Path): Folder of the version.
+
+    Returns:
+        dict: The manifest written to the folder.
+    """
+    path = Path(path)
+    names = [
+        name
+        for name in _walk(path)
+        if not name.startswith(MUTABLE_PATHS) and name != MANIFEST_FILE
+    ]
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        digests = list(executor.map(lambda name: _hash_file(path / name), names))
+
+    files = {}
+    for name, digest in zip(names, digests):
+        st = (path / name).stat()
+        files[name] = {
+            "size": st.st_size,
+            "sha256": digest,
+            "executable": bool(st.st_mode & stat.S_IXUSR),
+        }
+
+    manifest = {"version": MANIFEST_VERSION, "files": files}
+    fd, tmp = tempfile.mkstemp(dir=path, prefix=".tmp-")
+    with os.fdopen(fd, "w") as f:
+        json.dump(manifest, f, sort_keys=True, indent=1)
+    os.replace(tmp, path / MANIFEST_FILE)
+
+    logging.debug(f"Recorded manifest of {len(files)} files for {path}")
+    return manifest
+
+
+def verify(path: str | Path) -> list[str] | None:
+    """
+    Checks every file of a runtime or compiler folder against its manifest.
+
+    Args:
+        path (str | Path): Folder of the version.
+
+    Returns:
+        list[str] | None: Files which are missing or don't match their
+        checksum, None if the folder has no manifest.
+    """
+    path = Path(path)
+    manifest = load_manifest(path)
+    if manifest is None:
+        return None
+
+    def damaged(item: tuple[str, dict]) -> bool:
+        name, entry = item
+        file = path / name
+        try:
+            if file.stat().st_size != entry["size"]:
+                return True
+            return _hash_file(file) != entry["sha256"]
+        except OSError:
+            return True
+
+    items = sorted(manifest["files"].items())
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        results = list(executor.map(damaged, items))
+
+    return [name for (name, _), bad in zip(items, results) if bad]
+
+
+def deduplicate(type: str, path: str | Path) -> int:
+    """
+    Replaces files shared with other installed versions by hardlinks.
+
+    Runtime versions mostly differ in a few binaries, the rest are identical
+    components and libraries. Mutable files are never linked, as writing
+    them in one version would change every other.
+
+    Args:
+        type (str): "runtime" or "compiler".
+        path (str | Path): Folder of the new version, with its manifest recorded.
+
+    Returns:
+        int: Number of files replaced by links.
+    """
+    path = Path(path)
+    manifest = load_manifest(path)
+    if manifest is None:
+        return 0
+
+    known = {}
+    root = Path(TOOLCHAIN_PATHS[type])
+    if root.is_dir():
+        for version in root.iterdir():
+            if version.name.startswith(".") or version.resolve() == path.resolve():
+                continue
+
+            other = load_manifest(version)
+            for name, entry in (other or {}).get("files", {}).items():
+                known.setdefault((entry["sha256"], entry["executable"]), version / name)
+
+    linked = 0
+    for name, entry in manifest["files"].items():
+        source = known.get((entry["sha256"], entry["executable"]))
+        if source is None:
+            continue
+
+        target = path / name
+        try:
+            if source.stat().st_size != entry["size"] or os.path.samefile(source, target):
+                continue
+
+            tmp = target.with_name(f".{target.name}.link")
+            os.link(source, tmp)
+            os.replace(tmp, target)
+            linked += 1
+        except OSError as e:
+            # other filesystem, or no hardlinks at all
+            logging.debug(f"Can't link {target} to {source}: {e}")
+
+    if linked:
+        logging.info(f"Shared {linked} files with other {type} versions")
+
+    return linked
+
+
+def _walk(path: Path) -> list[str]:
+    names = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file in sorted(files):
+            full = Path(root) / file
+            if full.is_file() and not full.is_symlink():
+                names.append(full.relative_to(path).as_posix())
+
+    return names
+
+
+def _hash_file(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
@@ -35,6 +35,8 @@ class User:
             self.git_token = dt.get("token", "NaN")
             self.log_power = dt.get("log", 10)
             self.stroke_dumps = dt.get("stroke", False)
+            self.mirror = dt.get("mirror")
+            self.build_cache_size = dt.get("build_cache_size")
             self.just_created = False
             self.mark_for_delete = False
 
@@ -66,6 +68,8 @@ class User:
             )
         )  # Change to pulse
         self.stroke_dumps = click.confirm("Dump strokes? (provide_link)", default=True)
+        self.mirror = None
+        self.build_cache_size = None
         self.mark_for_delete = False
         self.just_created = True
         user = {
@@ -135,14 +139,18 @@ class User:
                         default=self.stroke_dumps,
                     )
                 case 5:
-                    self._save(
-                        {
-                            "user": self.git_user,
-                            "token": self.git_token,
-                            "log": self.log_power,
-                            "stroke": self.stroke_dumps,
-                        }
-                    )
+                    data = {
+                        "user": self.git_user,
+                        "token": self.git_token,
+                        "log": self.log_power,
+                        "stroke": self.stroke_dumps,
+                    }
+                    if self.mirror:
+                        data["mirror"] = self.mirror
+                    if self.build_cache_size is not None:
+                        data["build_cache_size"] = self.build_cache_size
+
+                    self._save(data)
                     return
                 case 6:
                     logging.debug("Exiting without saving...")
@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import shutil
+
+import pytest
+
+import pulse.build.build_compile as build_compile
+
+from pulse.build.build_cache import BuildCache
+from pulse.build.build_state import BuildState
+
+FAKE_PAWNCC = """#!/bin/sh
+echo run >> "{runs}"
+echo "warning 219: local variable shadows a variable at a preceding level"
+for option in "$@"; do
+    case "$option" in -o*) echo amx > "${{option#-o}}";; esac
+done
+"""
+
+
+@pytest.fixture
+def compiler(tmp_path, monkeypatch):
+    runs = tmp_path / "runs"
+    version = tmp_path / "compiler" / "3.10.10"
+    version.mkdir(parents=True)
+    (version / "pawncc").write_text(FAKE_PAWNCC.format(runs=runs))
+    (version / "pawncc").chmod(0o755)
+
+    monkeypatch.setattr(build_compile, "COMPILER_PATH", str(tmp_path / "compiler"))
+    monkeypatch.setattr(build_compile, "is_installed", lambda *args: True)
+    monkeypatch.setattr(build_compile, "locked_include_paths", lambda: {})
+    monkeypatch.setattr(
+        build_compile, "BuildCache", lambda: BuildCache(tmp_path / "cache", limit=1024 * 1024)
+    )
+    return runs
+
+
+def _project(path):
+    (path / "gamemodes").mkdir(parents=True)
+    (path / "gamemodes" / "main.pwn").write_text("#include <libx>\nmain() {}\n")
+    (path / "requirements" / "libx").mkdir(parents=True)
+    (path / "requirements" / "libx" / "libx.inc").write_text("stock x() {}\n")
+    (path / "requirements" / "libx" / "pawn.json").write_text(json.dumps({"user": "a"}))
+    return path
+
+
+def _build(project, monkeypatch):
+    monkeypatch.chdir(project)
+    monkeypatch.setattr(build_compile, "REQUIREMENTS_PATH", str(project / "requirements"))
+    monkeypatch.setattr(
+        build_compile, "BuildState", lambda: BuildState(str(project / ".pulse-build.json"))
+    )
+    build_compile.compile(
+        "gamemodes/main.pwn", "gamemodes/main.amx", "3.10.10", None, None, None, None
+    )
+
+
+@pytest.mark.skipif(os.name == "nt", reason="the fake compiler is a shell script")
+def test_same_sources_hit_the_cache_from_another_checkout(tmp_path, compiler, monkeypatch, capfd):
+    first = _project(tmp_path / "first")
+    second = tmp_path / "second"
+    shutil.copytree(first, second)
+
+    _build(first, monkeypatch)
+    _build(second, monkeypatch)
+
+    assert compiler.read_text().count("run") == 1
+    assert (second / "gamemodes" / "main.amx").read_text() == "amx\n"
+    # the captured compiler output is replayed on a hit
+    assert capfd.readouterr().out.count("warning 219") == 2
+    assert BuildCache(tmp_path / "cache", limit=1024 * 1024).stats()["hits"] == 1
+
+
+@pytest.mark.skipif(os.name == "nt", reason="the fake compiler is a shell script")
+def test_changed_include_misses_the_cache(tmp_path, compiler, monkeypatch):
+    first = _project(tmp_path / "first")
+    second = tmp_path / "second"
+    shutil.copytree(first, second)
+    (second / "requirements" / "libx" / "libx.inc").write_text("stock y() {}\n")
+
+    _build(first, monkeypatch)
+    _build(second, monkeypatch)
+
+    assert compiler.read_text().count("run") == 2
+
+
+@pytest.mark.skipif(os.name == "nt", reason="the fake compiler is a shell script")
+def test_compiler_output_is_printed_while_it_runs(monkeypatch):
+    writes = []
+
+    class Buffer:
+        def write(self, data):
+            writes.append((time.monotonic(), data))
+
+    class Stdout:
+        buffer = Buffer()
+
+        def flush(self):
+            pass
+
+    monkeypatch.setattr(build_compile.sys, "stdout", Stdout())
+    started = time.monotonic()
+    returncode, captured = build_compile.run_compiler(
+        ["sh", "-c", "echo compiling; sleep 1; echo done"], os.environ.copy()
+    )
+
+    assert returncode == 0
+    assert captured == b"compiling\ndone\n"
+    assert writes[0][1] == b"compiling\n"
+    assert writes[0][0] - started < 0.5
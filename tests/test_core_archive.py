@@ -0,0 +1,52 @@
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+from zipfile import ZipFile
+
+from pulse.core import core_archive
+from pulse.core.core_archive import extract_zip_members
+
+
+def test_colliding_members_keep_the_last_one(tmp_path, monkeypatch):
+    # extract on threads even though the archive is small
+    monkeypatch.setattr(core_archive, "PARALLEL_THRESHOLD", 0)
+    archive = tmp_path / "plugin.zip"
+    with ZipFile(archive, "w") as zf:
+        zf.writestr("x86/plugins/foo.so", b"x86" * 100_000)
+        zf.writestr("x64/plugins/foo.so", b"x64" * 10)
+        zf.writestr("x64/plugins/foo.inc", b"native foo();")
+
+    plugins = tmp_path / "plugins"
+    target = str(plugins / "foo.so")
+    extract_zip_members(
+        archive,
+        {
+            "x86/plugins/foo.so": [target],
+            "x64/plugins/foo.so": [target, target],
+            "x64/plugins/foo.inc": [str(plugins / "foo.inc")],
+        },
+        workers=4,
+    )
+
+    assert (plugins / "foo.so").read_bytes() == b"x64" * 10
+    assert (plugins / "foo.inc").read_bytes() == b"native foo();"
+
+
+def test_worker_threads_extract_sequentially(tmp_path, monkeypatch):
+    monkeypatch.setattr(core_archive, "PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr(core_archive, "MAX_WORKERS", 4)
+
+    def nested_pool(*args, **kwargs):
+        raise AssertionError("a pool was started on a worker thread")
+
+    archive = tmp_path / "plugin.zip"
+    with ZipFile(archive, "w") as zf:
+        for name in ("a.so", "b.so", "c.so"):
+            zf.writestr(name, name)
+    destinations = {name: [str(tmp_path / "out" / name)] for name in ("a.so", "b.so", "c.so")}
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        monkeypatch.setattr(core_archive, "ThreadPoolExecutor", nested_pool)
+        executor.submit(extract_zip_members, archive, destinations).result()
+
+    assert sorted(os.listdir(tmp_path / "out")) == ["a.so", "b.so", "c.so"]
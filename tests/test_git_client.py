@@ -0,0 +1,119 @@
+import io
+import time
+import threading
+
+import requests
+import pytest
+
+from pulse.git import git_client
+from pulse.git.git_client import GitHubClient, RequestScheduler
+
+
+def _response(status: int, **headers) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers)
+    response._content = b"{}"
+    response.raw = io.BytesIO()
+    return response
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # not the shared instance, nothing leaks between tests
+    client = object.__new__(GitHubClient)
+    client._setup(str(tmp_path / "http"))
+    sleeps = []
+    monkeypatch.setattr(git_client.time, "sleep", sleeps.append)
+    client.sleeps = sleeps
+    return client
+
+
+def _serve(client: GitHubClient, *responses: requests.Response) -> list:
+    queue = list(responses)
+    sent = []
+
+    def request(method, url, **kwargs):
+        sent.append(url)
+        return queue.pop(0)
+
+    client.session.request = request
+    return sent
+
+
+def test_server_errors_are_retried_with_exponential_backoff(client):
+    sent = _serve(client, _response(502), _response(503), _response(500), _response(200))
+
+    response = client.get("https://api.github.com/repos/alice/liba")
+
+    assert response.status_code == 200
+    assert len(sent) == 4
+    assert client.stats["retries"] == 3
+    for attempt, delay in enumerate(client.sleeps):
+        assert 0 <= delay <= git_client.BACKOFF_BASE * 2**attempt
+
+
+def test_backoff_is_capped_and_gives_up_after_max_retries(client, monkeypatch):
+    monkeypatch.setattr(git_client, "BACKOFF_MAX", 3.0)
+    monkeypatch.setattr(git_client.random, "uniform", lambda low, high: high)
+    _serve(client, *[_response(503)] * (git_client.MAX_RETRIES + 1))
+
+    response = client.get("https://api.github.com/repos/alice/liba")
+
+    assert response.status_code == 503
+    assert client.sleeps == [1.0, 2.0, 3.0, 3.0, 3.0][: git_client.MAX_RETRIES]
+
+
+def test_retry_after_is_honoured(client):
+    _serve(client, _response(429, **{"Retry-After": "7"}), _response(200))
+
+    assert client.get("https://api.github.com/repos/alice/liba").ok
+    assert client.sleeps == [7.0]
+
+
+def test_exhausted_quota_pauses_every_request_until_the_reset(client):
+    reset = time.time() + 30
+    _serve(
+        client,
+        _response(403, **{"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(reset))}),
+        _response(200, **{"X-RateLimit-Remaining": "4999"}),
+    )
+
+    assert client.get("https://api.github.com/repos/alice/liba").ok
+    assert 25 < client.sleeps[0] <= 31
+    assert client.scheduler.paused_until == int(reset) + 1
+    assert client.rate_remaining == 4999
+
+
+def test_forbidden_and_missing_arent_retried(client):
+    sent = _serve(client, _response(403, **{"X-RateLimit-Remaining": "12"}), _response(404))
+
+    assert client.get("https://api.github.com/repos/alice/private").status_code == 403
+    assert client.get("https://api.github.com/repos/alice/gone").status_code == 404
+    assert len(sent) == 2
+    assert client.sleeps == []
+
+
+def test_metadata_requests_go_before_waiting_downloads():
+    scheduler = RequestScheduler(concurrency=1)
+    order = []
+    scheduler.acquire()
+
+    def request(name: str, download: bool) -> None:
+        scheduler.acquire(download)
+        order.append(name)
+        scheduler.release()
+
+    download = threading.Thread(target=request, args=("download", True))
+    download.start()
+    time.sleep(0.05)
+    metadata = threading.Thread(target=request, args=("metadata", False))
+    metadata.start()
+    time.sleep(0.05)
+
+    assert order == []
+    scheduler.release()
+    download.join(5)
+    metadata.join(5)
+
+    assert order == ["metadata", "download"]
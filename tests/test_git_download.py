@@ -0,0 +1,154 @@
+import io
+import os
+import re
+import hashlib
+import tarfile
+import threading
+
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pulse.git import git_download
+from pulse.git.git_download import extract_tar_stream, download_file
+
+ASSET = bytes(range(256)) * 1024
+ASSET_DIGEST = "sha256:" + hashlib.sha256(ASSET).hexdigest()
+
+
+def _add(tf: tarfile.TarFile, name: str, data: bytes = b"", **attributes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    for key, value in attributes.items():
+        setattr(info, key, value)
+    tf.addfile(info, io.BytesIO(data))
+
+
+def _archive(*members) -> io.BytesIO:
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w:gz") as tf:
+        for name, content, attributes in members:
+            _add(tf, name, content, **attributes)
+    data.seek(0)
+    return data
+
+
+def test_links_inside_the_target_are_recreated(tmp_path):
+    archive = _archive(
+        ("server/lib/libfoo.so.1", b"\x7fELF", {"mode": 0o755}),
+        ("server/lib/libfoo.so", b"", {"type": tarfile.SYMTYPE, "linkname": "libfoo.so.1"}),
+        ("server/bin/foo", b"", {"type": tarfile.LNKTYPE, "linkname": "server/lib/libfoo.so.1"}),
+    )
+
+    extract_tar_stream(archive, str(tmp_path / "out"), strip_components=1)
+
+    link = tmp_path / "out" / "lib" / "libfoo.so"
+    assert link.is_symlink() and os.readlink(link) == "libfoo.so.1"
+    assert link.read_bytes() == b"\x7fELF"
+    assert (tmp_path / "out" / "bin" / "foo").read_bytes() == b"\x7fELF"
+
+
+def test_links_pointing_outside_are_skipped(tmp_path, caplog):
+    archive = _archive(
+        ("absolute", b"", {"type": tarfile.SYMTYPE, "linkname": "/etc/passwd"}),
+        ("parent", b"", {"type": tarfile.SYMTYPE, "linkname": "../secret"}),
+        ("hard", b"", {"type": tarfile.LNKTYPE, "linkname": "../secret"}),
+    )
+
+    extract_tar_stream(archive, str(tmp_path / "out"))
+
+    assert os.listdir(tmp_path / "out") == []
+    assert caplog.text.count("Skipping link pointing outside") == 3
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Serves ASSET with Range support and records the Range header of every request."""
+    monkeypatch.setattr(git_download, "DOWNLOAD_PATH", str(tmp_path / "downloads"))
+    ranges = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested = self.headers.get("Range")
+            ranges.append(requested)
+            match = re.match(r"bytes=(\d+)-$", requested or "")
+            start = int(match.group(1)) if match else 0
+            if start >= len(ASSET):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(206 if match else 200)
+            if match:
+                self.send_header("Content-Range", f"bytes {start}-{len(ASSET) - 1}/{len(ASSET)}")
+            self.send_header("Content-Length", str(len(ASSET) - start))
+            self.end_headers()
+            self.wfile.write(ASSET[start:])
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/liba.zip", ranges
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _part(url: str):
+    return Path(git_download.DOWNLOAD_PATH) / (
+        hashlib.sha256(url.encode()).hexdigest()[:32] + ".part"
+    )
+
+
+def test_download_resumes_a_part_file(tmp_path, server):
+    url, ranges = server
+    part = _part(url)
+    part.parent.mkdir(parents=True)
+    part.write_bytes(ASSET[:1000])
+
+    target = tmp_path / "liba.zip"
+    assert download_file(url, str(target), size=len(ASSET), digest=ASSET_DIGEST)
+
+    assert ranges == ["bytes=1000-"]
+    assert target.read_bytes() == ASSET
+    assert not part.exists()
+
+
+def test_corrupt_part_file_is_downloaded_again(tmp_path, server):
+    url, ranges = server
+    part = _part(url)
+    part.parent.mkdir(parents=True)
+    part.write_bytes(b"x" * 1000)
+
+    target = tmp_path / "liba.zip"
+    assert download_file(url, str(target), digest=ASSET_DIGEST)
+
+    assert ranges == ["bytes=1000-", None]
+    assert target.read_bytes() == ASSET
+
+
+def test_complete_part_file_is_downloaded_again_once_refused(tmp_path, server):
+    url, ranges = server
+    part = _part(url)
+    part.parent.mkdir(parents=True)
+    part.write_bytes(ASSET)
+
+    target = tmp_path / "liba.zip"
+    assert download_file(url, str(target), size=len(ASSET))
+
+    assert ranges == [f"bytes={len(ASSET)}-", None]
+    assert target.read_bytes() == ASSET
+
+
+def test_wrong_size_or_digest_fails_without_a_file(tmp_path, server):
+    url, _ = server
+    target = tmp_path / "liba.zip"
+
+    assert not download_file(url, str(target), size=len(ASSET) + 1)
+    assert not download_file(url, str(target), digest="sha256:" + "0" * 64)
+
+    assert not target.exists()
+    assert not _part(url).exists()
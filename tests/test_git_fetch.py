@@ -0,0 +1,64 @@
+import subprocess
+
+from pathlib import Path
+
+from git import Repo
+
+from pulse.git.git_fetch import clone_package, fetch_commit, has_commit, has_complete_commit
+
+
+def _upstream(path: Path) -> Repo:
+    repo = Repo.init(str(path), initial_branch="main")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Pulse")
+        config.set_value("user", "email", "pulse@example.com")
+        config.set_value("uploadpack", "allowFilter", "true")
+        config.set_value("uploadpack", "allowAnySHA1InWant", "true")
+    return repo
+
+
+def _commit(repo: Repo, content: str) -> str:
+    (Path(repo.working_dir) / "pawn.json").write_text(content)
+    repo.index.add(["pawn.json"])
+    return repo.index.commit(content).hexsha
+
+
+def test_clone_package_reclones_existing_version(tmp_path):
+    upstream = _upstream(tmp_path / "upstream")
+    _commit(upstream, "1")
+    url = (tmp_path / "upstream").as_uri()
+    mirror_path = tmp_path / "mirrors" / "liba.git"
+    save_path = tmp_path / "package" / "liba@main"
+
+    clone_package(url, mirror_path, save_path, "@", "main")
+    assert (save_path / "pawn.json").read_text() == "1"
+
+    head = _commit(upstream, "2")
+    worktree = clone_package(url, mirror_path, save_path, "@", "main")
+
+    assert worktree.head.commit.hexsha == head
+    assert (save_path / "pawn.json").read_text() == "2"
+    worktrees = subprocess.run(
+        ["git", "worktree", "list", "--porcelain"],
+        cwd=mirror_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert worktrees.count("worktree ") == 2  # the mirror and the version
+
+
+def test_blobless_commit_is_not_complete(tmp_path):
+    upstream = _upstream(tmp_path / "upstream")
+    old = _commit(upstream, "1")
+    _commit(upstream, "2")
+    url = (tmp_path / "upstream").as_uri()
+
+    worktree = clone_package(url, tmp_path / "liba.git", tmp_path / "liba@main", "@", "main")
+    mirror = Repo(str(tmp_path / "liba.git"))
+    assert has_complete_commit(mirror, worktree.head.commit.hexsha)
+
+    # fetched without blobs, never checked out
+    fetch_commit(mirror, "origin", old)
+    assert has_commit(mirror, old)
+    assert not has_complete_commit(mirror, old)
@@ -0,0 +1,53 @@
+import requests
+
+from git import Repo
+
+from pulse.git import git_release
+
+
+def _response(status: int, body: bytes = b"{}") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    return response
+
+
+def test_release_goes_through_the_client(tmp_path, monkeypatch):
+    origin = Repo.init(tmp_path / "origin.git", bare=True)
+    repo = Repo.init(tmp_path / "project")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Pulse")
+        config.set_value("user", "email", "pulse@example.com")
+    (tmp_path / "project" / "foo.inc").write_text("native foo();")
+    repo.index.add(["foo.inc"])
+    repo.index.commit("init")
+    repo.create_remote("origin", str(tmp_path / "origin.git"))
+    (tmp_path / "foo-linux.zip").write_bytes(b"PK")
+    monkeypatch.chdir(tmp_path / "project")
+    (tmp_path / "project" / "package.rel").write_text('version = "v1.0.0"\n')
+
+    posted = []
+
+    def post(url, headers=None, **kwargs):
+        posted.append((url, kwargs))
+        if url.endswith("/releases"):
+            return _response(
+                201,
+                b'{"upload_url": "https://uploads.github.com/repos/alice/foo/releases/1/assets{?name,label}"}',
+            )
+        return _response(201)
+
+    monkeypatch.setattr(git_release.client, "post", post)
+    git_release.publish_release(
+        str(tmp_path / "project"), "v1.0.0", "tag", "Foo 1.0", "notes",
+        [str(tmp_path / "foo-linux.zip")], "token", "alice/foo", False,
+    )
+
+    assert "v1.0.0" in [tag.name for tag in origin.tags]
+    (release_url, release), (upload_url, upload) = posted
+    assert release_url == "https://api.github.com/repos/alice/foo/releases"
+    assert release["json"]["tag_name"] == "v1.0.0"
+    assert upload_url == "https://uploads.github.com/repos/alice/foo/releases/1/assets"
+    assert upload["params"]["name"] == "foo-linux.zip"
+    assert upload["data"] == b"PK"
+    assert not (tmp_path / "project" / "package.rel").exists()
@@ -0,0 +1,28 @@
+from git import Repo
+
+from pulse.git.git_tags import latest_tag
+
+
+def _commit(repo: Repo, message: str) -> str:
+    return repo.index.commit(message).hexsha
+
+
+def test_abbreviated_sha_resolves_to_its_tag(tmp_path):
+    upstream = Repo.init(str(tmp_path / "upstream"), initial_branch="main")
+    with upstream.config_writer() as config:
+        config.set_value("user", "name", "Pulse")
+        config.set_value("user", "email", "pulse@example.com")
+        config.set_value("uploadpack", "allowFilter", "true")
+        config.set_value("uploadpack", "allowAnySHA1InWant", "true")
+
+    _commit(upstream, "first")
+    upstream.create_tag("v1.0.0")
+    head = _commit(upstream, "after the tag")
+
+    url = (tmp_path / "upstream").as_uri()
+    mirror_path = tmp_path / "tags.git"
+
+    # the commit after the tag isn't in the tag mirror yet
+    assert latest_tag(url, mirror_path, head[:7]) == "v1.0.0"
+    assert latest_tag(url, mirror_path, head) == "v1.0.0"
+    assert latest_tag(url, mirror_path, "0000000") is None
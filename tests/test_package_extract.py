@@ -0,0 +1,78 @@
+import os
+
+from zipfile import ZipFile
+
+import pytest
+
+from pulse.package.extract import _extract
+from pulse.package.extract._extract import ExtractionCache, MEMO_FILE
+from pulse.package.store._store import PackageStore
+
+RESOURCE = {"platform": "linux", "includes": [], "files": {}, "plugins": [r".*\.so"]}
+
+
+@pytest.fixture
+def extractions(monkeypatch):
+    """Archives actually extracted, as opposed to linked from the store."""
+    extracted = []
+    handle = _extract.handle_extraction_zip
+
+    def counting(asset_path, *args, **kwargs):
+        extracted.append(os.path.basename(asset_path))
+        return handle(asset_path, *args, **kwargs)
+
+    monkeypatch.setattr(_extract, "handle_extraction_zip", counting)
+    return extracted
+
+
+def _release(tmp_path, content: bytes = b"\x7fELF"):
+    release = tmp_path / "plugins" / "foo" / "v1.0.0"
+    release.mkdir(parents=True, exist_ok=True)
+    archive = release / "foo-linux.zip"
+    with ZipFile(archive, "w") as zf:
+        zf.writestr("foo/plugins/foo.so", content)
+    return archive
+
+
+def _cache(tmp_path, project: str) -> ExtractionCache:
+    store = PackageStore(tmp_path / "store")
+    return ExtractionCache(store, tmp_path / project / "requirements")
+
+
+def test_archive_is_extracted_once_for_every_project(tmp_path, extractions):
+    archive = _release(tmp_path)
+
+    first = _cache(tmp_path, "a").extract(archive, RESOURCE, "foo")
+    second = _cache(tmp_path, "b").extract(archive, RESOURCE, "foo")
+
+    assert extractions == ["foo-linux.zip"]
+    assert (archive.parent / MEMO_FILE).is_file()
+    assert [path.relative_to(tmp_path / "a") for path in first] == [
+        path.relative_to(tmp_path / "b") for path in second
+    ]
+    assert all(path.read_bytes() == b"\x7fELF" for path in first + second)
+
+
+def test_changed_resource_or_archive_is_extracted_again(tmp_path, extractions):
+    archive = _release(tmp_path)
+    cache = _cache(tmp_path, "a")
+    cache.extract(archive, RESOURCE, "foo")
+
+    cache.extract(archive, {**RESOURCE, "plugins": [r"foo\.so"]}, "foo")
+    assert len(extractions) == 2
+
+    _release(tmp_path, b"\x7fELF v2")
+    placed = cache.extract(archive, RESOURCE, "foo")
+    assert len(extractions) == 3
+    assert [path.read_bytes() for path in placed] == [b"\x7fELF v2"]
+
+
+def test_memo_without_its_blobs_is_extracted_again(tmp_path, extractions):
+    archive = _release(tmp_path)
+    _cache(tmp_path, "a").extract(archive, RESOURCE, "foo")
+
+    PackageStore(tmp_path / "store").remove_tree(tmp_path / "store")
+    placed = _cache(tmp_path, "b").extract(archive, RESOURCE, "foo")
+
+    assert len(extractions) == 2
+    assert [path.read_bytes() for path in placed] == [b"\x7fELF"]
@@ -0,0 +1,54 @@
+import io
+import tarfile
+
+from zipfile import ZipFile
+
+from pulse.package.package_handle import handle_extraction_tar, handle_extraction_zip
+
+
+def _add(tf: tarfile.TarFile, name: str, data: bytes = b"", **attributes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    for key, value in attributes.items():
+        setattr(info, key, value)
+    tf.addfile(info, io.BytesIO(data))
+
+
+def test_tar_links_are_extracted_as_copies(tmp_path):
+    archive = tmp_path / "plugin.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        # links before and after the file they point to
+        _add(tf, "plugin/plugins/early.so", type=tarfile.SYMTYPE, linkname="foo.so.1")
+        _add(tf, "plugin/plugins/foo.so.1", b"\x7fELF", mode=0o755)
+        _add(tf, "plugin/plugins/foo.so", type=tarfile.SYMTYPE, linkname="foo.so.1")
+        _add(tf, "plugin/plugins/bar.so", type=tarfile.LNKTYPE, linkname="plugin/plugins/foo.so.1")
+        _add(tf, "plugin/plugins/dangling.so", type=tarfile.SYMTYPE, linkname="missing.so")
+
+    plugins = tmp_path / "plugins"
+    handle_extraction_tar(
+        archive, [], ("", "foo", ""), {}, [r".*\.so"],
+        cwd_path=str(plugins), resources_path=str(tmp_path / ".resources"),
+    )
+
+    assert sorted(path.name for path in plugins.iterdir()) == ["bar.so", "early.so", "foo.so", "foo.so.1"]
+    for path in plugins.iterdir():
+        assert not path.is_symlink()
+        assert path.read_bytes() == b"\x7fELF"
+        assert path.stat().st_mode & 0o111
+
+
+def test_member_matching_several_patterns_is_extracted_once(tmp_path):
+    resources = tmp_path / ".resources"
+    arguments = ([], ("", "foo", ""), {r"foo\.inc": "foo.inc"}, [r"foo\.inc"])
+
+    archive = tmp_path / "plugin.tar.gz"
+    with tarfile.open(archive, "w:gz") as tf:
+        _add(tf, "foo.inc", b"native foo();")
+    handle_extraction_tar(archive, *arguments, cwd_path=str(resources / "foo"), resources_path=str(resources))
+    assert (resources / "foo" / "foo.inc").read_bytes() == b"native foo();"
+
+    archive = tmp_path / "plugin.zip"
+    with ZipFile(archive, "w") as zf:
+        zf.writestr("foo.inc", "native bar();")
+    handle_extraction_zip(archive, *arguments, cwd_path=str(resources / "foo"), resources_path=str(resources))
+    assert (resources / "foo" / "foo.inc").read_bytes() == b"native bar();"
@@ -0,0 +1,67 @@
+from pulse.package.lock._lock import PackageLock, LOCK_HEADER
+
+
+def _lock(tmp_path) -> PackageLock:
+    return PackageLock(str(tmp_path / "pulse.lock"))
+
+
+def test_lockfile_round_trips(tmp_path):
+    lock = _lock(tmp_path)
+    lock.record(
+        "bob/libb@main",
+        commit="b" * 40,
+        manifest={"entry": "libb.inc", "dependencies": []},
+    )
+    lock.record(
+        "alice/liba@main",
+        commit="a" * 40,
+        manifest={"entry": "liba.inc", "dependencies": ["bob/libb@main"]},
+        plugin={"tag": "v1.0.0", "assets": ["liba.so"]},
+    )
+    lock.save()
+
+    content = (tmp_path / "pulse.lock").read_bytes()
+    assert content.startswith(LOCK_HEADER)
+    assert content.index(b"alice/liba@main") < content.index(b"bob/libb@main")
+
+    loaded = _lock(tmp_path)
+    assert loaded.packages == lock.packages
+    assert loaded.get("alice/liba@main")["plugin"] == {"tag": "v1.0.0", "assets": ["liba.so"]}
+
+    # nothing changed, nothing moves
+    loaded.save()
+    assert (tmp_path / "pulse.lock").read_bytes() == content
+
+
+def test_entries_without_a_commit_arent_written(tmp_path):
+    lock = _lock(tmp_path)
+    lock.record("alice/liba@main", commit="a" * 40)
+    lock.record("bob/libb@main", manifest={"entry": "libb.inc"})
+    lock.save()
+
+    loaded = _lock(tmp_path)
+    assert list(loaded.packages) == ["alice/liba@main"]
+    assert loaded.get("bob/libb@main") is None
+
+
+def test_pruning_drops_requirements_which_werent_resolved(tmp_path):
+    lock = _lock(tmp_path)
+    lock.record("alice/liba@main", commit="a" * 40)
+    lock.record("bob/libb@main", commit="b" * 40)
+    lock.save()
+
+    lock = _lock(tmp_path)
+    lock.record("alice/liba@main")
+    lock.save(prune=True)
+
+    assert list(_lock(tmp_path).packages) == ["alice/liba@main"]
+
+
+def test_unknown_and_invalid_lockfiles_are_ignored(tmp_path):
+    path = tmp_path / "pulse.lock"
+
+    path.write_text('version = 99\n[packages."alice/liba@main"]\ncommit = "abc"\n')
+    assert _lock(tmp_path).packages == {}
+
+    path.write_text("version = [")
+    assert _lock(tmp_path).packages == {}
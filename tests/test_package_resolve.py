@@ -0,0 +1,90 @@
+import time
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pulse.package.resolve._resolve import DependencyResolver
+
+GRAPH = {
+    "alice/app@main": ["bob/liba@main", "carol/libb@main"],
+    "bob/liba@main": ["dave/core@main", "carol/libb@main"],
+    "carol/libb@main": ["Dave/Core@main"],
+    "dave/core@main": [],
+    "Dave/Core@main": [],
+}
+
+
+def _resolve(graph: dict, calls: list, delays: dict | None = None):
+    lock = threading.Lock()
+
+    def resolve(package: str):
+        with lock:
+            calls.append(package)
+        # finish in another order than submitted
+        time.sleep((delays or {}).get(package, 0))
+        if package not in graph:
+            return None
+        return graph[package], None
+
+    return resolve
+
+
+def _packages(nodes) -> list[str]:
+    return [node.package for node in nodes]
+
+
+def test_shared_dependencies_resolve_once_dependencies_first():
+    calls = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        resolver = DependencyResolver(
+            _resolve(GRAPH, calls, {"bob/liba@main": 0.05}), executor
+        )
+        nodes = resolver.resolve(["alice/app@main"])
+
+    assert _packages(nodes) == [
+        "dave/core@main",
+        "carol/libb@main",
+        "bob/liba@main",
+        "alice/app@main",
+    ]
+    # dave/core and Dave/Core are the same requirement
+    assert sorted(calls) == sorted(set(calls))
+    assert len(calls) == 4
+
+
+def test_order_doesnt_depend_on_thread_timing():
+    orders = set()
+    for delays in ({}, {"bob/liba@main": 0.05}, {"carol/libb@main": 0.05}):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            resolver = DependencyResolver(_resolve(GRAPH, [], delays), executor)
+            orders.add(tuple(_packages(resolver.resolve(["alice/app@main"]))))
+
+    assert len(orders) == 1
+
+
+def test_first_requirement_of_a_repo_wins(caplog):
+    graph = {
+        "alice/app@main": ["bob/liba@v1"],
+        "bob/liba@v2": [],
+        "bob/liba@v1": [],
+    }
+    calls = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        resolver = DependencyResolver(_resolve(graph, calls), executor)
+        nodes = resolver.resolve(["bob/liba@v2", "alice/app@main"])
+
+    assert _packages(nodes) == ["bob/liba@v2", "alice/app@main"]
+    assert "bob/liba@v1" not in calls
+    assert "conflicts with bob/liba@v2" in caplog.text
+
+
+def test_failed_packages_are_left_out_and_levels_are_prefetched():
+    graph = {"alice/app@main": ["bob/gone@main", "carol/libb@main"], "carol/libb@main": []}
+    levels = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        resolver = DependencyResolver(_resolve(graph, []), executor, prefetch=levels.append)
+        nodes = resolver.resolve(["alice/app@main"])
+
+    assert _packages(nodes) == ["carol/libb@main", "alice/app@main"]
+    assert levels == [["alice/app@main"], ["bob/gone@main", "carol/libb@main"]]
+    assert not resolver.nodes[("bob", "gone", "@", "main")].resolved
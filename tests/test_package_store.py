@@ -0,0 +1,56 @@
+import os
+import stat
+import hashlib
+
+from pulse.package.store._store import PackageStore
+
+
+def _store(tmp_path) -> PackageStore:
+    store = PackageStore(tmp_path / "store")
+    # hardlinks, like most filesystems get
+    store._reflink = False
+    return store
+
+
+def _tree(store: PackageStore, path, content: bytes) -> str:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "foo.inc").write_bytes(content)
+    return store.ingest(path)
+
+
+def _blob(store: PackageStore, content: bytes):
+    return store._blob_path(hashlib.sha256(content).hexdigest(), False)
+
+
+def test_relinking_keeps_the_old_blob_read_only(tmp_path):
+    store = _store(tmp_path)
+    old = _tree(store, tmp_path / "v1", b"native foo();")
+    new = _tree(store, tmp_path / "v2", b"native foo(bar);")
+    requirements = tmp_path / "requirements"
+
+    store.link_tree(old, requirements)
+    store.link_tree(new, requirements)
+
+    assert stat.S_IMODE(os.stat(_blob(store, b"native foo();")).st_mode) == 0o444
+    assert (requirements / "foo.inc").read_bytes() == b"native foo(bar);"
+
+
+def test_unlink_restores_the_blob_where_read_only_files_cant_be_removed(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    tree = _tree(store, tmp_path / "v1", b"native foo();")
+    requirements = tmp_path / "requirements"
+    store.link_tree(tree, requirements)
+    blob = _blob(store, b"native foo();")
+
+    unlink = os.unlink
+
+    def windows_unlink(path, *args, **kwargs):
+        if not os.stat(path).st_mode & stat.S_IWRITE:
+            raise PermissionError(path)
+        unlink(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "unlink", windows_unlink)
+    store.remove_tree(requirements)
+
+    assert not requirements.exists()
+    assert stat.S_IMODE(os.stat(blob).st_mode) == 0o444